@@ -0,0 +1 @@
+"""End-to-end VoiceTray latency benchmarks."""
@@ -0,0 +1,339 @@
+"""Drive recorder -> VAD -> STT -> pipeline -> snippets -> inserter over WAV fixtures.
+
+Audio is replayed through ``AudioRecorder`` via a fake input stream, and text is
+inserted through in-memory clipboard and keyboard adapters, so the suite runs
+headless. STT defaults to a stub model that returns a length-proportional
+transcript; pass ``--stt base`` (or another installed model) to time
+faster-whisper itself.
+
+    python -m benchmarks.e2e --iterations 20
+    python -m benchmarks.e2e --compare benchmarks/results/e2e-abc1234-....json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.fixtures import DEFAULT_LENGTHS, AudioFixture, load_fixtures  # noqa: E402
+from tools.soak import MemoryClipboard, MemoryKeyboard  # noqa: E402
+from voicetray.history import percentile  # noqa: E402
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+RESULTS_SCHEMA = 1
+STAGES = ("record", "vad", "stt", "rules", "llm", "snippets", "insert", "total")
+STUB_PHRASE = "um so hello there this is a benchmark dictation and uh it keeps going"
+STUB_WORDS_PER_SECOND = 2.5
+
+
+class ReplayStream:
+    """Stands in for ``sounddevice.InputStream``; ``feed`` pushes blocks into the callback."""
+
+    def __init__(self, callback, blocksize: int):
+        self.callback = callback
+        self.blocksize = blocksize or 512
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def feed(self, audio: np.ndarray) -> None:
+        frames = audio.reshape(-1, 1)
+        for offset in range(0, frames.shape[0], self.blocksize):
+            block = frames[offset : offset + self.blocksize]
+            self.callback(block, block.shape[0], None, None)
+
+
+class ReplayStreamFactory:
+    def __init__(self, blocksize: int = 512):
+        self.blocksize = blocksize
+        self.stream: ReplayStream | None = None
+
+    def __call__(self, **kwargs: Any) -> ReplayStream:
+        self.stream = ReplayStream(kwargs["callback"], kwargs.get("blocksize") or self.blocksize)
+        return self.stream
+
+
+class StubWhisperModel:
+    """Returns filler-laden text sized to the trimmed audio; ``rtf`` adds simulated decode time."""
+
+    def __init__(self, rtf: float = 0.0):
+        self.rtf = max(0.0, float(rtf))
+
+    def transcribe(self, waveform: np.ndarray, **_kwargs: Any):
+        seconds = waveform.size / 16_000
+        if self.rtf:
+            time.sleep(seconds * self.rtf)
+        phrase = STUB_PHRASE.split()
+        words = max(1, int(seconds * STUB_WORDS_PER_SECOND))
+        text = " ".join(phrase[index % len(phrase)] for index in range(words))
+        return iter([SimpleNamespace(text=text)]), SimpleNamespace(duration=seconds)
+
+
+@dataclass(frozen=True)
+class StageStats:
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+
+
+@dataclass(frozen=True)
+class FixtureResult:
+    name: str
+    audio_seconds: float
+    iterations: int
+    dictations_per_second: float
+    realtime_factor: float
+    stages: dict[str, StageStats] = field(default_factory=dict)
+
+
+class EndToEndHarness:
+    def __init__(self, *, stt: str = "stub", stt_rtf: float = 0.0, blocksize: int = 512):
+        from voicetray.audio.recorder import AudioRecorder
+        from voicetray.dictation import DictationConfig, DictationContext, DictationPipeline
+        from voicetray.dictation.snippets import SnippetExpander
+        from voicetray.insert.inserter import Inserter
+        from voicetray.stt.whisper_engine import WhisperEngine, WhisperEngineConfig
+
+        self.streams = ReplayStreamFactory(blocksize)
+        self.recorder = AudioRecorder(stream_factory=self.streams, blocksize=blocksize, max_seconds=600.0)
+        if stt == "stub":
+            stub = StubWhisperModel(stt_rtf)
+            self.engine = WhisperEngine(WhisperEngineConfig(), model_factory=lambda *_args, **_kwargs: stub)
+        else:
+            self.engine = WhisperEngine(WhisperEngineConfig(model_size=stt, local_files_only=True))
+        self.pipeline = DictationPipeline(
+            DictationConfig(glossary_path=str(PROJECT_ROOT / "voicetray" / "glossary.json"))
+        )
+        self.snippets = SnippetExpander.from_file(str(PROJECT_ROOT / "voicetray" / "snippets.txt"))
+        self.context = DictationContext(mode="balanced", profile="notes", app_title="Notepad")
+        self.clipboard = MemoryClipboard()
+        self.keyboard = MemoryKeyboard()
+        self.inserter = Inserter(
+            clipboard=self.clipboard,
+            keyboard=self.keyboard,
+            focus_provider=lambda: "notepad",
+            sleep=lambda _seconds: None,
+        )
+
+    def run_once(self, fixture: AudioFixture) -> dict[str, float]:
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        self.recorder.start()
+        self.streams.stream.feed(fixture.audio)
+        stop_started = time.perf_counter()
+        audio = self.recorder.stop()
+        processing_started = time.perf_counter()
+        timings["record"] = processing_started - started
+
+        raw_text = self.engine.transcribe(audio)
+        timings.update(self.engine.last_timings)
+
+        cleaned = self.pipeline.process_transcript(raw_text, self.context)
+        timings.update(self.pipeline.last_timings)
+
+        snippets_started = time.perf_counter()
+        final_text = self.snippets.expand(cleaned)
+        insert_started = time.perf_counter()
+        timings["snippets"] = insert_started - snippets_started
+
+        result = self.inserter.insert_text(final_text, start_focus="notepad", app_title="Notepad")
+        finished = time.perf_counter()
+        timings["insert"] = finished - insert_started
+        timings["total"] = finished - stop_started
+        if result.status != "inserted":
+            raise RuntimeError(f"insert failed: {result.status}")
+        return timings
+
+
+def summarize(fixture: AudioFixture, samples: list[dict[str, float]]) -> FixtureResult:
+    stages = {}
+    for stage in STAGES:
+        values = sorted(float(sample.get(stage, 0.0)) for sample in samples)
+        stages[stage] = StageStats(
+            p50_ms=round(percentile(values, 50) * 1000.0, 4),
+            p95_ms=round(percentile(values, 95) * 1000.0, 4),
+            mean_ms=round(sum(values) / len(values) * 1000.0, 4),
+        )
+    # Record time is speech-paced in the app, so throughput only counts processing.
+    busy = sum(sample["total"] for sample in samples) or 1e-9
+    return FixtureResult(
+        name=fixture.name,
+        audio_seconds=round(fixture.seconds, 3),
+        iterations=len(samples),
+        dictations_per_second=round(len(samples) / busy, 3),
+        realtime_factor=round(fixture.seconds * len(samples) / busy, 3),
+        stages=stages,
+    )
+
+
+def run_suite(
+    fixtures: list[AudioFixture],
+    *,
+    iterations: int = 20,
+    warmup: int = 1,
+    harness: EndToEndHarness | None = None,
+) -> list[FixtureResult]:
+    if iterations <= 0:
+        raise ValueError("iterations must be positive")
+    harness = harness or EndToEndHarness()
+    results = []
+    for fixture in fixtures:
+        for _ in range(max(0, warmup)):
+            harness.run_once(fixture)
+        samples = [harness.run_once(fixture) for _ in range(iterations)]
+        results.append(summarize(fixture, samples))
+    return results
+
+
+def git_revision() -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return completed.stdout.strip() or "unknown"
+
+
+def results_payload(results: list[FixtureResult], *, stt: str, iterations: int) -> dict[str, Any]:
+    return {
+        "schema": RESULTS_SCHEMA,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stt": stt,
+        "iterations": iterations,
+        "fixtures": [asdict(result) for result in results],
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """Per fixture and stage p50/p95 deltas for fixtures present in both result files."""
+    before = {fixture["name"]: fixture for fixture in baseline.get("fixtures", [])}
+    rows = []
+    for fixture in current.get("fixtures", []):
+        old = before.get(fixture["name"])
+        if old is None:
+            continue
+        for stage, stats in fixture["stages"].items():
+            old_stats = old["stages"].get(stage)
+            if old_stats is None:
+                continue
+            row = {"fixture": fixture["name"], "stage": stage}
+            for key in ("p50_ms", "p95_ms"):
+                row[f"old_{key}"] = old_stats[key]
+                row[f"new_{key}"] = stats[key]
+                row[f"{key[:3]}_change"] = _relative_change(old_stats[key], stats[key])
+            rows.append(row)
+    return rows
+
+
+def _relative_change(old: float, new: float) -> float | None:
+    if not old:
+        return None
+    return round((new - old) / old, 4)
+
+
+def format_results(results: list[FixtureResult]) -> str:
+    lines = []
+    for result in results:
+        lines.append(
+            f"{result.name} ({result.audio_seconds:g}s audio, {result.iterations} runs): "
+            f"{result.dictations_per_second:.1f} dictations/s, {result.realtime_factor:.1f}x realtime"
+        )
+        for stage, stats in result.stages.items():
+            lines.append(f"  {stage:<9} p50={stats.p50_ms:9.3f}ms p95={stats.p95_ms:9.3f}ms")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list[dict[str, Any]]) -> str:
+    lines = []
+    for row in rows:
+        change = row["p50_change"]
+        delta = "n/a" if change is None else f"{change * 100:+.1f}%"
+        lines.append(
+            f"{row['fixture']:<12} {row['stage']:<9} p50 {row['old_p50_ms']:9.3f} -> "
+            f"{row['new_p50_ms']:9.3f}ms ({delta})"
+        )
+    return "\n".join(lines)
+
+
+def default_output_path(commit: str) -> Path:
+    return RESULTS_DIR / f"e2e-{commit}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the VoiceTray end-to-end latency benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="timed runs per fixture")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per fixture")
+    parser.add_argument(
+        "--lengths",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_LENGTHS),
+        help="synthesized clip lengths in seconds",
+    )
+    parser.add_argument("--wav", action="append", default=[], help="extra recorded 16 kHz WAV fixture")
+    parser.add_argument("--stt", default="stub", help="'stub' or an installed faster-whisper model size")
+    parser.add_argument("--stt-rtf", type=float, default=0.0, help="simulated decode time per audio second (stub)")
+    parser.add_argument("--output", type=Path, help="results JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to diff against")
+    parser.add_argument("--json", action="store_true", help="print results JSON instead of a table")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    fixtures = load_fixtures(tuple(args.lengths), wav_paths=tuple(args.wav))
+    harness = EndToEndHarness(stt=args.stt, stt_rtf=args.stt_rtf)
+    results = run_suite(fixtures, iterations=args.iterations, warmup=args.warmup, harness=harness)
+    payload = results_payload(results, stt=args.stt, iterations=args.iterations)
+
+    output = args.output or default_output_path(payload["commit"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare is not None else None
+    if args.json:
+        report = dict(payload)
+        if baseline is not None:
+            report["comparison"] = compare(baseline, payload)
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(format_results(results))
+    print(f"Saved {output}")
+    if baseline is not None:
+        print(f"Compared with {baseline.get('commit', '?')} ({args.compare}):")
+        print(format_comparison(compare(baseline, payload)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+"""WAV fixtures for the end-to-end benchmarks, built from ``tests/fixtures/hello.wav``."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from voicetray.audio.wav import SAMPLE_RATE, read_wav, write_wav  # noqa: E402,F401
+
+BASE_FIXTURE = PROJECT_ROOT / "tests" / "fixtures" / "hello.wav"
+DEFAULT_LENGTHS = (3.0, 10.0, 30.0, 60.0)
+# Pauses between repeated phrases and around the clip, so VAD has silence to trim.
+PHRASE_GAP_SECONDS = 0.35
+EDGE_SILENCE_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class AudioFixture:
+    name: str
+    audio: np.ndarray
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def seconds(self) -> float:
+        return self.audio.size / self.sample_rate
+
+
+def build_fixture(phrase: np.ndarray, seconds: float, *, name: str | None = None) -> AudioFixture:
+    """Repeat ``phrase`` with short pauses until the clip is ``seconds`` long."""
+    target = max(1, int(round(seconds * SAMPLE_RATE)))
+    gap = np.zeros(int(PHRASE_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    edge = np.zeros(min(int(EDGE_SILENCE_SECONDS * SAMPLE_RATE), target // 4), dtype=np.float32)
+    speech_samples = max(1, target - 2 * edge.size)
+    pieces = []
+    filled = 0
+    while filled < speech_samples:
+        pieces.extend((phrase, gap))
+        filled += phrase.size + gap.size
+    speech = np.concatenate(pieces)[:speech_samples]
+    audio = np.concatenate((edge, speech, edge)).astype(np.float32)
+    return AudioFixture(name=name or f"hello-{seconds:g}s", audio=audio)
+
+
+def load_fixtures(
+    lengths: tuple[float, ...] = DEFAULT_LENGTHS,
+    *,
+    wav_paths: tuple[str | Path, ...] = (),
+    base: str | Path = BASE_FIXTURE,
+) -> list[AudioFixture]:
+    """Synthesized clips at ``lengths`` plus any recorded WAVs given as-is."""
+    phrase = read_wav(base)
+    fixtures = [build_fixture(phrase, seconds) for seconds in lengths]
+    fixtures.extend(AudioFixture(name=Path(path).stem, audio=read_wav(path)) for path in wav_paths)
+    return fixtures
@@ -7,11 +7,14 @@ import sys
 
 _PACKAGE = importlib.import_module("voicetray.dictation")
 _SUBMODULES = (
+    "dedup",
+    "gate",
     "glossary",
     "llm_local",
     "pipeline",
     "protect",
     "rules",
+    "snippets",
     "types",
     "validation",
 )
@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "hello.wav"
+
+
+class FakeModel:
+    def __init__(self, text):
+        self.text = text
+
+    def transcribe(self, audio, **kwargs):
+        return iter([SimpleNamespace(text=self.text)]), SimpleNamespace(language="en")
+
+
+def _factory(texts):
+    def factory(model_size, **kwargs):
+        return FakeModel(texts[model_size])
+
+    return factory
+
+
+def _manifest(tmp_path, text="Hello, world."):
+    manifest = tmp_path / "audio.jsonl"
+    manifest.write_text(
+        json.dumps({"audio": str(FIXTURE), "text": text}) + "\n"
+        + json.dumps({"id": "rel", "audio": "clips/hello.wav", "text": text}) + "\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "clips").mkdir()
+    (tmp_path / "clips" / "hello.wav").write_bytes(FIXTURE.read_bytes())
+    return manifest
+
+
+def test_load_audio_manifest_resolves_relative_paths(tmp_path):
+    from voicetray.audio_eval import load_audio_manifest
+
+    cases = load_audio_manifest(_manifest(tmp_path))
+
+    assert [case.id for case in cases] == ["hello", "rel"]
+    assert cases[1].audio_path == tmp_path / "clips" / "hello.wav"
+
+
+def test_expand_matrix_builds_product_and_rejects_unknown_fields():
+    from voicetray.audio_eval import expand_matrix
+
+    configs = expand_matrix({"model_size": ["tiny", "base"], "beam_size": [1, 5]})
+
+    assert len(configs) == 4
+    assert {"model_size": "base", "beam_size": 1} in configs
+    assert expand_matrix([{"beam_size": 1}]) == [{"beam_size": 1}]
+    assert expand_matrix({}) == [{}]
+    with pytest.raises(ValueError):
+        expand_matrix({"beam": [1]})
+
+
+def test_wer_and_cer_use_normalized_edit_distance():
+    from voicetray.audio_eval import edit_distance, normalize_transcript
+
+    assert normalize_transcript("Hello, World! It's 'fine'.") == "hello world it's fine"
+    assert edit_distance("a b c".split(), "a x c d".split()) == 2
+    assert edit_distance("kitten", "sitting") == 3
+
+
+def test_run_audio_eval_reports_per_config_and_picks_fastest_within_bar(tmp_path):
+    from voicetray.audio_eval import expand_matrix, load_audio_manifest, pick_fastest, run_audio_eval
+
+    cases = load_audio_manifest(_manifest(tmp_path))
+    factory = _factory({"tiny": "hello word", "base": "Hello world"})
+
+    results = run_audio_eval(
+        cases, expand_matrix({"model_size": ["tiny", "base"]}), model_factory=factory, isolate=False
+    )
+
+    tiny, base = results
+    assert tiny.label == "model_size=tiny"
+    assert tiny.wer == pytest.approx(0.5)
+    assert 0 < tiny.cer < 0.2
+    assert base.wer == 0.0 and base.cer == 0.0
+    assert base.audio_seconds > 0 and base.rtf > 0
+    assert base.peak_rss_bytes > 0
+    assert base.to_dict()["config"]["model_size"] == "base"
+    assert pick_fastest(results, max_wer=0.1) is base
+    assert pick_fastest(results, max_wer=0.0) is base
+    assert pick_fastest([tiny], max_wer=0.1) is None
+
+
+def test_eval_audio_cli_accepts_long_inline_matrix_and_matrix_files(tmp_path, monkeypatch):
+    import json
+
+    import voicetray.audio_eval as audio_eval
+    from voicetray.eval import main
+
+    seen = []
+
+    def fake_run(cases, matrix, **_kwargs):
+        seen.append(matrix)
+        return []
+
+    monkeypatch.setattr(audio_eval, "run_audio_eval", fake_run)
+    manifest = _manifest(tmp_path)
+    spec = [{"beam_size": size, "model_size": "base"} for size in range(1, 20)]
+    (tmp_path / "matrix.json").write_text(json.dumps(spec[:2]), encoding="utf-8")
+
+    assert len(json.dumps(spec)) > 255
+    assert main(["--audio", str(manifest), "--matrix", json.dumps(spec)]) == 0
+    assert main(["--audio", str(manifest), "--matrix", str(tmp_path / "matrix.json")]) == 0
+    assert seen == [spec, spec[:2]]
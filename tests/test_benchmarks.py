@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+
+
+def test_fixtures_are_built_from_hello_wav_at_requested_lengths():
+    from benchmarks.fixtures import SAMPLE_RATE, load_fixtures, read_wav, BASE_FIXTURE
+
+    fixtures = load_fixtures((3.0, 10.0))
+    phrase = read_wav(BASE_FIXTURE)
+
+    assert [fixture.name for fixture in fixtures] == ["hello-3s", "hello-10s"]
+    assert [fixture.seconds for fixture in fixtures] == [3.0, 10.0]
+    long_clip = fixtures[1].audio
+    assert long_clip.dtype == np.float32
+    assert not long_clip[: SAMPLE_RATE // 4].any()
+    assert np.abs(long_clip).max() == np.abs(phrase).max()
+
+
+def test_recorded_wav_fixtures_round_trip(tmp_path):
+    from benchmarks.fixtures import load_fixtures, write_wav
+
+    audio = np.linspace(-0.5, 0.5, 1600, dtype=np.float32)
+    path = write_wav(tmp_path / "meeting.wav", audio)
+
+    (fixture,) = load_fixtures((), wav_paths=(path,))
+
+    assert fixture.name == "meeting"
+    assert np.allclose(fixture.audio, audio, atol=1e-4)
+
+
+def test_end_to_end_suite_reports_every_stage_and_inserts_via_fake_adapters():
+    from benchmarks.e2e import STAGES, EndToEndHarness, run_suite
+    from benchmarks.fixtures import load_fixtures
+
+    harness = EndToEndHarness()
+    results = run_suite(load_fixtures((3.0,)), iterations=3, warmup=0, harness=harness)
+
+    (result,) = results
+    assert result.iterations == 3
+    assert set(result.stages) == set(STAGES)
+    assert result.stages["vad"].p95_ms >= result.stages["vad"].p50_ms > 0
+    assert result.realtime_factor > 1
+    assert harness.keyboard.sent == ["ctrl+v"] * 3
+    assert harness.clipboard.value == ""
+
+
+def test_results_json_can_be_compared_across_runs(tmp_path):
+    from benchmarks.e2e import compare, main
+
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    assert main(["--iterations", "2", "--lengths", "3", "--output", str(first)]) == 0
+    assert main(["--iterations", "2", "--lengths", "3", "--output", str(second)]) == 0
+
+    baseline = json.loads(first.read_text(encoding="utf-8"))
+    current = json.loads(second.read_text(encoding="utf-8"))
+    rows = compare(baseline, current)
+
+    assert baseline["schema"] == 1
+    assert baseline["fixtures"][0]["stages"]["total"]["p50_ms"] > 0
+    assert {row["stage"] for row in rows} >= {"vad", "stt", "insert", "total"}
+    assert all(row["fixture"] == "hello-3s" for row in rows)
@@ -0,0 +1,42 @@
+import pytest
+
+from voicetray.dictation.dedup import NearDuplicateIndex, shingles
+
+
+def test_shingles_normalize_case_and_whitespace():
+    assert shingles("Hello   World") == shingles("hello world")
+    assert shingles("") == frozenset()
+    assert shingles("ok") == frozenset({"ok"})
+
+
+def test_index_flags_near_duplicates_and_ignores_unrelated_text():
+    index = NearDuplicateIndex()
+    index.add("Please send the quarterly report to the finance team by Friday.")
+
+    assert index.is_near_duplicate("please send the quarterly report to the finance team by friday")
+    assert not index.is_near_duplicate("The build is green again after the dependency bump.")
+
+
+def test_index_window_evicts_oldest_entries():
+    index = NearDuplicateIndex(window=2)
+    index.add("first dictation about the garden hose")
+    index.add("second dictation about the kitchen sink")
+    index.add("third dictation about the office printer")
+
+    assert len(index) == 2
+    assert not index.is_near_duplicate("first dictation about the garden hose")
+    assert index.is_near_duplicate("third dictation about the office printer")
+
+
+def test_unbounded_index_keeps_every_entry():
+    index = NearDuplicateIndex(window=None)
+    added = index.add_many(f"history entry number {n} about topic {n * 7}" for n in range(200))
+
+    assert added == 200
+    assert len(index) == 200
+    assert index.is_near_duplicate("history entry number 3 about topic 21")
+
+
+def test_index_rejects_invalid_band_layout():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=30, bands=8)
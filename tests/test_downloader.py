@@ -0,0 +1,241 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FileServer:
+    """Local stand-in for a model host: HEAD, byte ranges, and injectable faults."""
+
+    def __init__(self, files, *, ranges=True, head_status=None):
+        self.files = dict(files)
+        self.ranges = ranges
+        self.head_status = head_status
+        self.drop_after = {}
+        self.fail_once = set()
+        self.requests = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args):
+                pass
+
+            def do_HEAD(self):
+                if server.head_status is not None:
+                    self.send_error(server.head_status)
+                    return
+                self._respond(body=False)
+
+            def do_GET(self):
+                self._respond(body=True)
+
+            def _respond(self, body):
+                path = self.path.split("?", 1)[0]
+                data = server.files.get(self.path, server.files.get(path))
+                with server._lock:
+                    server.requests.append((self.command, path, self.headers.get("Range")))
+                    fail = body and path in server.fail_once
+                    if fail:
+                        server.fail_once.discard(path)
+                if data is None or fail:
+                    self.send_error(404 if data is None else 503)
+                    return
+                if isinstance(data, dict):
+                    data = json.dumps(data).encode("utf-8")
+                start, end, status = 0, len(data) - 1, 200
+                requested = self.headers.get("Range")
+                if server.ranges and requested:
+                    first, last = requested.removeprefix("bytes=").split("-")
+                    start, end, status = int(first), int(last or len(data) - 1), 206
+                payload = data[start : end + 1]
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", '"v1"')
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                self.end_headers()
+                if not body:
+                    return
+                with server._lock:
+                    limit = server.drop_after.pop(path, None)
+                if limit is not None:
+                    payload = payload[:limit]
+                self.wfile.write(payload)
+                with server._lock:
+                    server.bytes_sent += len(payload)
+                if limit is not None:
+                    self.close_connection = True
+
+        return Handler
+
+
+@pytest.fixture
+def weights():
+    return bytes(range(256)) * 4096
+
+
+def _remote(server, name, data, **overrides):
+    from voicetray.downloader import RemoteFile
+
+    fields = {"size": len(data), "sha256": hashlib.sha256(data).hexdigest(), **overrides}
+    return RemoteFile(f"{server.url}/{name}", name, **fields)
+
+
+def test_download_fetches_chunks_in_parallel_and_reports_bytes(tmp_path, weights):
+    from voicetray.downloader import DownloadManager
+
+    server = FileServer({"/model.bin": weights, "/config.json": b"{}"})
+    progress = []
+    try:
+        manager = DownloadManager(chunk_bytes=128 * 1024, connections=4, backoff_seconds=0)
+        paths = manager.download(
+            [_remote(server, "model.bin", weights), _remote(server, "config.json", b"{}")],
+            tmp_path / "model",
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+    finally:
+        server.close()
+
+    assert [path.read_bytes() for path in paths] == [weights, b"{}"]
+    ranges = [header for method, path, header in server.requests if method == "GET" and path == "/model.bin"]
+    assert len(ranges) == len(weights) // (128 * 1024)
+    assert all(header.startswith("bytes=") for header in ranges)
+    assert progress[-1] == (len(weights) + 2, len(weights) + 2)
+    assert [done for done, _total in progress] == sorted(done for done, _total in progress)
+    assert not list((tmp_path / "model").glob("*.part*"))
+
+
+def test_download_resumes_missing_chunks_and_retries_dropped_connections(tmp_path, weights):
+    from voicetray.downloader import DownloadError, DownloadManager
+
+    chunk = 128 * 1024
+    server = FileServer({"/model.bin": weights})
+    remote = _remote(server, "model.bin", weights)
+    try:
+        server.fail_once.add("/model.bin")
+        with pytest.raises(DownloadError):
+            DownloadManager(chunk_bytes=chunk, connections=1, retries=0).download([remote], tmp_path)
+        assert (tmp_path / "model.bin.part.json").exists()
+        state = json.loads((tmp_path / "model.bin.part.json").read_text(encoding="utf-8"))
+        assert len(state["done"]) == len(weights) // chunk - 1
+
+        server.bytes_sent = 0
+        server.drop_after["/model.bin"] = 1000
+        progress = []
+        path = DownloadManager(chunk_bytes=chunk, connections=2, backoff_seconds=0).download(
+            [remote], tmp_path, progress_callback=lambda done, total: progress.append(done)
+        )[0]
+    finally:
+        server.close()
+
+    assert path.read_bytes() == weights
+    assert server.bytes_sent == chunk
+    assert progress[0] == len(weights) - chunk
+    assert progress[-1] == len(weights)
+    assert not (tmp_path / "model.bin.part.json").exists()
+
+
+def test_download_rejects_checksum_mismatch_and_handles_servers_without_ranges(tmp_path, weights):
+    from voicetray.downloader import DownloadError, DownloadManager
+
+    server = FileServer({"/model.bin": weights}, ranges=False)
+    try:
+        manager = DownloadManager(chunk_bytes=128 * 1024, backoff_seconds=0)
+        with pytest.raises(DownloadError, match="checksum"):
+            manager.download([_remote(server, "model.bin", weights, sha256="0" * 64)], tmp_path / "bad")
+        path = manager.download([_remote(server, "model.bin", weights)], tmp_path / "good")[0]
+    finally:
+        server.close()
+
+    assert not list((tmp_path / "bad").iterdir())
+    assert path.read_bytes() == weights
+    assert all(header is None for method, _path, header in server.requests if method == "GET")
+
+
+@pytest.mark.parametrize("ranges", [False, True])
+def test_download_probes_range_support_when_head_is_refused(tmp_path, weights, ranges):
+    from voicetray.downloader import DownloadManager
+
+    server = FileServer({"/model.bin": weights}, ranges=ranges, head_status=405)
+    try:
+        manager = DownloadManager(chunk_bytes=128 * 1024, connections=2, retries=0, backoff_seconds=0)
+        path = manager.download([_remote(server, "model.bin", weights)], tmp_path)[0]
+    finally:
+        server.close()
+
+    assert path.read_bytes() == weights
+    gets = [header for method, _path, header in server.requests if method == "GET"]
+    assert gets[0] == "bytes=0-0"
+    assert len(gets) == (1 + len(weights) // (128 * 1024) if ranges else 2)
+
+
+def test_whisper_remote_files_reads_hugging_face_manifest(tmp_path, weights):
+    from voicetray.downloader import download_whisper_files, git_blob_sha1
+
+    config = b'{"alignment_heads": []}'
+    (tmp_path / "config.json").write_bytes(config)
+    server = FileServer(
+        {
+            "/api/models/Systran/faster-whisper-base/revision/main": {
+                "siblings": [
+                    {"rfilename": ".gitattributes", "size": 10},
+                    {"rfilename": "README.md", "size": 10},
+                    {"rfilename": "config.json", "size": len(config), "blobId": git_blob_sha1(tmp_path / "config.json")},
+                    {
+                        "rfilename": "model.bin",
+                        "size": len(weights),
+                        "lfs": {"size": len(weights), "sha256": hashlib.sha256(weights).hexdigest()},
+                    },
+                ]
+            },
+            "/Systran/faster-whisper-base/resolve/main/config.json": config,
+            "/Systran/faster-whisper-base/resolve/main/model.bin": weights,
+        }
+    )
+    try:
+        paths = download_whisper_files("base", tmp_path / "model", endpoint=server.url)
+    finally:
+        server.close()
+
+    assert sorted(path.name for path in paths) == ["config.json", "model.bin"]
+    assert (tmp_path / "model" / "model.bin").read_bytes() == weights
+
+
+def test_download_whisper_model_streams_into_shared_cache(tmp_path, monkeypatch, weights):
+    import voicetray.downloader as downloader
+    from voicetray.model_download import download_whisper_model
+
+    def fake_download(model_size, target, *, progress_callback=None, **_kwargs):
+        (target / "model.bin").write_bytes(weights)
+        progress_callback(len(weights) // 2, len(weights))
+        progress_callback(len(weights), len(weights))
+
+    monkeypatch.setattr(downloader, "download_whisper_files", fake_download)
+    progress = []
+    snapshot = download_whisper_model(
+        "base", progress.append, config={"stt": {"model_cache_dir": str(tmp_path / "cache")}}
+    )
+
+    assert (snapshot / "model.bin").read_bytes() == weights
+    assert progress == [5, 47, 90, 100]
+    assert not list((tmp_path / "cache" / "tmp").glob("download-*"))
@@ -39,3 +39,147 @@ def test_eval_cli_prints_pass_rate_and_exits_zero():
     assert "Pass rate:" in result.stdout
     assert "passed" in result.stdout
 
+
+
+def test_eval_bench_reports_cost_and_allocations_per_mode_profile():
+    from voicetray.eval import DEFAULT_CORPUS_PATH, load_eval_corpus, run_bench
+
+    cases = load_eval_corpus(DEFAULT_CORPUS_PATH)
+    groups = run_bench(cases, 2, rounds=1, calibration=1.0)
+
+    assert {group.key for group in groups} == {f"{case.mode}/{case.profile}" for case in cases}
+    assert sum(group.cases for group in groups) == len(cases)
+    assert all(group.ns_per_char > 0 for group in groups)
+    assert all(abs(group.relative_cost - group.ns_per_char) < 0.01 for group in groups)
+    assert all(group.alloc_peak_bytes > 0 for group in groups)
+
+
+def test_eval_bench_flags_groups_slower_than_baseline_tolerance():
+    from voicetray.eval import BenchGroup, bench_baseline_payload, compare_bench
+
+    def group(relative_cost, alloc_peak_bytes=2048):
+        return BenchGroup("balanced", "notes", 5, 400, relative_cost * 10, relative_cost, alloc_peak_bytes)
+
+    baseline = bench_baseline_payload([group(50.0)])
+
+    assert compare_bench([group(60.0)], baseline, tolerance=0.25) == []
+    (regression,) = compare_bench([group(70.0)], baseline, tolerance=0.25)
+    assert (regression.key, regression.metric, regression.ratio) == ("balanced/notes", "relative_cost", 1.4)
+    (regression,) = compare_bench([group(50.0, alloc_peak_bytes=4096)], baseline, tolerance=0.25)
+    assert regression.metric == "alloc_peak_bytes"
+
+
+def test_eval_bench_cli_exits_non_zero_on_regression(tmp_path):
+    import json
+
+    from voicetray.eval import main
+
+    baseline = tmp_path / "baseline.json"
+    assert main(["--bench", "1", "--baseline", str(baseline), "--update-baseline"]) == 0
+    stored = json.loads(baseline.read_text(encoding="utf-8"))
+    assert main(["--bench", "1", "--baseline", str(baseline), "--tolerance", "100"]) == 0
+
+    for group in stored["groups"].values():
+        group["relative_cost"] /= 1000.0
+    baseline.write_text(json.dumps(stored), encoding="utf-8")
+
+    assert main(["--bench", "1", "--baseline", str(baseline)]) == 1
+
+
+def test_eval_bench_confirms_regressions_before_failing():
+    from dataclasses import replace
+
+    from voicetray.eval import (
+        DEFAULT_CORPUS_PATH,
+        bench_baseline_payload,
+        compare_bench,
+        confirm_bench,
+        load_eval_corpus,
+        run_bench,
+    )
+
+    cases = [case for case in load_eval_corpus(DEFAULT_CORPUS_PATH) if case.mode == "raw"]
+    groups = run_bench(cases, 1, rounds=1, calibration=1.0)
+    baseline = bench_baseline_payload(groups)
+    noisy = [
+        replace(group, relative_cost=group.relative_cost * 1000) if group.profile == "chat" else group
+        for group in groups
+    ]
+
+    confirmed = confirm_bench(cases, noisy, baseline, 1, tolerance=100.0, calibration=1.0)
+    assert [group.key for group in confirmed] == [group.key for group in groups]
+    assert compare_bench(confirmed, baseline, tolerance=100.0) == []
+
+    for group in baseline["groups"].values():
+        group["relative_cost"] /= 1000.0
+    confirmed = confirm_bench(cases, groups, baseline, 1, tolerance=0.25, calibration=1.0)
+    assert {regression.key for regression in compare_bench(confirmed, baseline)} == {group.key for group in groups}
+
+
+def test_eval_bench_baseline_covers_default_corpus():
+    import json
+
+    from voicetray.eval import DEFAULT_BENCH_BASELINE_PATH, DEFAULT_CORPUS_PATH, load_eval_corpus
+
+    baseline = json.loads(DEFAULT_BENCH_BASELINE_PATH.read_text(encoding="utf-8"))
+    keys = {f"{case.mode}/{case.profile}" for case in load_eval_corpus(DEFAULT_CORPUS_PATH)}
+
+    assert set(baseline["groups"]) == keys
+
+
+def test_eval_corpus_streams_cases_lazily(tmp_path):
+    from voicetray.eval import iter_eval_corpus
+
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text(
+        '{"id": "a", "input": "um hi", "expected": "Hi"}\n\n{"input": "ok", "expected": "Ok", "mode": "raw"}\n',
+        encoding="utf-8",
+    )
+
+    cases = iter_eval_corpus(corpus)
+
+    assert next(cases).id == "a"
+    assert next(cases).id == "line-3"
+
+
+def test_sharded_eval_across_processes_matches_serial_eval(tmp_path):
+    from voicetray.eval import (
+        DEFAULT_CORPUS_PATH,
+        EvalCase,
+        iter_eval_corpus,
+        load_eval_corpus,
+        run_eval,
+        run_eval_sharded,
+    )
+
+    broken = EvalCase(id="broken", input_text="um hello", expected="nope", mode="balanced", profile="general")
+    cases = load_eval_corpus(DEFAULT_CORPUS_PATH) + [broken]
+
+    serial = run_eval(cases)
+    sharded = run_eval_sharded(
+        [*iter_eval_corpus(DEFAULT_CORPUS_PATH), broken],
+        workers=2,
+        chunk_size=7,
+        record_timings=True,
+    )
+
+    assert (sharded.total, sharded.passed) == (serial.total, serial.passed)
+    assert [failure.case.id for failure in sharded.failures] == ["broken"]
+    assert [timing.id for timing in sharded.timings] == [case.id for case in cases]
+    assert all(timing.seconds >= 0 for timing in sharded.timings)
+
+
+def test_eval_cli_writes_per_case_timing_column(tmp_path):
+    import csv
+
+    from voicetray.eval import main
+
+    timings = tmp_path / "timings.tsv"
+
+    assert main(["--chunk-size", "10", "--timings", str(timings)]) == 0
+
+    with timings.open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle, delimiter="\t"))
+    assert len(rows) == 42
+    assert set(rows[0]) == {"id", "mode", "profile", "chars", "passed", "ms"}
+    assert all(row["passed"] == "1" and float(row["ms"]) >= 0 for row in rows)
@@ -1,5 +1,7 @@
 import sqlite3
 
+import pytest
+
 
 def test_history_store_appends_and_reads_dictations(tmp_path):
     from voicetray.history import DictationHistoryStore, HistoryEntry
@@ -55,3 +57,363 @@ def test_default_history_path_uses_local_appdata(tmp_path, monkeypatch):
     monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
 
     assert default_history_path() == tmp_path / "VoiceTray" / "history.db"
+
+
+def _entry(text="Hello."):
+    from voicetray.history import HistoryEntry
+
+    return HistoryEntry(
+        app_name="Notepad",
+        raw_text=text,
+        cleaned_text=text,
+        mode="balanced",
+        profile="notes",
+        duration_seconds=None,
+        model="base",
+    )
+
+
+def test_history_store_reuses_wal_connection_per_thread(tmp_path):
+    import threading
+
+    from voicetray.history import DictationHistoryStore
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    first = store._connect()
+
+    assert store._connect() is first
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert first.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(store._connect()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not first
+    store.close()
+
+
+def test_history_store_closes_a_thread_connection_when_the_thread_exits(tmp_path):
+    import threading
+
+    from voicetray.history import DictationHistoryStore
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    main_conn = store._connect()
+    opened = []
+    for _ in range(5):
+        thread = threading.Thread(target=lambda: opened.append(store._connect()))
+        thread.start()
+        thread.join()
+
+    assert store._connections == [main_conn]
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    store.close()
+
+
+def test_history_store_close_releases_connections_and_reopens_on_use(tmp_path):
+    from voicetray.history import DictationHistoryStore
+
+    with DictationHistoryStore(tmp_path / "history.db") as store:
+        store.append(_entry("first"))
+        conn = store._connect()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+    store.append(_entry("second"))
+    assert [row.cleaned_text for row in store.list_recent(limit=5)] == ["second", "first"]
+    store.close()
+
+
+def test_history_append_benchmark_reports_both_variants(tmp_path):
+    from tools.bench_history import run_benchmark
+
+    results = run_benchmark(seed_rows=50, appends=5, workdir=tmp_path)
+
+    assert [result.label for result in results] == ["connect_per_append", "pooled_wal"]
+    assert all(result.appends == 5 and result.mean_ms >= 0 for result in results)
+    with sqlite3.connect(tmp_path / "before.db") as conn:
+        schema = conn.execute("SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'").fetchall()
+        journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert schema == [("table", "dictations")]
+    assert journal == "delete"
+
+
+def test_history_writer_batches_entries_into_one_transaction(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryWriter
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    batches = []
+    append_many = store.append_many
+    store.append_many = lambda entries: batches.append(len(entries)) or append_many(entries)
+    writer = HistoryWriter(store, flush_interval=5.0, max_batch=3)
+
+    for index in range(3):
+        writer.submit(_entry(f"entry {index}"))
+
+    assert writer.flush(timeout=5.0)
+    assert batches == [3]
+    assert [row.cleaned_text for row in store.list_recent(limit=5)] == ["entry 2", "entry 1", "entry 0"]
+    writer.close()
+    store.close()
+
+
+def test_history_writer_close_drains_pending_entries(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryWriter
+
+    db_path = tmp_path / "history.db"
+    store = DictationHistoryStore(db_path)
+    writer = HistoryWriter(store, flush_interval=60.0)
+
+    writer.submit(_entry("first"))
+    writer.submit(_entry("second"))
+    writer.close()
+    store.close()
+
+    with sqlite3.connect(db_path) as conn:
+        texts = [row[0] for row in conn.execute("SELECT cleaned_text FROM dictations ORDER BY id")]
+    assert texts == ["first", "second"]
+
+
+def test_history_writer_logs_and_continues_after_write_failure(tmp_path, caplog):
+    from voicetray.history import DictationHistoryStore, HistoryWriter
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    calls = []
+    append_many = store.append_many
+
+    def flaky_append_many(entries):
+        calls.append(len(entries))
+        if len(calls) == 1:
+            raise sqlite3.DatabaseError("database disk image is malformed")
+        return append_many(entries)
+
+    store.append_many = flaky_append_many
+    writer = HistoryWriter(store, flush_interval=0.0)
+
+    writer.submit(_entry("lost"))
+    assert writer.flush(timeout=5.0)
+    writer.submit(_entry("kept"))
+    writer.close()
+
+    assert "Could not write 1 dictation history entries" in caplog.text
+    assert [row.cleaned_text for row in store.list_recent(limit=5)] == ["kept"]
+    store.close()
+
+
+def test_history_writer_retries_batches_while_database_is_locked(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryWriter
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    calls = []
+    append_many = store.append_many
+
+    def locked_append_many(entries):
+        calls.append(len(entries))
+        if len(calls) <= 3:
+            raise sqlite3.OperationalError("database is locked")
+        return append_many(entries)
+
+    store.append_many = locked_append_many
+    writer = HistoryWriter(store, flush_interval=0.0, busy_backoff_seconds=0.001)
+
+    writer.submit(_entry("kept while locked"))
+    writer.close()
+
+    assert calls == [1, 1, 1, 1]
+    assert [row.cleaned_text for row in store.list_recent(limit=5)] == ["kept while locked"]
+    store.close()
+
+
+def test_history_search_ranks_matches_and_returns_snippets(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryEntry
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    store.append(_entry("Lunch order for the team."))
+    store.append(
+        HistoryEntry(
+            app_name="Outlook",
+            raw_text="um quarterly report draft",
+            cleaned_text="Quarterly report draft attached.",
+            mode="balanced",
+            profile="email",
+            duration_seconds=1.0,
+            model="base",
+        )
+    )
+    store.append(_entry("Report the flaky test."))
+
+    results = store.search("report", limit=10)
+
+    assert store.fts_enabled
+    assert {result.row.cleaned_text for result in results} == {
+        "Quarterly report draft attached.",
+        "Report the flaky test.",
+    }
+    assert all("[" in result.snippet for result in results)
+    assert [result.row.cleaned_text for result in store.search("quart")] == ["Quarterly report draft attached."]
+    assert [result.row.app_name for result in store.search("outlook")] == ["Outlook"]
+    assert store.search("report", limit=1, offset=1)[0].row.id == results[1].row.id
+    assert store.search('"(*') == []
+    store.close()
+
+
+def test_history_search_indexes_rows_written_before_fts_existed(tmp_path):
+    from voicetray.history import DictationHistoryStore
+
+    db_path = tmp_path / "history.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE dictations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+                app_name TEXT,
+                raw_text TEXT NOT NULL,
+                cleaned_text TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                duration_seconds REAL,
+                model TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO dictations (raw_text, cleaned_text, mode, profile, model) "
+            "VALUES ('legacy words', 'Legacy words.', 'balanced', 'general', 'base')"
+        )
+    conn.close()
+
+    with DictationHistoryStore(db_path) as store:
+        assert [result.row.cleaned_text for result in store.search("legacy")] == ["Legacy words."]
+        with store._connect() as conn:
+            conn.execute("DELETE FROM dictations")
+        assert store.search("legacy") == []
+
+
+def _entry_for(app_name, profile="notes", mode="balanced", model="base", text="Hello."):
+    from voicetray.history import HistoryEntry
+
+    return HistoryEntry(
+        app_name=app_name,
+        raw_text=text,
+        cleaned_text=text,
+        mode=mode,
+        profile=profile,
+        duration_seconds=None,
+        model=model,
+    )
+
+
+def test_history_query_filters_and_pages_by_id(tmp_path):
+    from voicetray.history import DictationHistoryStore
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    store.append_many(
+        _entry_for("Slack" if index % 2 else "Notepad", model="small" if index % 3 == 0 else "base", text=f"t{index}")
+        for index in range(10)
+    )
+
+    first = store.query(app_name="Slack", limit=2)
+    second = store.query(app_name="Slack", before_id=first[-1].id, limit=2)
+
+    assert [row.cleaned_text for row in first] == ["t9", "t7"]
+    assert [row.cleaned_text for row in second] == ["t5", "t3"]
+    assert [row.cleaned_text for row in store.query(app_name="Slack", model="small")] == ["t9", "t3"]
+    assert store.query(profile="email") == []
+    assert len(store.query(mode="balanced", limit=100)) == 10
+    store.close()
+
+
+def test_history_query_filters_by_created_at_range(tmp_path):
+    from datetime import datetime, timezone
+
+    from voicetray.history import DictationHistoryStore, history_timestamp
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    ids = store.append_many([_entry_for("A", text="old"), _entry_for("A", text="new")])
+    with store._connect() as conn:
+        conn.execute("UPDATE dictations SET created_at = '2024-01-15T09:00:00.000Z' WHERE id = ?", (ids[0],))
+        conn.execute("UPDATE dictations SET created_at = '2025-06-01T12:30:00.000Z' WHERE id = ?", (ids[1],))
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert history_timestamp(since) == "2025-01-01T00:00:00.000Z"
+    assert [row.cleaned_text for row in store.query(since=since)] == ["new"]
+    assert [row.cleaned_text for row in store.query(until="2025-01-01")] == ["old"]
+    store.close()
+
+
+def test_history_schema_migrations_add_indexes_and_record_version(tmp_path):
+    from voicetray.history import SCHEMA_VERSION, DictationHistoryStore
+
+    db_path = tmp_path / "history.db"
+    store = DictationHistoryStore(db_path)
+    store.close()
+    reopened = DictationHistoryStore(db_path)
+    conn = reopened._connect()
+
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(dictations)")}
+    plan = " ".join(
+        row[3]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM dictations WHERE app_name = ? AND id < ? ORDER BY id DESC LIMIT 10",
+            ("Slack", 100),
+        )
+    )
+
+    assert reopened.schema_version() == SCHEMA_VERSION
+    assert {
+        "idx_dictations_created_at",
+        "idx_dictations_app_name",
+        "idx_dictations_profile",
+        "idx_dictations_mode",
+        "idx_dictations_model",
+    } <= indexes
+    assert "idx_dictations_app_name" in plan
+    reopened.close()
+
+
+def test_history_persists_stage_timings_and_reports_percentiles(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryEntry
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    store.append_many(
+        HistoryEntry(
+            app_name="Slack" if index % 2 else "Notepad",
+            raw_text="words",
+            cleaned_text="Words.",
+            mode="balanced",
+            profile="chat",
+            duration_seconds=1.0,
+            model="base",
+            timings={"stt": index / 100.0, "rules": 0.001, "total": index / 50.0},
+            audio_seconds=2.0,
+            trimmed_seconds=1.5,
+        )
+        for index in range(1, 101)
+    )
+    store.append(_entry("no timings"))
+
+    overall = {stat.stage: stat for stat in store.latency_stats(stages=("stt", "total", "llm"))}
+    by_app = {stat.group: stat for stat in store.latency_stats(group_by="app", stages=("stt",))}
+
+    assert overall["stt"].count == 100
+    assert (overall["stt"].p50, overall["stt"].p95, overall["stt"].p99) == (0.5, 0.95, 0.99)
+    assert overall["total"].p99 == 1.98
+    assert "llm" not in overall
+    assert set(by_app) == {"Slack", "Notepad"}
+    assert by_app["Slack"].count == 50
+    assert store.latency_stats(since="2999-01-01") == []
+    with pytest.raises(ValueError):
+        store.latency_stats(group_by="mode")
+
+    with store.connection() as conn:
+        conn.execute("DELETE FROM dictations WHERE id <= 50")
+        remaining = conn.execute("SELECT count(*), min(audio_seconds), max(trimmed_seconds) FROM dictation_timings").fetchone()
+    assert remaining == (50, 2.0, 1.5)
+    store.close()
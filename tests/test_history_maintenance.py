@@ -0,0 +1,193 @@
+import gzip
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+
+def _store_with_rows(tmp_path, count, text="Hello there."):
+    from voicetray.history import DictationHistoryStore, HistoryEntry
+
+    store = DictationHistoryStore(tmp_path / "history.db")
+    store.append_many(
+        HistoryEntry(
+            app_name="Notepad",
+            raw_text=f"{text} {index}",
+            cleaned_text=f"{text} {index}",
+            mode="balanced",
+            profile="notes",
+            duration_seconds=None,
+            model="base",
+        )
+        for index in range(count)
+    )
+    return store
+
+
+def _read_archive(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_retention_policy_reads_history_config():
+    from voicetray.config import default_config
+    from voicetray.history_maintenance import RetentionPolicy
+
+    cfg = default_config()
+    assert RetentionPolicy.from_app_config(cfg).enabled is False
+
+    cfg["history"].update(retention_max_rows=100, retention_max_mb=2, maintenance_interval_minutes=10)
+    policy = RetentionPolicy.from_app_config(cfg)
+
+    assert policy.enabled
+    assert policy.max_rows == 100
+    assert policy.max_bytes == 2 * 1024 * 1024
+    assert policy.interval_seconds == 600.0
+
+
+def test_apply_retention_keeps_newest_rows_and_archives_in_batches(tmp_path):
+    from voicetray.history_maintenance import RetentionPolicy, apply_retention
+
+    store = _store_with_rows(tmp_path, 25)
+    with store.connection() as conn:
+        conn.execute("UPDATE dictations SET created_at = '2024-03-02T10:00:00.000Z' WHERE id <= 10")
+        conn.execute("UPDATE dictations SET created_at = '2024-04-05T10:00:00.000Z' WHERE id > 10")
+
+    archived, deleted = apply_retention(
+        store,
+        RetentionPolicy(max_rows=5, batch_size=7),
+        archive_dir=tmp_path / "archive",
+    )
+
+    assert (archived, deleted) == (20, 20)
+    assert [row.id for row in store.list_recent(limit=10)] == [25, 24, 23, 22, 21]
+    march = _read_archive(tmp_path / "archive" / "history-2024-03.jsonl.gz")
+    april = _read_archive(tmp_path / "archive" / "history-2024-04.jsonl.gz")
+    assert [row["id"] for row in march] == list(range(1, 11))
+    assert [row["id"] for row in april] == list(range(11, 21))
+    assert store.search("Hello") and all(result.row.id > 20 for result in store.search("Hello"))
+    store.close()
+
+
+def test_apply_retention_by_age_and_size(tmp_path):
+    from voicetray.history_maintenance import RetentionPolicy, apply_retention
+
+    store = _store_with_rows(tmp_path, 10, text="x" * 100)
+    with store.connection() as conn:
+        conn.execute("UPDATE dictations SET created_at = '2020-01-01T00:00:00.000Z' WHERE id <= 2")
+
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert apply_retention(store, RetentionPolicy(max_age_days=30, archive=False), now=now) == (0, 2)
+    assert not (tmp_path / "history-archive").exists()
+
+    # Each row is ~270 bytes, so a 1,000 byte budget keeps the newest three.
+    apply_retention(store, RetentionPolicy(max_bytes=1000, archive=False), now=now)
+    assert [row.id for row in store.list_recent(limit=10)] == [10, 9, 8]
+    store.close()
+
+
+def test_compact_uses_incremental_vacuum_on_new_databases(tmp_path):
+    from voicetray.history_maintenance import RetentionPolicy, run_maintenance
+
+    store = _store_with_rows(tmp_path, 2000, text="padding " * 20)
+    conn = store.connection()
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    pages_before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    result = run_maintenance(store, RetentionPolicy(max_rows=10, archive=False))
+
+    assert result.deleted == 1990
+    assert result.freed_pages > 0
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert conn.execute("PRAGMA page_count").fetchone()[0] < pages_before
+    store.close()
+
+
+def test_compact_converts_legacy_databases_to_incremental_vacuum(tmp_path):
+    from voicetray.history import DictationHistoryStore
+    from voicetray.history_maintenance import compact
+
+    db_path = tmp_path / "history.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE dictations (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL DEFAULT '', app_name TEXT, raw_text TEXT NOT NULL, cleaned_text TEXT NOT NULL, mode TEXT NOT NULL, profile TEXT NOT NULL, duration_seconds REAL, model TEXT NOT NULL)")
+    conn.close()
+    store = DictationHistoryStore(db_path)
+
+    compact(store)
+
+    assert store.connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    store.close()
+
+
+def test_history_maintenance_job_waits_for_idle(tmp_path):
+    import threading
+
+    from voicetray.history_maintenance import HistoryMaintenance, RetentionPolicy
+
+    store = _store_with_rows(tmp_path, 5)
+    idle = threading.Event()
+    job = HistoryMaintenance(
+        store,
+        RetentionPolicy(max_rows=1, archive=False),
+        is_idle=idle.is_set,
+        initial_delay=0.0,
+    )
+    job.IDLE_RETRY_SECONDS = 0.01
+
+    job.start()
+    assert job.last_result is None
+    idle.set()
+    for _ in range(500):
+        if job.last_result is not None:
+            break
+        threading.Event().wait(0.01)
+    job.stop()
+
+    assert job.last_result is not None and job.last_result.deleted == 4
+    store.close()
+
+
+def _legacy_store(tmp_path, rows=0):
+    from voicetray.history import DictationHistoryStore
+
+    db_path = tmp_path / "history.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE dictations (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL DEFAULT '', app_name TEXT, raw_text TEXT NOT NULL, cleaned_text TEXT NOT NULL, mode TEXT NOT NULL, profile TEXT NOT NULL, duration_seconds REAL, model TEXT NOT NULL)")
+        conn.executemany(
+            "INSERT INTO dictations (raw_text, cleaned_text, mode, profile, model) VALUES (?, ?, 'raw', 'default', 'base')",
+            [("x" * 1000, "x" * 1000)] * rows,
+        )
+    conn.close()
+    return DictationHistoryStore(db_path)
+
+
+def test_maintenance_skips_disabled_policy_and_large_legacy_vacuum(tmp_path, monkeypatch):
+    import voicetray.history_maintenance as maintenance
+
+    store = _legacy_store(tmp_path, rows=50)
+    conn = store.connection()
+
+    assert maintenance.run_maintenance(store, maintenance.RetentionPolicy()) == maintenance.MaintenanceResult(0, 0, 0)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    monkeypatch.setattr(maintenance, "SMALL_DB_BYTES", 1024)
+    maintenance.run_maintenance(store, maintenance.RetentionPolicy(max_rows=40))
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    maintenance.run_maintenance(store, maintenance.RetentionPolicy(max_rows=40, full_vacuum=True))
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    store.close()
+
+
+def test_maintenance_stops_between_batches_when_a_dictation_starts(tmp_path):
+    from voicetray.history_maintenance import RetentionPolicy, run_maintenance
+
+    store = _store_with_rows(tmp_path, 25)
+    checks = iter([True, True, False])
+
+    result = run_maintenance(
+        store, RetentionPolicy(max_rows=5, batch_size=5, archive=False), is_idle=lambda: next(checks, False)
+    )
+
+    assert (result.deleted, result.freed_pages) == (10, 0)
+    assert len(store.list_recent(limit=50)) == 15
+    store.close()
@@ -24,6 +24,14 @@ class FakeClipboard:
         self.texts.append(text)
 
 
+def run_inline(task):
+    task()
+
+
+def item_text(window, row):
+    return window.model.data(window.model.index(row))
+
+
 def build_history(tmp_path):
     from voicetray.history import DictationHistoryStore, HistoryEntry
 
@@ -76,11 +84,16 @@ def test_history_window_loads_reverse_chron_and_toggles_raw_clean(tmp_path):
     from voicetray.ui.history_window import HistoryWindow
 
     store = build_history(tmp_path)
-    window = HistoryWindow(qt_modules=qt_modules(), store=store, glossary_path=tmp_path / "glossary.json")
+    window = HistoryWindow(
+        qt_modules=qt_modules(),
+        store=store,
+        glossary_path=tmp_path / "glossary.json",
+        search_executor=run_inline,
+    )
 
-    assert window.list_widget.count() == 2
-    assert "Newer clean" in window.list_widget.item(0).text()
-    assert "Older clean" in window.list_widget.item(1).text()
+    assert window.model.rowCount() == 2
+    assert "Newer clean" in item_text(window, 0)
+    assert "Older clean" in item_text(window, 1)
     assert window.detail_editor.toPlainText() == "Newer clean Qwen Turbo."
     assert "Code" in window.metadata_label.text()
 
@@ -94,12 +107,22 @@ def test_history_window_search_filters_rows(tmp_path):
     from voicetray.ui.history_window import HistoryWindow
 
     store = build_history(tmp_path)
-    window = HistoryWindow(qt_modules=qt_modules(), store=store, glossary_path=tmp_path / "glossary.json")
+    window = HistoryWindow(
+        qt_modules=qt_modules(),
+        store=store,
+        glossary_path=tmp_path / "glossary.json",
+        search_executor=run_inline,
+    )
 
     window.search_edit.setText("older")
 
-    assert window.list_widget.count() == 1
-    assert "Older clean" in window.list_widget.item(0).text()
+    assert window.search_timer.isActive()
+    assert window.model.rowCount() == 2
+
+    window.search_timer.timeout.emit()
+
+    assert window.model.rowCount() == 1
+    assert "Older clean" in item_text(window, 0)
     assert window.detail_editor.toPlainText() == "Older clean."
 
 
@@ -116,6 +139,7 @@ def test_history_window_copy_reinsert_and_add_dictionary_actions(tmp_path):
         clipboard=clipboard,
         reinsert_callback=lambda text, row: reinserts.append((text, row.id)),
         glossary_path=glossary_path,
+        search_executor=run_inline,
     )
 
     window.copy_current_text()
@@ -128,3 +152,111 @@ def test_history_window_copy_reinsert_and_add_dictionary_actions(tmp_path):
     assert learned == "Newer clean Qwen Turbo."
     saved = json.loads(glossary_path.read_text(encoding="utf-8"))
     assert saved["user_terms"] == ["Newer clean Qwen Turbo."]
+
+
+def test_history_model_fetches_pages_on_demand(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryEntry
+    from voicetray.ui.history_window import HistoryWindow
+
+    qt_modules()
+    store = DictationHistoryStore(tmp_path / "history.db")
+    store.append_many(
+        HistoryEntry(
+            app_name="Notepad",
+            raw_text=f"raw {index}",
+            cleaned_text=f"Clean {index}.",
+            mode="balanced",
+            profile="notes",
+            duration_seconds=None,
+            model="base",
+        )
+        for index in range(25)
+    )
+    window = HistoryWindow(
+        store=store,
+        glossary_path=tmp_path / "glossary.json",
+        limit=10,
+        search_executor=run_inline,
+    )
+
+    assert window.model.rowCount() == 10
+    assert window.model.canFetchMore()
+
+    window.model.fetchMore()
+    window.model.fetchMore()
+
+    assert window.model.rowCount() == 25
+    assert not window.model.canFetchMore()
+    assert item_text(window, 24) == "Clean 0.  [Notepad]"
+
+
+def test_history_model_fetches_pages_off_the_ui_thread_and_evicts_far_rows(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryEntry
+    from voicetray.ui.history_window import HistoryListModel
+
+    qt_modules()
+    store = DictationHistoryStore(tmp_path / "history.db")
+    store.append_many(
+        HistoryEntry(
+            app_name="Notepad",
+            raw_text=f"raw {index}",
+            cleaned_text=f"Clean {index}.",
+            mode="balanced",
+            profile="notes",
+            duration_seconds=None,
+            model="base",
+        )
+        for index in range(20)
+    )
+    pending = []
+    fetched = []
+
+    def fetch_page(offset, limit):
+        fetched.append(offset)
+        return [result.row for result in store.search("clean", limit=limit, offset=offset)]
+
+    model = HistoryListModel(page_size=5, max_pages=2, executor=pending.append)
+    model.reset(fetch_page)
+
+    assert model.rowCount() == 0 and fetched == []
+    for _ in range(4):
+        model.fetchMore()
+        model.fetchMore()
+        assert len(pending) == 1
+        pending.pop()()
+
+    assert model.rowCount() == 20
+    assert fetched == [0, 5, 10, 15]
+    assert model.loaded_rows() == 10
+    assert model.data(model.index(0)) == HistoryListModel.LOADING_TEXT
+    assert model.row_at(0) is None
+
+    pending.pop()()
+
+    assert fetched[-1] == 0
+    assert model.row_at(0) is not None
+    assert model.loaded_rows() == 10
+    store.close()
+
+
+def test_history_window_drops_stale_search_results(tmp_path):
+    from voicetray.ui.history_window import HistoryWindow
+
+    store = build_history(tmp_path)
+    pending = []
+    window = HistoryWindow(
+        qt_modules=qt_modules(),
+        store=store,
+        glossary_path=tmp_path / "glossary.json",
+        search_executor=pending.append,
+    )
+    window.search_edit.setText("older")
+    window.apply_filter()
+    window.search_edit.setText("newer")
+    window.apply_filter()
+
+    pending[2]()
+    pending[1]()
+
+    assert window.model.rowCount() == 1
+    assert "Newer clean" in item_text(window, 0)
@@ -152,3 +152,133 @@ def test_character_typing_dependency_is_removed_from_runtime_sources():
     ]
 
     assert hits == []
+
+
+def test_prepared_insertion_stages_clipboard_and_commits_replacement_text():
+    from voicetray.insert.inserter import Inserter
+
+    clipboard = FakeClipboard("before")
+    keyboard = FakeKeyboard()
+    sleeps = []
+    inserter = Inserter(
+        clipboard=clipboard,
+        keyboard=keyboard,
+        sleep=sleeps.append,
+        restore_delay=0.15,
+        focus_provider=lambda: "notepad-hwnd",
+    )
+
+    prepared = inserter.prepare_insertion("rule text", start_focus="notepad-hwnd", app_title="Notepad")
+
+    assert clipboard.value == "rule text"
+    assert keyboard.ops == []
+
+    result = inserter.commit_insertion(prepared, "LLM text.")
+
+    assert result.status == "inserted"
+    assert result.method == "paste"
+    assert clipboard.ops == [
+        ("paste", "before"),
+        ("copy", "rule text"),
+        ("copy", "LLM text."),
+        ("copy", "before"),
+    ]
+    assert keyboard.ops == [("send", "ctrl+v")]
+    assert sleeps == [0.15, 0.15, 0.15]
+
+
+def test_prepared_insertion_commit_with_staged_text_does_not_recopy():
+    from voicetray.insert.inserter import Inserter
+
+    clipboard = FakeClipboard("before")
+    inserter = Inserter(
+        clipboard=clipboard,
+        keyboard=FakeKeyboard(),
+        sleep=lambda _seconds: None,
+        focus_provider=lambda: "same",
+    )
+
+    prepared = inserter.prepare_insertion("rule text", start_focus="same")
+    inserter.commit_insertion(prepared, "rule text")
+
+    assert clipboard.ops == [("paste", "before"), ("copy", "rule text"), ("copy", "before")]
+
+
+def test_discarded_insertion_restores_clipboard_once():
+    from voicetray.insert.inserter import Inserter
+
+    clipboard = FakeClipboard("before")
+    keyboard = FakeKeyboard()
+    inserter = Inserter(
+        clipboard=clipboard,
+        keyboard=keyboard,
+        sleep=lambda _seconds: None,
+        focus_provider=lambda: "same",
+    )
+
+    prepared = inserter.prepare_insertion("rule text", start_focus="same")
+    inserter.discard_insertion(prepared)
+    inserter.discard_insertion(prepared)
+
+    assert clipboard.value == "before"
+    assert clipboard.ops == [("paste", "before"), ("copy", "rule text"), ("copy", "before")]
+    assert keyboard.ops == []
+
+
+def test_prepared_insertion_skips_when_focus_changes_before_commit():
+    from voicetray.insert.inserter import Inserter
+
+    focus = {"current": "editor-hwnd"}
+    clipboard = FakeClipboard("before")
+    keyboard = FakeKeyboard()
+    inserter = Inserter(
+        clipboard=clipboard,
+        keyboard=keyboard,
+        sleep=lambda _seconds: None,
+        focus_provider=lambda: focus["current"],
+    )
+
+    prepared = inserter.prepare_insertion("rule text", start_focus="editor-hwnd")
+    focus["current"] = "browser-hwnd"
+    result = inserter.commit_insertion(prepared, "LLM text.")
+
+    assert result.status == "skipped_focus_changed"
+    assert keyboard.ops == []
+    assert clipboard.value == "before"
+
+
+def test_prepared_typing_insertion_skips_when_focus_changes_before_commit():
+    from voicetray.insert.inserter import Inserter
+
+    focus = {"current": "terminal-hwnd"}
+    keyboard = FakeKeyboard()
+    inserter = Inserter(
+        clipboard=FakeClipboard("before"),
+        keyboard=keyboard,
+        profiles=[{"match": "terminal", "insertion": "typing"}],
+        focus_provider=lambda: focus["current"],
+    )
+
+    prepared = inserter.prepare_insertion("rule text", start_focus="terminal-hwnd", app_title="Windows Terminal")
+    focus["current"] = "browser-hwnd"
+    result = inserter.commit_insertion(prepared, "LLM text.")
+
+    assert result.status == "skipped_focus_changed"
+    assert keyboard.ops == []
+
+
+def test_insert_text_asks_the_focus_provider_once():
+    from voicetray.insert.inserter import Inserter
+
+    calls = []
+    inserter = Inserter(
+        clipboard=FakeClipboard("before"),
+        keyboard=FakeKeyboard(),
+        sleep=lambda _seconds: None,
+        focus_provider=lambda: calls.append("focus") or "editor-hwnd",
+    )
+
+    result = inserter.insert_text("hello", start_focus="editor-hwnd")
+
+    assert result.status == "inserted"
+    assert calls == ["focus"]
@@ -14,7 +14,6 @@ def make_app():
     )
     app.expand_snippets = lambda text: text
     app.check_similarity_with_recent = lambda raw: False
-    app.recent_texts = []
     app.max_recent_texts = 5
     app.stt_config = types.SimpleNamespace(model_size="base")
     app.get_active_window_title = lambda: "Notepad"
@@ -34,8 +33,8 @@ def test_legacy_process_raw_transcript_uses_inserter_for_text_insertion():
 
     assert app.process_raw_transcript("words", insert_text=True) == "clean words"
 
-    assert events[0][0] == "history"
-    history_entry = events[0][1]
+    assert events[1][0] == "history"
+    history_entry = events[1][1]
     assert history_entry.app_name == "Notepad"
     assert history_entry.raw_text == "words"
     assert history_entry.cleaned_text == "clean words"
@@ -43,7 +42,7 @@ def test_legacy_process_raw_transcript_uses_inserter_for_text_insertion():
     assert history_entry.profile == "notes"
     assert history_entry.duration_seconds is None
     assert history_entry.model == "base"
-    assert events[1] == (
+    assert events[0] == (
         "insert",
         "clean words",
         {"start_focus": "start-hwnd", "app_title": "Notepad"},
@@ -51,7 +50,7 @@ def test_legacy_process_raw_transcript_uses_inserter_for_text_insertion():
     assert app.last_recognized_text == "clean words"
 
 
-def test_legacy_process_raw_transcript_records_history_before_insertion():
+def test_legacy_process_raw_transcript_inserts_before_recording_history():
     app = make_app()
     events = []
 
@@ -68,7 +67,7 @@ def test_legacy_process_raw_transcript_records_history_before_insertion():
 
     app.process_raw_transcript("words", insert_text=True)
 
-    assert events == ["history", "insert"]
+    assert events == ["insert", "history"]
 
 
 def test_legacy_process_raw_transcript_uses_supplied_duration():
@@ -135,3 +134,158 @@ def test_legacy_init_history_store_creates_store_with_default_path(monkeypatch):
 
     assert isinstance(app.history_store, FakeStore)
     assert created == [None]
+
+
+def test_legacy_speculative_cleanup_stages_rule_text_and_commits_llm_text():
+    from voicetray.dictation.pipeline import SpeculativeCleanup
+
+    app = make_app()
+    app.llm_speculative = True
+    app.llm_speculative_grace_seconds = 0.5
+    events = []
+
+    cleanup = SpeculativeCleanup("rule words")
+    cleanup.finish("LLM words.")
+    app.dictation_pipeline = types.SimpleNamespace(
+        begin_transcript=lambda raw, context: cleanup,
+        last_timings={"rules": 0.01, "llm": 0.2},
+    )
+
+    class FakeInserter:
+        def prepare_insertion(self, text, **kwargs):
+            events.append(("prepare", text, kwargs))
+            return "prepared"
+
+        def commit_insertion(self, prepared, text=None):
+            events.append(("commit", prepared, text))
+            return types.SimpleNamespace(status="inserted", method="paste")
+
+        def discard_insertion(self, prepared):
+            events.append(("discard", prepared))
+
+    app.inserter = FakeInserter()
+    app.history_store = types.SimpleNamespace(
+        append=lambda entry: events.append(("history", entry.cleaned_text)) or 1
+    )
+
+    assert app.process_raw_transcript("words", insert_text=True) == "LLM words."
+
+    assert events == [
+        ("prepare", "rule words", {"start_focus": "start-hwnd", "app_title": "Notepad"}),
+        ("commit", "prepared", "LLM words."),
+        ("history", "LLM words."),
+    ]
+
+
+def test_legacy_speculative_cleanup_falls_back_to_rule_text_after_grace_window():
+    from voicetray.dictation.pipeline import SpeculativeCleanup
+
+    app = make_app()
+    app.llm_speculative = True
+    app.llm_speculative_grace_seconds = 0.0
+    commits = []
+    app.dictation_pipeline = types.SimpleNamespace(
+        begin_transcript=lambda raw, context: SpeculativeCleanup("rule words"),
+        last_timings={"rules": 0.01, "llm": 0.0},
+    )
+    app.inserter = types.SimpleNamespace(
+        prepare_insertion=lambda text, **_kwargs: text,
+        commit_insertion=lambda prepared, text=None: commits.append((prepared, text))
+        or types.SimpleNamespace(status="inserted", method="paste"),
+        discard_insertion=lambda _prepared: None,
+    )
+    app.history_store = types.SimpleNamespace(append=lambda _entry: 1)
+
+    assert app.process_raw_transcript("words", insert_text=True) == "rule words"
+    assert commits == [("rule words", "rule words")]
+
+
+def test_legacy_similarity_check_uses_recent_and_history_indexes():
+    from voicetray.dictation.dedup import NearDuplicateIndex
+    from voicetray.legacy_app import VoiceTrayApp
+
+    app = VoiceTrayApp.__new__(VoiceTrayApp)
+    app.max_recent_texts = 2
+    app.history_text_index = NearDuplicateIndex(window=None)
+    app.history_text_index.add("Archived note about renewing the parking permit.")
+
+    app.remember_processed_text("Ship the release notes after lunch.")
+
+    assert app.check_similarity_with_recent("ship the release notes after lunch")
+    assert app.check_similarity_with_recent("archived note about renewing the parking permit")
+    assert not app.check_similarity_with_recent("Completely different words here.")
+
+
+def test_legacy_expand_snippets_compiles_expander_from_loaded_snippets():
+    from voicetray.legacy_app import VoiceTrayApp
+
+    app = VoiceTrayApp.__new__(VoiceTrayApp)
+    app.snippets = {"addr home": "9 Elm Street"}
+
+    assert app.expand_snippets("ship to addr home") == "ship to 9 Elm Street"
+
+
+def test_legacy_cleanup_stops_maintenance_flushes_writer_then_closes_store():
+    from voicetray.legacy_app import VoiceTrayApp
+
+    app = VoiceTrayApp.__new__(VoiceTrayApp)
+    app.is_listening = False
+    closed = []
+    app.history_maintenance = types.SimpleNamespace(stop=lambda: closed.append("maintenance"))
+    app.history_writer = types.SimpleNamespace(close=lambda: closed.append("writer"))
+    app.history_store = types.SimpleNamespace(close=lambda: closed.append("store"))
+
+    app.cleanup()
+
+    assert closed == ["maintenance", "writer", "store"]
+
+
+def test_legacy_history_is_recorded_even_when_insertion_raises():
+    import pytest
+
+    app = make_app()
+    entries = []
+
+    def insert_text(_text, **_kwargs):
+        raise RuntimeError("clipboard locked")
+
+    app.inserter = types.SimpleNamespace(insert_text=insert_text)
+    app.history_store = types.SimpleNamespace(append=lambda entry: entries.append(entry) or 1)
+
+    with pytest.raises(RuntimeError):
+        app.process_raw_transcript("words", insert_text=True)
+
+    assert [entry.cleaned_text for entry in entries] == ["clean words"]
+
+
+def test_legacy_record_history_entry_queues_on_history_writer():
+    app = make_app()
+    submitted = []
+    app.history_writer = types.SimpleNamespace(submit=submitted.append)
+    app.history_store = types.SimpleNamespace(
+        append=lambda _entry: (_ for _ in ()).throw(AssertionError("synchronous write"))
+    )
+    context = types.SimpleNamespace(mode="balanced", profile="notes")
+
+    app.record_history_entry("words", "clean words", context, None, "Notepad")
+
+    assert [entry.cleaned_text for entry in submitted] == ["clean words"]
+
+
+def test_legacy_history_entry_carries_stage_timings_and_audio_stats():
+    app = make_app()
+    entries = []
+    app.inserter = types.SimpleNamespace(
+        insert_text=lambda *_args, **_kwargs: types.SimpleNamespace(status="inserted", method="paste")
+    )
+    app.history_store = types.SimpleNamespace(append=lambda entry: entries.append(entry) or 1)
+    timings = {"record": 2.0, "vad": 0.01, "stt": 0.4, "audio_seconds": 2.0, "trimmed_seconds": 1.6}
+
+    app.process_raw_transcript("words", insert_text=True, timings=timings)
+
+    entry = entries[0]
+    assert entry.timings["record"] == 2.0
+    assert entry.timings["stt"] == 0.4
+    assert "insert" in entry.timings
+    assert entry.timings["total"] == sum(entry.timings.get(stage, 0.0) for stage in ("vad", "stt", "rules", "llm", "insert"))
+    assert (entry.audio_seconds, entry.trimmed_seconds) == (2.0, 1.6)
@@ -0,0 +1,86 @@
+from voicetray.dictation.gate import LLMGateConfig, LLMGateStats, decide_llm_gate, word_edit_ratio
+
+
+def test_gate_skips_short_transcripts():
+    decision = decide_llm_gate("open settings", "Open settings", LLMGateConfig())
+
+    assert decision.use_llm is False
+    assert decision.reason == "short"
+
+
+def test_gate_sends_transcripts_with_self_correction_or_filler_markers():
+    cfg = LLMGateConfig()
+
+    correction = decide_llm_gate(
+        "meet on tuesday no wait wednesday at noon",
+        "Meet on tuesday no wait wednesday at noon",
+        cfg,
+    )
+    filler = decide_llm_gate("uh the build is green again", "The build is green again", cfg)
+
+    assert (correction.use_llm, correction.reason) == (True, "disfluency")
+    assert (filler.use_llm, filler.reason) == (True, "disfluency")
+
+
+def test_gate_does_not_treat_verb_like_as_a_filler():
+    decision = decide_llm_gate("I would like a coffee.", "I would like a coffee.", LLMGateConfig())
+
+    assert decision.use_llm is False
+    assert decision.reason == "rules_confident"
+
+
+def test_gate_sends_heavily_edited_transcripts():
+    decision = decide_llm_gate(
+        "the the plan plan is is ready ready",
+        "The plan is ready",
+        LLMGateConfig(),
+    )
+
+    assert decision.use_llm is True
+    assert decision.reason == "heavy_edits"
+
+
+def test_gate_sends_long_unpunctuated_transcripts():
+    raw = "we reviewed the draft with the team and agreed to ship it after the final legal review next week"
+
+    decision = decide_llm_gate(raw, raw, LLMGateConfig())
+
+    assert decision.use_llm is True
+    assert decision.reason == "sparse_punctuation"
+
+
+def test_gate_skips_well_punctuated_unchanged_text():
+    text = "We reviewed the draft with the team. We agreed to ship it, after legal review, next week."
+
+    decision = decide_llm_gate(text, text, LLMGateConfig())
+
+    assert decision.use_llm is False
+    assert decision.reason == "rules_confident"
+
+
+def test_gate_disabled_always_sends():
+    decision = decide_llm_gate("ok", "Ok", LLMGateConfig(enabled=False))
+
+    assert decision.use_llm is True
+    assert decision.reason == "gate_disabled"
+
+
+def test_gate_stats_track_hit_rate():
+    stats = LLMGateStats()
+    cfg = LLMGateConfig()
+
+    stats.record(decide_llm_gate("ok", "Ok", cfg))
+    stats.record(decide_llm_gate("um we should ship it today", "We should ship it today", cfg))
+    stats.record(decide_llm_gate("yes", "Yes", cfg))
+    stats.record(decide_llm_gate("no", "No", cfg))
+
+    assert stats.checked == 4
+    assert stats.sent == 1
+    assert stats.skipped == 3
+    assert stats.hit_rate == 25.0
+
+
+def test_word_edit_ratio_is_case_insensitive():
+    assert word_edit_ratio(["Hello", "World"], ["hello", "world"]) == 0.0
+    assert word_edit_ratio([], []) == 0.0
+    assert word_edit_ratio(["a", "b"], []) == 1.0
@@ -0,0 +1,97 @@
+import json
+import urllib.request
+
+import pytest
+
+from voicetray.metrics import STAGE_SECONDS, MetricsRegistry, MetricsServer, count, observe_stage
+
+
+def test_counter_and_gauge_track_labelled_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("voicetray_things_total", "Things")
+    counter.inc()
+    counter.inc(2, kind="a")
+    gauge = registry.gauge("voicetray_depth")
+    gauge.set(4)
+    gauge.dec()
+
+    assert counter.value() == 1
+    assert counter.value(kind="a") == 2
+    assert gauge.value() == 3
+    with pytest.raises(ValueError):
+        counter.inc(-1)
+    with pytest.raises(ValueError):
+        registry.gauge("voicetray_things_total")
+
+
+def test_histogram_buckets_are_cumulative_in_snapshot_and_prometheus_text():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("voicetray_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, stage="stt")
+
+    sample = registry.snapshot()["voicetray_latency_seconds"]["samples"][0]
+    assert sample["labels"] == {"stage": "stt"}
+    assert sample["count"] == 4
+    assert sample["buckets"] == {"0.1": 1, "1": 3, "+Inf": 4}
+
+    text = registry.to_prometheus()
+    assert "# TYPE voicetray_latency_seconds histogram" in text
+    assert 'voicetray_latency_seconds_bucket{stage="stt",le="1"} 3' in text
+    assert 'voicetray_latency_seconds_count{stage="stt"} 4' in text
+
+
+def test_stage_helpers_write_to_shared_stage_histogram():
+    registry = MetricsRegistry()
+
+    observe_stage("rules", 0.002, registry=registry)
+    observe_stage("rules", 0.004, registry=registry)
+    count("voicetray_insertions_total", registry=registry, status="inserted")
+
+    assert registry.histogram(STAGE_SECONDS).count(stage="rules") == 2
+    assert registry.counter("voicetray_insertions_total").value(status="inserted") == 1
+
+
+def test_history_writer_reports_written_entries(tmp_path):
+    from voicetray.history import DictationHistoryStore, HistoryEntry, HistoryWriter
+    from voicetray.metrics import REGISTRY
+
+    written = REGISTRY.counter("voicetray_history_entries_written_total")
+    before = written.value()
+    with DictationHistoryStore(tmp_path / "history.db") as store:
+        writer = HistoryWriter(store)
+        writer.submit(HistoryEntry(app_name=None, raw_text="a", cleaned_text="A", mode="balanced", profile="notes", duration_seconds=None, model="base"))
+        writer.close()
+
+    assert written.value() == before + 1
+
+
+def test_metrics_server_serves_prometheus_and_json_on_localhost():
+    registry = MetricsRegistry()
+    registry.counter("voicetray_dictations_total").inc()
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        host, port = server.address
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            text = response.read().decode("utf-8")
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics.json", timeout=5) as response:
+            payload = json.loads(response.read())
+    finally:
+        server.stop()
+
+    assert "voicetray_dictations_total 1" in text
+    assert payload["voicetray_dictations_total"]["samples"] == [{"labels": {}, "value": 1.0}]
+    assert server.address is None
+
+
+def test_incomplete_metric_subclass_fails_when_created():
+    from voicetray.metrics import _Metric
+
+    class SamplesOnly(_Metric):
+        def samples(self):
+            return []
+
+    with pytest.raises(TypeError):
+        SamplesOnly("voicetray_incomplete")
@@ -0,0 +1,267 @@
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _write_model(directory, weights=b"weights", config=b"{}"):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "model.bin").write_bytes(weights)
+    (directory / "config.json").write_bytes(config)
+    return directory
+
+
+def test_add_directory_deduplicates_blobs_and_publishes_read_only_snapshot(tmp_path):
+    from voicetray.model_cache import MANIFEST_NAME, ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+
+    base = cache.add_directory("whisper-base", _write_model(tmp_path / "base"))
+    small = cache.add_directory("whisper-small", _write_model(tmp_path / "small", weights=b"other"))
+
+    assert (base / MANIFEST_NAME).exists()
+    assert (base / "model.bin").read_bytes() == b"weights"
+    assert not os.stat(base / "model.bin").st_mode & stat.S_IWUSR
+    blobs = [path for path in (tmp_path / "cache" / "blobs").rglob("*") if path.is_file()]
+    assert len(blobs) == 3
+    if sys.platform != "win32":
+        assert os.stat(base / "config.json").st_ino == os.stat(small / "config.json").st_ino
+    assert cache.resolve("whisper-base") == base
+    assert cache.resolve("whisper-missing") is None
+    assert cache.add_directory("whisper-base", tmp_path / "base") == base
+
+
+def test_verify_and_resolve_reject_damaged_snapshots(tmp_path):
+    from voicetray.model_cache import ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+    snapshot = cache.add_directory("whisper-base", _write_model(tmp_path / "base"))
+    weights = snapshot / "model.bin"
+    os.chmod(weights, stat.S_IRUSR | stat.S_IWUSR)
+    weights.write_bytes(b"WEIGHTS")
+
+    assert cache.verify(snapshot) == ["model.bin"]
+    assert cache.resolve("whisper-base") is None
+    assert cache.resolve("whisper-base", verify=True) is None
+
+    weights.write_bytes(b"short")
+
+    assert cache.resolve("whisper-base") is None
+
+
+def test_ensure_downloads_once_and_moves_hugging_face_blobs(tmp_path):
+    from voicetray.model_cache import ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+    fetches = []
+    progress = []
+
+    def fetch(staging):
+        fetches.append(staging)
+        blobs = staging / "models--Systran--faster-whisper-base" / "blobs"
+        snapshot = staging / "models--Systran--faster-whisper-base" / "snapshots" / "rev1"
+        blobs.mkdir(parents=True)
+        snapshot.mkdir(parents=True)
+        (blobs / "abc").write_bytes(b"weights")
+        (blobs / "def").write_bytes(b"{}")
+        if sys.platform == "win32":
+            (snapshot / "model.bin").write_bytes(b"weights")
+            (snapshot / "config.json").write_bytes(b"{}")
+        else:
+            (snapshot / "model.bin").symlink_to(blobs / "abc")
+            (snapshot / "config.json").symlink_to(blobs / "def")
+
+    first = cache.ensure("whisper-base", fetch, progress_callback=progress.append)
+    second = cache.ensure("whisper-base", fetch)
+
+    assert first == second
+    assert len(fetches) == 1
+    assert not fetches[0].exists()
+    assert sorted(path.name for path in first.iterdir()) == ["config.json", "model.bin", "voicetray-manifest.json"]
+    assert progress == [5, 90, 100]
+    assert list((tmp_path / "cache" / "tmp").iterdir()) == []
+
+
+def test_download_whisper_model_uses_shared_cache_unless_models_dir_given(tmp_path):
+    from voicetray.model_download import download_whisper_model
+
+    calls = []
+
+    def fake_factory(model_size, *, download_root, **kwargs):
+        calls.append((model_size, kwargs))
+        _write_model(Path(download_root) / "snapshot")
+
+    config = {"stt": {"model_cache_dir": str(tmp_path / "cache")}}
+
+    first = download_whisper_model("base", model_factory=fake_factory, config=config)
+    second = download_whisper_model("base", model_factory=fake_factory, config=config)
+
+    assert first == second
+    assert first.parent == tmp_path / "cache" / "models" / "whisper-base"
+    assert len(calls) == 1
+    assert calls[0][1]["local_files_only"] is False
+
+
+def test_whisper_engine_loads_shared_cached_snapshot(tmp_path, monkeypatch):
+    from voicetray.config import default_config
+    from voicetray.model_cache import ModelCache
+    from voicetray.stt.whisper_engine import WhisperEngine, WhisperEngineConfig
+
+    monkeypatch.delenv("VOICETRAY_MODEL_CACHE", raising=False)
+    snapshot = ModelCache(tmp_path / "cache").add_directory("whisper-base", _write_model(tmp_path / "base"))
+    cfg = default_config()
+    cfg["stt"]["model_cache_dir"] = str(tmp_path / "cache")
+    loaded = []
+
+    def factory(model, **_kwargs):
+        loaded.append(model)
+        return object()
+
+    WhisperEngine(WhisperEngineConfig.from_app_config(cfg), model_factory=factory).load()
+    cfg["stt"]["model_size"] = "tiny"
+    WhisperEngine(WhisperEngineConfig.from_app_config(cfg), model_factory=factory).load()
+    cfg["stt"]["shared_model_cache"] = False
+    cfg["stt"]["model_size"] = "base"
+    WhisperEngine(WhisperEngineConfig.from_app_config(cfg), model_factory=factory).load()
+
+    assert loaded == [str(snapshot), "tiny", "base"]
+
+
+def test_install_lock_waits_out_stale_lock_it_cannot_remove(tmp_path, monkeypatch):
+    import voicetray.model_cache as model_cache
+
+    lock_path = tmp_path / "whisper-base.lock"
+    lock_path.write_text("{}", encoding="utf-8")
+    os.utime(lock_path, (0, 0))
+    unlinks = []
+
+    def refuse_unlink(self, *args, **kwargs):
+        unlinks.append(self)
+        raise PermissionError("owned by another user")
+
+    sleeps = []
+    monkeypatch.setattr(Path, "unlink", refuse_unlink)
+    monkeypatch.setattr(model_cache.time, "sleep", sleeps.append)
+
+    with model_cache._InstallLock(lock_path, wait_seconds=0.05, poll_seconds=0.01) as lock:
+        assert lock._held is False
+
+    assert sleeps
+    assert len(unlinks) == len(sleeps) + 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_cache_directories_are_shared_across_users_regardless_of_umask(tmp_path):
+    from voicetray.model_cache import ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+    previous = os.umask(0o077)
+    try:
+        snapshot = cache.ensure("whisper-base", lambda staging: _write_model(staging))
+    finally:
+        os.umask(previous)
+
+    root = tmp_path / "cache"
+    blob_dir = next((root / "blobs" / "sha256").iterdir())
+    shared = [root / "blobs", root / "blobs" / "sha256", blob_dir, root / "models", root / "models" / "whisper-base"]
+    for directory in [*shared, root / "tmp"]:
+        assert stat.S_IMODE(directory.stat().st_mode) == 0o1777, directory
+    assert stat.S_IMODE(snapshot.stat().st_mode) == 0o755
+    assert all(os.stat(path).st_mode & stat.S_IROTH for path in snapshot.iterdir())
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0, reason="needs root to act as another user")
+def test_resolve_ignores_newer_snapshot_planted_by_another_user(tmp_path):
+    import hashlib
+    import json
+    import time
+
+    from voicetray.model_cache import MANIFEST_NAME, ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+    real = cache.add_directory("whisper-base", _write_model(tmp_path / "base"))
+    stranger = 54321
+    planted = tmp_path / "cache" / "models" / "whisper-base" / "planted"
+    _write_model(planted, weights=b"EVILWTS")
+    (planted / MANIFEST_NAME).write_text(
+        json.dumps(
+            {
+                "name": "whisper-base",
+                "created_at": time.time() + 3600,
+                "files": [
+                    {"path": name, "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+                    for name, data in (("model.bin", b"EVILWTS"), ("config.json", b"{}"))
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    for path in [planted, *planted.iterdir()]:
+        os.chown(path, stranger, stranger)
+    os.chmod(planted, 0o755)
+
+    assert cache.resolve("whisper-base") == real
+
+    # The same user's own newer snapshot is still preferred.
+    for path in [planted, *planted.iterdir()]:
+        os.chown(path, os.getuid(), os.getgid())
+    assert cache.resolve("whisper-base") == planted
+
+
+def test_add_directory_does_not_link_a_planted_blob_with_wrong_contents(tmp_path):
+    import hashlib
+
+    from voicetray.model_cache import ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+    digest = hashlib.sha256(b"weights").hexdigest()
+    fake = tmp_path / "cache" / "blobs" / "sha256" / digest[:2] / digest
+    fake.parent.mkdir(parents=True)
+    fake.write_bytes(b"EVILWTS")
+
+    snapshot = cache.add_directory("whisper-base", _write_model(tmp_path / "base"))
+
+    assert (snapshot / "model.bin").read_bytes() == b"weights"
+    assert cache.resolve("whisper-base", verify=True) == snapshot
+    assert fake.read_bytes() == b"EVILWTS"
+
+
+def test_install_lock_heartbeat_keeps_long_installs_from_looking_stale(tmp_path):
+    import time
+
+    from voicetray.model_cache import _InstallLock
+
+    lock_path = tmp_path / "whisper-base.lock"
+    with _InstallLock(lock_path, wait_seconds=0, heartbeat_seconds=0.01) as lock:
+        os.utime(lock_path, (0, 0))
+        deadline = time.monotonic() + 2
+        while lock_path.stat().st_mtime == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert lock.held
+        assert not lock._is_stale()
+
+    assert not lock_path.exists()
+
+
+def test_ensure_stages_privately_when_lock_wait_times_out(tmp_path):
+    from voicetray.model_cache import ModelCache
+
+    cache = ModelCache(tmp_path / "cache")
+    shared = cache._resume_dir("whisper-base")
+    shared.mkdir(parents=True)
+    (shared / "model.bin.part").write_bytes(b"other session")
+    (tmp_path / "cache" / "tmp" / "whisper-base.lock").write_text("{}", encoding="utf-8")
+    staged = []
+
+    def fetch(staging):
+        staged.append(staging)
+        _write_model(staging)
+
+    snapshot = cache.ensure("whisper-base", fetch, wait_seconds=0)
+
+    assert staged[0] != shared
+    assert not staged[0].exists()
+    assert (shared / "model.bin.part").read_bytes() == b"other session"
+    assert (snapshot / "model.bin").read_bytes() == b"weights"
@@ -25,3 +25,16 @@ def test_legacy_entrypoint_delegates_to_voicetray_main(monkeypatch):
     legacy_entrypoint.main()
 
     assert calls == ["called"]
+
+
+def test_legacy_dictation_package_aliases_every_submodule():
+    import pkgutil
+
+    import dictation
+    import voicetray.dictation
+
+    names = {module.name for module in pkgutil.iter_modules(voicetray.dictation.__path__)}
+
+    assert set(dictation._SUBMODULES) == names
+    for name in names:
+        assert importlib.import_module(f"dictation.{name}") is importlib.import_module(f"voicetray.dictation.{name}")
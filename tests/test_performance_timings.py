@@ -21,6 +21,8 @@ def test_whisper_engine_records_vad_and_stt_timings():
     assert set(engine.last_timings) >= {"vad", "stt"}
     assert engine.last_timings["vad"] >= 0
     assert engine.last_timings["stt"] >= 0
+    assert engine.last_audio_seconds == 2 / 16_000
+    assert engine.last_trimmed_seconds == 2 / 16_000
 
 
 def test_dictation_pipeline_records_rules_and_llm_timings():
@@ -1,6 +1,8 @@
+import threading
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
+from dictation.gate import LLMGateConfig
 from dictation.glossary import Glossary
 from dictation.llm_local import LocalLLMConfig
 from dictation.pipeline import DictationConfig, DictationPipeline
@@ -23,6 +25,18 @@ class FakeLLMSafePunct:
         return text.strip() + ".", "ok"
 
 
+class FakeLLMSkipsNothing:
+    def __init__(self):
+        self.calls = []
+
+    def available(self) -> bool:
+        return True
+
+    def clean(self, text: str, *, tone_hint: str = "neutral") -> Tuple[Optional[str], str]:
+        self.calls.append(text)
+        return text, "ok"
+
+
 class FakeLLMRecordsTone:
     def __init__(self):
         self.calls = []
@@ -44,7 +58,11 @@ def test_glossary_protection_survives_rules():
 
 
 def test_fallback_when_llm_output_is_unsafe():
-    cfg = DictationConfig(glossary_path="", llm=LocalLLMConfig(enabled=True, model_path="x"))
+    cfg = DictationConfig(
+        glossary_path="",
+        llm=LocalLLMConfig(enabled=True, model_path="x"),
+        llm_gate=LLMGateConfig(enabled=False),
+    )
     p = DictationPipeline(cfg, llm_cleaner=FakeLLMUnsafeNumbers())
     out = p.process_transcript("send 2 files", DictationContext(mode="balanced", profile="general"))
     assert "2" in out
@@ -67,7 +85,11 @@ def test_mode_differences_raw_vs_balanced_vs_aggressive():
 
 
 def test_llm_safe_output_is_accepted():
-    cfg = DictationConfig(glossary_path="", llm=LocalLLMConfig(enabled=True, model_path="x"))
+    cfg = DictationConfig(
+        glossary_path="",
+        llm=LocalLLMConfig(enabled=True, model_path="x"),
+        llm_gate=LLMGateConfig(enabled=False),
+    )
     p = DictationPipeline(cfg, llm_cleaner=FakeLLMSafePunct())
     out = p.process_transcript("hello world", DictationContext(mode="balanced", profile="general"))
     assert out.endswith(".")
@@ -127,7 +149,11 @@ def test_general_profile_keeps_new_paragraph_as_words():
 
 
 def test_pipeline_passes_profile_tone_hint_to_llm():
-    cfg = DictationConfig(glossary_path="", llm=LocalLLMConfig(enabled=True, model_path="x"))
+    cfg = DictationConfig(
+        glossary_path="",
+        llm=LocalLLMConfig(enabled=True, model_path="x"),
+        llm_gate=LLMGateConfig(enabled=False),
+    )
 
     expected_tones = {
         "email": "formal",
@@ -157,3 +183,97 @@ def test_pipeline_learn_word_persists_and_reloads_glossary(tmp_path):
     out = p.process_transcript("qwen turbo is ready", DictationContext(mode="balanced", profile="general"))
     assert "qwen turbo" in out.lower()
 
+
+
+def test_llm_gate_skips_short_commands_and_records_hit_rate():
+    cfg = DictationConfig(glossary_path="", llm=LocalLLMConfig(enabled=True, model_path="x"))
+    fake_llm = FakeLLMSkipsNothing()
+    p = DictationPipeline(cfg, llm_cleaner=fake_llm)
+
+    p.process_transcript("send it", DictationContext(mode="balanced", profile="general"))
+    assert fake_llm.calls == []
+    assert p.last_gate_decision.reason == "short"
+
+    p.process_transcript(
+        "um so I think we should move the meeting to friday",
+        DictationContext(mode="balanced", profile="general"),
+    )
+    assert len(fake_llm.calls) == 1
+    assert p.last_gate_decision.reason == "disfluency"
+    assert p.llm_gate_stats.checked == 2
+    assert p.llm_gate_stats.sent == 1
+    assert p.llm_gate_stats.hit_rate == 50.0
+
+
+class FakeLLMBlocksUntilReleased:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def available(self) -> bool:
+        return True
+
+    def clean(self, text: str, *, tone_hint: str = "neutral") -> Tuple[Optional[str], str]:
+        self.release.wait(5.0)
+        return text.strip() + ".", "ok"
+
+
+def test_begin_transcript_returns_rule_text_while_llm_runs():
+    cfg = DictationConfig(
+        glossary_path="",
+        llm=LocalLLMConfig(enabled=True, model_path="x"),
+        llm_gate=LLMGateConfig(enabled=False),
+    )
+    fake_llm = FakeLLMBlocksUntilReleased()
+    p = DictationPipeline(cfg, llm_cleaner=fake_llm)
+
+    cleanup = p.begin_transcript("um hello world", DictationContext(mode="balanced", profile="general"))
+
+    assert cleanup.rule_text == "Hello world"
+    assert cleanup.wait(0.01) is None
+    assert cleanup.pending is True
+
+    fake_llm.release.set()
+
+    assert cleanup.wait(5.0) == "Hello world."
+    assert cleanup.pending is False
+
+
+def test_begin_transcript_skips_llm_for_raw_mode():
+    cfg = DictationConfig(
+        glossary_path="",
+        llm=LocalLLMConfig(enabled=True, model_path="x"),
+        llm_gate=LLMGateConfig(enabled=False),
+    )
+    fake_llm = FakeLLMSkipsNothing()
+    p = DictationPipeline(cfg, llm_cleaner=fake_llm)
+
+    cleanup = p.begin_transcript("um hello", DictationContext(mode="raw", profile="general"))
+
+    assert cleanup.pending is False
+    assert cleanup.rule_text == "um hello"
+    assert cleanup.wait(0) is None
+    assert fake_llm.calls == []
+
+
+def test_begin_transcript_falls_back_to_rules_while_previous_llm_pass_runs():
+    cfg = DictationConfig(
+        glossary_path="",
+        llm=LocalLLMConfig(enabled=True, model_path="x"),
+        llm_gate=LLMGateConfig(enabled=False),
+    )
+    fake_llm = FakeLLMBlocksUntilReleased()
+    p = DictationPipeline(cfg, llm_cleaner=fake_llm)
+    context = DictationContext(mode="balanced", profile="general")
+
+    first = p.begin_transcript("um hello world", context)
+    second = p.begin_transcript("um goodbye world", context)
+
+    assert first.pending is True
+    assert second.pending is False
+    assert second.rule_text == "Goodbye world"
+    assert second.wait(0) is None
+
+    fake_llm.release.set()
+    assert first.wait(5.0) == "Hello world."
+    third = p.begin_transcript("um hello again", context)
+    assert third.wait(5.0) == "Hello again."
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+import zipfile
+
+from voicetray.diagnostics import write_diagnostics_bundle
+from voicetray.profiling import DictationProfiler, ProfilingConfig, StackSampler
+
+
+def busy_dictation_work(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiling_config_reads_app_config_and_rejects_unknown_modes():
+    config = ProfilingConfig.from_app_config(
+        {"profiling": {"enabled": True, "mode": "perf", "threshold_ms": 1500, "max_files": 3}}
+    )
+
+    assert config.enabled is True
+    assert config.mode == "sampling"
+    assert config.threshold_seconds == 1.5
+    assert config.max_files == 3
+    assert ProfilingConfig.from_app_config({}).enabled is False
+
+
+def test_stack_sampler_captures_other_threads_as_folded_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_dictation_work, args=(stop,), name="voicetray-worker")
+    worker.start()
+    sampler = StackSampler(0.001)
+    try:
+        for _ in range(5):
+            sampler.sample_once()
+    finally:
+        stop.set()
+        worker.join()
+
+    folded = sampler.folded()
+    assert sampler.sample_count == 5
+    assert any(
+        line.startswith("voicetray-worker;") and "busy_dictation_work" in line
+        for line in folded.splitlines()
+    )
+
+
+def test_disabled_profiler_does_not_start_a_session(tmp_path):
+    assert DictationProfiler(ProfilingConfig(), tmp_path).start() is None
+
+
+def test_profiler_keeps_only_dictations_over_the_budget_and_rotates(tmp_path):
+    profiler = DictationProfiler(
+        ProfilingConfig(enabled=True, mode="cprofile", max_files=2),
+        tmp_path,
+    )
+
+    fast = profiler.start()
+    assert profiler.finish(fast, 0.2, budget_seconds=1.5, label="fast") == []
+
+    written = []
+    for index in range(3):
+        session = profiler.start()
+        sum(range(10_000))
+        written.append(profiler.finish(session, 2.0, budget_seconds=1.5, label=f"slow{index}"))
+        time.sleep(0.01)
+
+    assert [path.suffix for path in written[0]] == [".prof", ".txt"]
+    assert "cumulative" in written[-1][1].read_text(encoding="utf-8")
+    remaining = sorted(os.listdir(tmp_path))
+    assert remaining == sorted(path.name for paths in written[1:] for path in paths)
+
+
+def test_explicit_threshold_overrides_latency_budget(tmp_path):
+    profiler = DictationProfiler(ProfilingConfig(enabled=True, threshold_seconds=0.5), tmp_path)
+
+    paths = profiler.finish(profiler.start(), 0.6, budget_seconds=3.0)
+
+    assert [path.name.endswith(".folded.txt") for path in paths] == [True]
+
+
+def test_diagnostics_bundle_collects_logs_traces_and_profiles(tmp_path):
+    logs = tmp_path / "logs"
+    (logs / "traces").mkdir(parents=True)
+    (logs / "profiles").mkdir()
+    (logs / "voicetray.log").write_text("started\n", encoding="utf-8")
+    (logs / "voicetray.log.1").write_text("older\n", encoding="utf-8")
+    (logs / "traces" / "dictation-1.json").write_text("{}", encoding="utf-8")
+    (logs / "profiles" / "dictation-1.folded.txt").write_text("main;run 1\n", encoding="utf-8")
+
+    bundle = write_diagnostics_bundle(tmp_path / "bundle.zip", log_dir=logs)
+
+    with zipfile.ZipFile(bundle) as archive:
+        names = set(archive.namelist())
+        system = json.loads(archive.read("system.json"))
+    assert names == {
+        "system.json",
+        "logs/voicetray.log",
+        "logs/voicetray.log.1",
+        "traces/dictation-1.json",
+        "profiles/dictation-1.folded.txt",
+    }
+    assert system["voicetray"]
+    assert "metrics" in system
+
+
+def test_legacy_slow_dictation_writes_profile_named_after_trace(tmp_path):
+    import types
+
+    from voicetray.legacy_app import VoiceTrayApp
+
+    app = VoiceTrayApp.__new__(VoiceTrayApp)
+    app.dictation_profiler = DictationProfiler(ProfilingConfig(enabled=True), tmp_path)
+
+    def transcribe(audio, timings=None):
+        timings["stt"] = 2.0
+        return "words"
+
+    app.transcribe_audio_to_text = transcribe
+    app.process_raw_transcript = lambda raw, **kwargs: "Words."
+    app.trace_log = types.SimpleNamespace(record=lambda trace, processing_seconds=None: traces.append(trace))
+    traces = []
+
+    assert app.process_recorded_audio([0.0]) == "Words."
+
+    (path,) = tmp_path.iterdir()
+    assert traces[0].trace_id in path.name
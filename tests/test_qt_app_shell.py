@@ -754,3 +754,102 @@ def test_qt_app_shell_does_not_call_print():
     ]
 
     assert calls == []
+
+
+def test_voice_tray_app_starts_controller_after_tray_is_shown():
+    from voicetray.app import VoiceTrayApp
+
+    events = []
+    scheduled = []
+
+    class FakeTimer:
+        @staticmethod
+        def singleShot(msec, callback):
+            events.append(("scheduled", msec))
+            scheduled.append(callback)
+
+    class FakeController:
+        def __init__(self, _signals):
+            pass
+
+        def start(self):
+            events.append("start")
+
+        def stop(self):
+            pass
+
+    class Quiet:
+        def __getattr__(self, _name):
+            return lambda *_args: None
+
+    class FakeTray(Quiet):
+        def __init__(self, **_kwargs):
+            events.append("tray")
+
+        def set_model_label(self, label):
+            events.append(("model", label))
+
+    qt_modules = fake_qt_modules()
+    qt_modules.QtCore.QTimer = FakeTimer
+    app = VoiceTrayApp(
+        argv=["voicetray"],
+        qt_modules=qt_modules,
+        controller_factory=FakeController,
+        tray_factory=lambda **kwargs: FakeTray(**kwargs),
+        pill_factory=lambda **_kwargs: Quiet(),
+        config_loader=lambda **_kwargs: {"app": {"onboarded": True}},
+        crash_guard_installer=lambda notify: None,
+    )
+
+    assert app.run() == 23
+    assert events == ["tray", ("scheduled", 0)]
+
+    scheduled[0]()
+
+    assert events[2:] == ["start", ("model", "base")]
+
+
+def test_app_startup_report_loads_model_and_exits_without_event_loop(monkeypatch):
+    import voicetray.app as app_module
+    from voicetray.startup import FIRST_DICTATION_READY, READY, TRAY_ICON, StartupTimeline
+
+    timeline = StartupTimeline()
+    monkeypatch.setattr(app_module, "STARTUP", timeline)
+    events = []
+
+    class Quiet:
+        def __getattr__(self, _name):
+            return lambda *_args: None
+
+    class FakeController(Quiet):
+        def __init__(self, _signals):
+            pass
+
+        def start(self):
+            events.append("start")
+
+        def preload_model(self):
+            events.append("preload")
+
+        def stop(self):
+            events.append("stop")
+
+    app = app_module.VoiceTrayApp(
+        argv=["voicetray"],
+        qt_modules=fake_qt_modules(),
+        controller_factory=FakeController,
+        tray_factory=lambda **_kwargs: Quiet(),
+        pill_factory=lambda **_kwargs: Quiet(),
+        onboarding_window_factory=lambda **_kwargs: events.append("onboarding"),
+        config_loader=lambda **_kwargs: {},
+        crash_guard_installer=lambda notify: None,
+        startup_report=True,
+    )
+
+    assert app.run() == 0
+    assert events == ["start", "preload", "stop"]
+    assert FakeApplication.instance_value.events == []
+    assert list(timeline.milestones()) == [TRAY_ICON, READY, FIRST_DICTATION_READY]
+    assert {"qt_app", "tray", "pill", "controller_start", "model_load"} <= {
+        name for name, _offset, _seconds in timeline.phases()
+    }
@@ -0,0 +1,202 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "hello.wav"
+
+
+class FakeConverter:
+    def __init__(self, model_dir, *, copy_files, calls):
+        self.model_dir = model_dir
+        self.copy_files = copy_files
+        self.calls = calls
+
+    def convert(self, output_dir, *, quantization, force):
+        self.calls.append((self.model_dir, Path(output_dir).name, quantization, tuple(self.copy_files)))
+        output = Path(output_dir)
+        output.mkdir(parents=True)
+        (output / "model.bin").write_bytes(quantization.encode("ascii") * 100)
+        for name in self.copy_files:
+            (output / name).write_bytes((Path(self.model_dir) / name).read_bytes())
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return iter([SimpleNamespace(text="hello world")]), SimpleNamespace(language="en")
+
+
+def _checkpoint(tmp_path):
+    source = tmp_path / "whisper-small-custom"
+    source.mkdir()
+    (source / "model.safetensors").write_bytes(b"weights")
+    (source / "tokenizer.json").write_text("{}", encoding="utf-8")
+    return source
+
+
+def _result(label, wer, rtf, peak_mb):
+    from voicetray.audio_eval import AudioEvalResult
+
+    return AudioEvalResult(
+        label=label,
+        config={},
+        cases=(),
+        audio_seconds=10.0,
+        transcribe_seconds=rtf * 10.0,
+        load_seconds=0.1,
+        wer=wer,
+        cer=wer,
+        peak_rss_bytes=int(peak_mb * 1024 * 1024),
+    )
+
+
+def test_build_variants_converts_checkpoints_once_per_quantization(tmp_path):
+    from tools.quantize_model import QUANTIZATIONS, build_variants
+
+    calls = []
+    source = _checkpoint(tmp_path)
+
+    def factory(model_dir, *, copy_files):
+        return FakeConverter(model_dir, copy_files=copy_files, calls=calls)
+
+    variants = build_variants(source, tmp_path / "models", converter_factory=factory)
+    again = build_variants(source, tmp_path / "models", ["int16"], converter_factory=factory)
+
+    assert [variant.compute_type for variant in variants] == list(QUANTIZATIONS)
+    assert [variant.path for variant in variants] == [
+        tmp_path / "models" / f"whisper-small-custom-{quantization}" for quantization in QUANTIZATIONS
+    ]
+    assert [call[2] for call in calls] == list(QUANTIZATIONS)
+    assert all(call[3] == ("tokenizer.json",) for call in calls)
+    assert (variants[0].path / "tokenizer.json").exists()
+    assert again[0].path == variants[2].path
+    assert len(calls) == 3
+    assert not list((tmp_path / "models").glob("*.tmp"))
+
+
+def test_build_variants_reuses_ctranslate2_source_with_load_time_quantization(tmp_path):
+    from tools.quantize_model import build_variants, detect_format
+
+    source = tmp_path / "faster-whisper-base"
+    source.mkdir()
+    (source / "model.bin").write_bytes(b"x" * 10)
+
+    variants = build_variants(source, tmp_path / "models", ["int8", "int16"])
+
+    assert detect_format(source) == "ctranslate2"
+    assert [(variant.name, variant.path, variant.converted) for variant in variants] == [
+        ("faster-whisper-base@int8", source, False),
+        ("faster-whisper-base@int16", source, False),
+    ]
+    assert not (tmp_path / "models").exists()
+    with pytest.raises(ValueError):
+        detect_format(tmp_path)
+
+
+def test_benchmark_variants_loads_each_variant_with_its_compute_type(tmp_path):
+    from tools.quantize_model import benchmark_variants, build_variants, load_cases
+
+    source = tmp_path / "faster-whisper-base"
+    source.mkdir()
+    (source / "model.bin").write_bytes(b"x")
+    loads = []
+    models = []
+
+    def model_factory(model_size, **kwargs):
+        loads.append((model_size, kwargs["compute_type"], kwargs["local_files_only"]))
+        models.append(FakeModel())
+        return models[-1]
+
+    variants = build_variants(source, tmp_path / "models", ["int8", "int16"])
+    results = benchmark_variants(
+        variants, load_cases(FIXTURE, "Hello, world."), model_factory=model_factory, isolate=False, runs=3
+    )
+
+    assert loads == [(str(source), "int8", True), (str(source), "int16", True)]
+    assert [model.calls for model in models] == [4, 4]
+    assert [result.label for result in results] == [variant.name for variant in variants]
+    assert all(result.wer == 0.0 and result.audio_seconds > 0 for result in results)
+
+
+def test_recommend_prefers_fastest_within_wer_and_memory_limits(tmp_path):
+    from tools.quantize_model import ModelVariant, recommend
+
+    variants = [ModelVariant(name, tmp_path / name, name, True, 0) for name in ("int8", "int8_float32", "int16")]
+    results = [
+        _result("int8", wer=0.10, rtf=0.10, peak_mb=300),
+        _result("int8_float32", wer=0.05, rtf=0.20, peak_mb=500),
+        _result("int16", wer=0.05, rtf=0.30, peak_mb=400),
+    ]
+
+    assert recommend(variants, results).name == "int8_float32"
+    assert recommend(variants, results, wer_tolerance=0.1).name == "int8"
+    assert recommend(variants, results, max_memory_mb=450).name == "int16"
+    assert recommend(variants, results, max_memory_mb=100) is None
+
+
+def test_main_writes_recommendation_into_config(tmp_path, monkeypatch, capsys):
+    import tools.quantize_model as quantize_model
+
+    source = tmp_path / "faster-whisper-base"
+    source.mkdir()
+    (source / "model.bin").write_bytes(b"x")
+    config_path = tmp_path / "config.json"
+
+    def fake_benchmark(variants, cases, **_kwargs):
+        assert cases[0].audio_path == FIXTURE
+        return [_result(variant.name, 0.0, 0.3 if variant.compute_type == "int8" else 0.2, 300) for variant in variants]
+
+    monkeypatch.setattr(quantize_model, "benchmark_variants", fake_benchmark)
+    exit_code = quantize_model.main(
+        [
+            str(source),
+            "--quantization",
+            "int8",
+            "--quantization",
+            "int16",
+            "--reference",
+            "Hello, world.",
+            "--config",
+            str(config_path),
+            "--json",
+            str(tmp_path / "variants.json"),
+        ]
+    )
+
+    saved = json.loads(config_path.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert saved["stt"]["model_size"] == str(source)
+    assert saved["stt"]["compute_type"] == "int16"
+    assert json.loads((tmp_path / "variants.json").read_text(encoding="utf-8"))["recommended"] == (
+        "faster-whisper-base@int16"
+    )
+    assert "Recommended: faster-whisper-base@int16" in capsys.readouterr().out
+
+
+def test_main_refuses_to_save_without_reference_text(tmp_path, monkeypatch, capsys):
+    import tools.quantize_model as quantize_model
+
+    source = tmp_path / "faster-whisper-base"
+    source.mkdir()
+    (source / "model.bin").write_bytes(b"x")
+    config_path = tmp_path / "config.json"
+    benchmarked = []
+
+    def fake_benchmark(variants, cases, **_kwargs):
+        benchmarked.append(cases)
+        return [_result(variant.name, 0.0, 0.2, 300) for variant in variants]
+
+    monkeypatch.setattr(quantize_model, "benchmark_variants", fake_benchmark)
+
+    assert quantize_model.main([str(source), "--config", str(config_path)]) == 2
+    assert "no reference text" in capsys.readouterr().err
+    assert benchmarked == []
+
+    assert quantize_model.main([str(source), "--config", str(config_path), "--dry-run"]) == 0
+    assert "--wer-tolerance has no effect" in capsys.readouterr().err
+    assert not config_path.exists()
@@ -0,0 +1,52 @@
+import random
+import time
+
+from voicetray.dictation.snippets import SnippetExpander, load_snippets
+
+
+def test_load_snippets_skips_comments_and_normalizes_triggers(tmp_path):
+    path = tmp_path / "snippets.txt"
+    path.write_text("# header\n\nAddr = 123 Main\nmy  sig=Best regards\nno separator\n", encoding="utf-8")
+
+    assert load_snippets(str(path)) == {"addr": "123 Main", "my sig": "Best regards"}
+    assert load_snippets(str(tmp_path / "missing.txt")) == {}
+
+
+def test_expander_replaces_whole_word_triggers_case_insensitively():
+    expander = SnippetExpander({"addr": "123 Main", "sig": "Best regards"})
+
+    assert expander.expand("Send Addr, then sig.") == "Send 123 Main, then Best regards."
+    assert expander.expand("signal the address") == "signal the address"
+
+
+def test_expander_prefers_longest_multi_word_trigger():
+    expander = SnippetExpander({"addr": "123 Main", "addr home": "9 Elm Street"})
+
+    assert expander.expand("ship to addr  home today") == "ship to 9 Elm Street today"
+    assert expander.expand("ship to addr homer") == "ship to 123 Main homer"
+
+
+def test_expander_does_not_rescan_expansions():
+    expander = SnippetExpander({"a1": "see b2", "b2": "never"})
+
+    assert expander.expand("a1") == "see b2"
+
+
+def test_expander_handles_5000_snippets_in_a_single_scan():
+    rng = random.Random(7)
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "golf", "hotel", "india"]
+    snippets = {f"snip{i}": f"expansion {i}" for i in range(0, 5000, 2)}
+    snippets.update(
+        {f"{rng.choice(words)} {rng.choice(words)}{i}": f"phrase {i}" for i in range(1, 5000, 2)}
+    )
+    expander = SnippetExpander(snippets)
+    text = " ".join(rng.choice(words) for _ in range(60)) + " snip42 and snip4998"
+
+    started = time.perf_counter()
+    for _ in range(100):
+        expanded = expander.expand(text)
+    elapsed = time.perf_counter() - started
+
+    assert len(expander) == 5000
+    assert expanded.endswith("expansion 42 and expansion 4998")
+    assert elapsed < 1.0
@@ -74,3 +74,76 @@ def test_soak_script_runs_by_path():
 
     assert result.returncode == 0
     assert "PASS: cycles=1" in result.stdout
+
+
+def test_audio_soak_runs_overlapping_dictations_into_history():
+    from tools.soak import AudioCycleRunner, run_soak
+
+    with AudioCycleRunner(concurrency=3, audio_seconds=1.0) as runner:
+        result = run_soak(cycles=6, cycle_runner=runner, rss_reader=lambda: 100, freeze_timeout_seconds=30.0)
+        rows = runner.store.list_recent(limit=10)
+
+    assert result.failures == 0
+    assert len(rows) == 6
+    assert {row.model for row in rows} == {"stub"}
+
+
+def test_audio_soak_counts_failures_from_in_flight_dictations():
+    from tools.soak import AudioCycleRunner, run_soak
+
+    with AudioCycleRunner(concurrency=2, audio_seconds=1.0) as runner:
+        runner.pipeline.process_transcript = lambda *_args: (_ for _ in ()).throw(RuntimeError("boom"))
+        result = run_soak(cycles=3, cycle_runner=runner, rss_reader=lambda: 100, freeze_timeout_seconds=30.0)
+
+    assert result.failures == 3
+
+
+def test_leak_tracker_attributes_growth_to_allocating_module():
+    from tools.soak import LeakTracker, run_soak
+
+    retained = []
+    tracker = LeakTracker(interval=2, top=3)
+
+    result = run_soak(
+        cycles=8,
+        rss_reader=lambda: 100,
+        cycle_runner=lambda index: retained.append(bytearray(64 * 1024)),
+        leak_tracker=tracker,
+    )
+
+    top = result.leak_sites[0]
+    assert top.module.endswith("test_soak")
+    assert top.size_diff_bytes >= 3 * 64 * 1024
+    assert top.grew_intervals == top.intervals == 3
+    assert result.traced_growth_bytes >= top.size_diff_bytes
+    assert "test_soak.py" in result.to_text()
+
+
+def test_leak_attribution_does_not_change_the_rss_verdict():
+    import tracemalloc
+
+    from tools.soak import LeakTracker, run_soak
+
+    cache = []
+    peak = [0]
+
+    def rss():
+        # Peak RSS, like ru_maxrss: tracing overhead stays counted after tracing stops.
+        current = 2_000_000 + (tracemalloc.get_tracemalloc_memory() if tracemalloc.is_tracing() else 0)
+        peak[0] = max(peak[0], current)
+        return peak[0]
+
+    def runner(index):
+        # Warm-up fills a cache once; steady-state cycles allocate and free.
+        if not cache:
+            cache.extend(str(i) for i in range(10_000))
+        [str(i) for i in range(100)]
+        rss()
+
+    plain = run_soak(cycles=12, cycle_runner=runner, rss_reader=rss)
+    cache.clear()
+    peak[0] = 0
+    traced = run_soak(cycles=12, cycle_runner=runner, rss_reader=rss, leak_tracker=LeakTracker(interval=3))
+
+    assert plain.ok is True
+    assert traced.ok is True
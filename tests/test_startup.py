@@ -0,0 +1,74 @@
+import sys
+import types
+
+import pytest
+
+
+class StepClock:
+    def __init__(self, step=0.01):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def test_startup_timeline_records_phases_milestones_and_gauges():
+    from voicetray.metrics import MetricsRegistry
+    from voicetray.startup import StartupTimeline
+
+    timeline = StartupTimeline(clock=StepClock(), origin=0.0)
+    with timeline.phase("config"):
+        pass
+    first = timeline.milestone("tray_icon")
+    assert timeline.milestone("tray_icon") == first
+    assert timeline.milestone_if_new("tray_icon") is None
+    registry = MetricsRegistry()
+
+    timeline.publish(registry)
+
+    summary = timeline.summary()
+    assert summary["phases"] == [{"name": "config", "offset_seconds": 0.01, "seconds": 0.01}]
+    assert summary["milestones"] == {"tray_icon": pytest.approx(0.03)}
+    assert registry.gauge("voicetray_startup_phase_seconds").value(phase="config") == pytest.approx(0.01)
+    assert registry.gauge("voicetray_startup_milestone_seconds").value(milestone="tray_icon") == pytest.approx(0.03)
+    report = timeline.format_report()
+    assert "config" in report and "tray_icon" in report
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_process_age_is_measured_on_linux():
+    from voicetray.startup import process_age_seconds
+
+    age = process_age_seconds()
+
+    assert age is not None and 0 <= age < 3600
+
+
+def test_main_startup_report_prints_breakdown(monkeypatch, tmp_path, capsys):
+    import voicetray.config as config
+    import voicetray.logging_config as logging_config
+    import voicetray.main as main
+    import voicetray.single_instance as single_instance
+
+    created = []
+
+    class FakeQtApp:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+
+        def run(self):
+            return 0
+
+    monkeypatch.setattr(logging_config, "configure_logging", lambda: None)
+    monkeypatch.setattr(config, "load_config", lambda: {})
+    monkeypatch.setattr(single_instance, "default_lock_path", lambda: tmp_path / "voicetray.lock")
+    monkeypatch.setitem(sys.modules, "voicetray.app", types.SimpleNamespace(VoiceTrayApp=FakeQtApp))
+
+    assert main.main(["--startup-report"]) == 0
+
+    assert created == [{"startup_report": True}]
+    output = capsys.readouterr().out
+    assert output.startswith("VoiceTray startup")
+    assert "lock" in output and "app_import" in output
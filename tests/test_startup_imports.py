@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# Generous enough for a cold CI disk; the tray shell itself measures ~0.25 s locally, mostly PySide6.
+TRAY_IMPORT_BUDGET_SECONDS = 1.5
+DEFERRED_BY_TRAY = (
+    "voicetray.legacy_app",
+    "voicetray.ui.settings_window",
+    "voicetray.ui.history_window",
+    "voicetray.ui.onboarding",
+    "voicetray.model_download",
+    "voicetray.stt.whisper_engine",
+    "numpy",
+    "http.server",
+)
+DEFERRED_BY_CORE = ("faster_whisper", "ctranslate2", "llama_cpp", "http.server", "cProfile", "PySide6")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative microseconds per module from ``python -X importtime -c 'import <module>'``."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        if cumulative.isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_tray_shell_import_defers_windows_and_dictation_core():
+    times = _import_times("voicetray.app")
+
+    assert "voicetray.app" in times
+    assert [name for name in DEFERRED_BY_TRAY if name in times] == []
+    assert times["voicetray.app"] / 1_000_000 < TRAY_IMPORT_BUDGET_SECONDS
+
+
+def test_dictation_core_import_defers_models_llm_and_optional_servers():
+    times = _import_times("voicetray.legacy_app")
+
+    assert "voicetray.legacy_app" in times
+    assert [name for name in DEFERRED_BY_CORE if name in times] == []
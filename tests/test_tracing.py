@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+import types
+
+from voicetray.tracing import Trace, TraceLog, activate, current_trace, propagate, span
+
+
+def span_names(trace):
+    return [item.name for item in trace.spans]
+
+
+def test_spans_are_no_ops_outside_a_trace():
+    with span("rules") as current:
+        current.set(ignored=True)
+
+    assert current_trace() is None
+
+
+def test_spans_nest_under_the_active_span_and_record_attributes():
+    trace = Trace("dictation", trigger="test")
+    with activate(trace):
+        with span("cleanup") as cleanup:
+            with span("rules", mode="balanced"):
+                pass
+    trace.finish()
+
+    by_name = {item.name: item for item in trace.spans}
+    assert span_names(trace) == ["dictation", "cleanup", "rules"]
+    assert by_name["rules"].parent is cleanup
+    assert by_name["cleanup"].parent is trace.root
+    assert by_name["rules"].attributes == {"mode": "balanced"}
+    assert all(item.end is not None for item in trace.spans)
+    assert current_trace() is None
+
+
+def test_span_records_error_type_when_block_raises():
+    trace = Trace()
+    try:
+        with activate(trace), span("insert"):
+            raise RuntimeError("clipboard locked")
+    except RuntimeError:
+        pass
+
+    assert trace.spans[-1].attributes["error"] == "RuntimeError"
+
+
+def test_chrome_trace_export_links_thread_hops_with_flow_events(tmp_path):
+    trace = Trace("dictation")
+
+    def run_llm():
+        with span("llm"):
+            time.sleep(0.001)
+
+    with activate(trace), span("cleanup"):
+        worker = threading.Thread(target=propagate(run_llm), name="voicetray-llm-cleanup")
+        worker.start()
+        worker.join()
+    trace.finish()
+
+    path = trace.write(tmp_path / "trace.json")
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    events = payload["traceEvents"]
+    complete = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert complete["llm"]["tid"] != complete["cleanup"]["tid"]
+    assert complete["llm"]["args"]["parent_id"] == complete["cleanup"]["args"]["span_id"]
+    assert complete["cleanup"]["ts"] <= complete["llm"]["ts"]
+    flows = [event for event in events if event["ph"] in ("s", "f")]
+    assert [(event["ph"], event["tid"]) for event in flows] == [
+        ("s", complete["cleanup"]["tid"]),
+        ("f", complete["llm"]["tid"]),
+    ]
+    thread_names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert "voicetray-llm-cleanup" in thread_names
+    assert payload["otherData"]["trace_id"] == trace.trace_id
+
+
+def test_trace_log_keeps_recent_traces_and_exports_only_slow_ones(tmp_path):
+    trace_log = TraceLog(tmp_path, slow_seconds=1.0, limit=2, max_files=2)
+    fast = Trace()
+
+    assert trace_log.record(fast, processing_seconds=0.2) is None
+    paths = [trace_log.record(Trace(), processing_seconds=1.5) for _ in range(3)]
+
+    assert all(path is not None for path in paths)
+    assert trace_log.find(fast.trace_id) is None
+    assert len(trace_log.recent()) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(path.name for path in paths[1:])
+
+
+def test_pipeline_stages_appear_as_spans():
+    from voicetray.dictation.pipeline import DictationConfig, DictationPipeline
+    from voicetray.dictation.types import DictationContext
+
+    llm = types.SimpleNamespace(available=lambda: False)
+    pipeline = DictationPipeline(DictationConfig(), llm_cleaner=llm)
+    trace = Trace()
+    with activate(trace):
+        pipeline.process_transcript("um hello world", DictationContext(mode="balanced", profile="general"))
+
+    assert {"glossary", "protect", "rules", "restore"} <= set(span_names(trace))
+
+
+def test_legacy_hotkey_dictation_records_one_trace_across_threads():
+    from voicetray.legacy_app import VoiceTrayApp
+
+    app = VoiceTrayApp.__new__(VoiceTrayApp)
+    app.is_recording = False
+    app.get_active_window_identity = lambda: "hwnd"
+    app.audio_recorder = types.SimpleNamespace(start=lambda: None, stop=lambda: [0.0])
+    app.cancel_recording_limit_timers = lambda: None
+    app.schedule_recording_limit_timers = lambda: None
+    app.trace_log = TraceLog(slow_seconds=0.0)
+    app.transcribe_audio_to_text = lambda audio, timings=None: "words"
+
+    def process_raw_transcript(raw, *, insert_text, duration_seconds=None, timings=None):
+        with span("cleanup"):
+            return "Words."
+
+    app.process_raw_transcript = process_raw_transcript
+
+    app.start_hotkey_recording()
+    app.finish_hotkey_recording(types.SimpleNamespace(duration_seconds=0.5, locked=False))
+    deadline = time.monotonic() + 5
+    while not app.trace_log.recent() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    (trace,) = app.trace_log.recent()
+    names = span_names(trace)
+    assert names[:3] == ["dictation", "hotkey_start", "record"]
+    assert {"recorder_stop", "process", "cleanup"} <= set(names)
+    by_name = {item.name: item for item in trace.spans}
+    assert by_name["record"].attributes["duration_seconds"] == 0.5
+    assert by_name["process"].thread_id != trace.root.thread_id
+    assert trace.root.end is not None
@@ -186,6 +186,7 @@ def test_tray_menu_queues_actions_and_updates_toggle_state(tmp_path):
         "History...",
         "Settings...",
         "Open Log Folder",
+        "Save Diagnostics Bundle",
         "Quit",
     ]
     assert tray.tray_icon.visible is True
@@ -33,3 +33,44 @@ def test_validation_rejects_output_that_is_too_long_by_length_ratio():
     assert result.ok is False
     assert result.reason == "length_ratio"
 
+
+def test_validation_accepts_small_punctuation_edits():
+    result = validate_llm_output(
+        "please send the report to the team tomorrow",
+        "Please send the report to the team tomorrow.",
+        mode="balanced",
+    )
+
+    assert result.ok is True
+    assert result.reason == "ok"
+
+
+def test_validation_rejects_changed_numbers_and_placeholders():
+    numbers = validate_llm_output("send 2 files to __GLOSSARY_0__", "send 3 files to __GLOSSARY_0__", mode="balanced")
+    glossary = validate_llm_output("send 2 files to __GLOSSARY_0__", "send 2 files to the team", mode="balanced")
+
+    assert numbers.reason == "numbers_changed"
+    assert glossary.reason == "glossary_changed"
+
+
+def test_validation_rejects_rewritten_text_via_quick_ratio_bound():
+    result = validate_llm_output(
+        "we should ship the release on friday morning",
+        "Kindly deploy our build by Friday at dawn.",
+        mode="balanced",
+    )
+
+    assert result.ok is False
+    assert result.reason == "too_different"
+
+
+def test_validation_uses_token_similarity_for_long_inputs():
+    from dictation.validation import LONG_INPUT_CHARS
+
+    sentence = "the team reviewed the quarterly plan and agreed on the next steps for launch "
+    rule_text = sentence * (LONG_INPUT_CHARS // len(sentence) + 2)
+    llm_text = rule_text.replace("agreed on", "agreed upon", 1).strip() + "."
+    shuffled = " ".join(reversed(rule_text.split()))
+
+    assert validate_llm_output(rule_text, llm_text, mode="balanced").ok is True
+    assert validate_llm_output(rule_text, shuffled, mode="balanced").reason == "too_different"
@@ -136,6 +136,39 @@ def test_whisper_engine_from_app_config_uses_stt_settings():
     assert engine_cfg.vad_energy_threshold == 0.02
 
 
+def test_whisper_engine_records_first_dictation_ready_once_when_model_loads(monkeypatch, caplog):
+    import logging
+
+    import voicetray.stt.whisper_engine as whisper_engine
+    from voicetray.metrics import REGISTRY
+    from voicetray.startup import FIRST_DICTATION_READY, MILESTONE_GAUGE, StartupTimeline
+
+    timeline = StartupTimeline()
+    publishes = []
+    monkeypatch.setattr(whisper_engine, "STARTUP", timeline)
+    monkeypatch.setattr(timeline, "publish", lambda: publishes.append(StartupTimeline.publish(timeline)))
+
+    def engine():
+        return whisper_engine.WhisperEngine(
+            whisper_engine.WhisperEngineConfig(silence_trim=False),
+            model_factory=lambda *_args, **_kwargs: FakeWhisperModel([types.SimpleNamespace(text="hi")]),
+        )
+
+    assert FIRST_DICTATION_READY not in timeline.milestones()
+
+    with caplog.at_level(logging.INFO, logger=whisper_engine.__name__):
+        first = engine()
+        first.transcribe(np.array([0.0, 0.1], dtype=np.float32))
+        ready = timeline.milestones()[FIRST_DICTATION_READY]
+        first.transcribe(np.array([0.0, 0.1], dtype=np.float32))
+        engine().transcribe(np.array([0.0, 0.1], dtype=np.float32))
+
+    assert timeline.milestones()[FIRST_DICTATION_READY] == ready
+    assert REGISTRY.gauge(MILESTONE_GAUGE).value(milestone=FIRST_DICTATION_READY) == ready
+    assert len(publishes) == 1
+    assert sum("First speech model load" in record.message for record in caplog.records) == 1
+
+
 def test_whisper_engine_empty_audio_returns_empty_without_loading_model():
     from voicetray.stt.whisper_engine import WhisperEngine, WhisperEngineConfig
 
@@ -0,0 +1,143 @@
+"""Benchmark history append latency on a pre-populated database."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from voicetray.history import DictationHistoryStore, HistoryEntry, _INSERT_SQL, _entry_params  # noqa: E402
+
+
+# The history schema before pooled connections: one plain table, with no
+# indexes, FTS table or triggers added by later migrations.
+BASELINE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dictations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+        app_name TEXT,
+        raw_text TEXT NOT NULL,
+        cleaned_text TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        profile TEXT NOT NULL,
+        duration_seconds REAL,
+        model TEXT NOT NULL
+    )
+"""
+
+
+@dataclass(frozen=True)
+class AppendBenchResult:
+    label: str
+    seed_rows: int
+    appends: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+
+
+def sample_entry(index: int) -> HistoryEntry:
+    return HistoryEntry(
+        app_name="Notepad",
+        raw_text=f"um this is dictation number {index} about the quarterly report",
+        cleaned_text=f"This is dictation number {index} about the quarterly report.",
+        mode="balanced",
+        profile="notes",
+        duration_seconds=2.5,
+        model="base",
+    )
+
+
+def seed_database(db_path: Path, rows: int, *, baseline: bool = False) -> None:
+    """Fill ``db_path`` with ``rows`` entries, in the baseline schema or the current store's."""
+    if not baseline:
+        DictationHistoryStore(db_path).close()
+    conn = sqlite3.connect(db_path)
+    try:
+        if baseline:
+            # The baseline ran on the default rollback journal.
+            conn.execute(BASELINE_SCHEMA)
+        with conn:
+            conn.executemany(_INSERT_SQL, (_entry_params(sample_entry(i)) for i in range(rows)))
+    finally:
+        conn.close()
+
+
+def bench_connect_per_append(db_path: Path, appends: int) -> list[float]:
+    """Previous behaviour: a fresh connection and rollback-journal commit per append."""
+    samples = []
+    for index in range(appends):
+        started = time.perf_counter()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(_INSERT_SQL, _entry_params(sample_entry(index)))
+        conn.close()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_pooled_store(db_path: Path, appends: int) -> list[float]:
+    samples = []
+    with DictationHistoryStore(db_path) as store:
+        for index in range(appends):
+            started = time.perf_counter()
+            store.append(sample_entry(index))
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(label: str, seed_rows: int, samples: list[float]) -> AppendBenchResult:
+    ordered = sorted(samples)
+    return AppendBenchResult(
+        label=label,
+        seed_rows=seed_rows,
+        appends=len(samples),
+        mean_ms=statistics.fmean(samples) * 1000.0,
+        p50_ms=ordered[len(ordered) // 2] * 1000.0,
+        p95_ms=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000.0,
+    )
+
+
+def run_benchmark(*, seed_rows: int, appends: int, workdir: Path) -> list[AppendBenchResult]:
+    before_path = workdir / "before.db"
+    after_path = workdir / "after.db"
+    seed_database(before_path, seed_rows, baseline=True)
+    seed_database(after_path, seed_rows)
+    return [
+        summarize("connect_per_append", seed_rows, bench_connect_per_append(before_path, appends)),
+        summarize("pooled_wal", seed_rows, bench_pooled_store(after_path, appends)),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to seed before timing")
+    parser.add_argument("--appends", type=int, default=500, help="timed appends per variant")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_benchmark(seed_rows=args.rows, appends=args.appends, workdir=Path(tmp))
+
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))
+    else:
+        for result in results:
+            print(
+                f"{result.label}: rows={result.seed_rows} appends={result.appends} "
+                f"mean={result.mean_ms:.3f}ms p50={result.p50_ms:.3f}ms p95={result.p95_ms:.3f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
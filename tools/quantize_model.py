@@ -0,0 +1,284 @@
+"""Convert a local Whisper model to CTranslate2 variants, benchmark them and recommend one.
+
+The source is either a Transformers Whisper checkpoint (converted once per
+quantization with CTranslate2's converter, which needs ``transformers`` and
+``torch``) or an existing CTranslate2 model such as a faster-whisper download.
+CTranslate2 cannot re-save converted weights, so for a CTranslate2 source each
+variant is the same directory loaded with that ``compute_type``; the weights
+are quantized at load time and the benchmark measures exactly that.
+
+Every variant is timed on a local audio fixture in its own process: one untimed
+warm-up transcription, then the fastest of several runs per clip (real-time
+factor, model load time, peak RSS and WER against the reference text). The
+fastest variant within the WER and memory limits is written to ``stt.model_size``
+and ``stt.compute_type`` in the config. Without reference text every variant
+scores a WER of zero, so the tool only prints a recommendation in that case.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from voicetray.audio_eval import (  # noqa: E402
+    AudioCase,
+    AudioEvalResult,
+    load_audio_manifest,
+    normalize_transcript,
+    print_audio_eval,
+    run_audio_eval,
+)
+from voicetray.config import default_config_path, load_config, save_config  # noqa: E402
+from voicetray.model_download import default_models_dir  # noqa: E402
+from voicetray.stt.whisper_engine import ModelFactory, WhisperEngineConfig  # noqa: E402
+
+QUANTIZATIONS = ("int8", "int8_float32", "int16")
+DEFAULT_RUNS = 3
+DEFAULT_AUDIO = PROJECT_ROOT / "tests" / "fixtures" / "hello.wav"
+# Tokenizer and feature-extractor files faster-whisper reads next to model.bin.
+COPY_FILES = ("tokenizer.json", "preprocessor_config.json", "vocabulary.json", "vocabulary.txt")
+TRANSFORMERS_WEIGHTS = ("pytorch_model.bin", "model.safetensors", "model.safetensors.index.json")
+
+ConverterFactory = Callable[..., Any]
+
+
+@dataclass(frozen=True)
+class ModelVariant:
+    name: str
+    path: Path
+    compute_type: str
+    converted: bool
+    disk_bytes: int
+
+
+def detect_format(source: str | Path) -> str:
+    """``"ctranslate2"`` for a converted model, ``"transformers"`` for a Hugging Face checkpoint."""
+    source = Path(source)
+    if (source / "model.bin").is_file():
+        return "ctranslate2"
+    if any((source / name).is_file() for name in TRANSFORMERS_WEIGHTS):
+        return "transformers"
+    raise ValueError(f"{source} is neither a CTranslate2 model (model.bin) nor a Transformers checkpoint")
+
+
+def build_variants(
+    source: str | Path,
+    output_root: str | Path,
+    quantizations: Sequence[str] = QUANTIZATIONS,
+    *,
+    force: bool = False,
+    converter_factory: ConverterFactory | None = None,
+) -> list[ModelVariant]:
+    source = Path(source)
+    model_format = detect_format(source)
+    variants = []
+    for quantization in quantizations:
+        if model_format == "ctranslate2":
+            path, converted = source, False
+        else:
+            path, converted = Path(output_root) / f"{source.name}-{quantization}", True
+            convert_variant(source, path, quantization, force=force, converter_factory=converter_factory)
+        variants.append(
+            ModelVariant(
+                name=path.name if converted else f"{path.name}@{quantization}",
+                path=path,
+                compute_type=quantization,
+                converted=converted,
+                disk_bytes=_directory_bytes(path),
+            )
+        )
+    return variants
+
+
+def convert_variant(
+    source: Path,
+    output_dir: Path,
+    quantization: str,
+    *,
+    force: bool = False,
+    converter_factory: ConverterFactory | None = None,
+) -> Path:
+    """Convert a Transformers checkpoint once; an existing variant is reused unless ``force``."""
+    if (output_dir / "model.bin").is_file() and not force:
+        return output_dir
+    factory = converter_factory or _transformers_converter
+    copy_files = [name for name in COPY_FILES if (source / name).is_file()]
+    converter = factory(str(source), copy_files=copy_files)
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = output_dir.with_name(output_dir.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        converter.convert(str(staging), quantization=quantization, force=True)
+        shutil.rmtree(output_dir, ignore_errors=True)
+        staging.rename(output_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return output_dir
+
+
+def benchmark_variants(
+    variants: Sequence[ModelVariant],
+    cases: Sequence[AudioCase],
+    *,
+    base: WhisperEngineConfig | None = None,
+    model_factory: ModelFactory | None = None,
+    isolate: bool = True,
+    runs: int = DEFAULT_RUNS,
+) -> list[AudioEvalResult]:
+    base = replace(base or WhisperEngineConfig(), local_files_only=True, model_cache_dir="")
+    results = []
+    for variant in variants:
+        overrides = {"model_size": str(variant.path), "compute_type": variant.compute_type}
+        [result] = run_audio_eval(
+            cases, [overrides], base=base, model_factory=model_factory, isolate=isolate, runs=runs, warmup=True
+        )
+        results.append(replace(result, label=variant.name))
+    return results
+
+
+def recommend(
+    variants: Sequence[ModelVariant],
+    results: Sequence[AudioEvalResult],
+    *,
+    wer_tolerance: float = 0.02,
+    max_memory_mb: float | None = None,
+) -> ModelVariant | None:
+    """Fastest variant within ``wer_tolerance`` of the best WER and under ``max_memory_mb``.
+
+    Ties on real-time factor go to the variant with less peak memory.
+    """
+    if not results:
+        return None
+    best_wer = min(result.wer for result in results)
+    candidates = [
+        (result.rtf, result.peak_rss_bytes, index)
+        for index, result in enumerate(results)
+        if result.wer <= best_wer + wer_tolerance
+        and (max_memory_mb is None or result.peak_rss_bytes <= max_memory_mb * 1024 * 1024)
+    ]
+    if not candidates:
+        return None
+    return variants[min(candidates)[2]]
+
+
+def apply_recommendation(variant: ModelVariant, config_path: str | Path | None = None) -> dict[str, Any]:
+    target = Path(config_path) if config_path is not None else default_config_path()
+    cfg = load_config(config_path=target)
+    cfg["stt"]["model_size"] = str(variant.path)
+    cfg["stt"]["compute_type"] = variant.compute_type
+    return save_config(cfg, target)
+
+
+def load_cases(audio: str | Path, reference: str = "") -> list[AudioCase]:
+    """A JSONL manifest as used by ``voicetray.eval --audio``, or a single WAV file."""
+    audio = Path(audio)
+    if audio.suffix.lower() == ".jsonl":
+        return load_audio_manifest(audio)
+    return [AudioCase(id=audio.stem, audio_path=audio, reference=reference)]
+
+
+def has_reference(cases: Sequence[AudioCase]) -> bool:
+    """Whether any case has reference words, i.e. whether WER means anything."""
+    return any(normalize_transcript(case.reference) for case in cases)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("source", help="local Transformers checkpoint or CTranslate2 model directory")
+    parser.add_argument(
+        "--quantization",
+        action="append",
+        choices=QUANTIZATIONS,
+        help="variant to build and benchmark; repeat for several (default: all)",
+    )
+    parser.add_argument("--models-dir", default=None, help="where converted variants are written")
+    parser.add_argument("--audio", default=str(DEFAULT_AUDIO), help="WAV file or audio eval JSONL manifest")
+    parser.add_argument(
+        "--reference", default="", help="words spoken in a single WAV; needed to score WER and save the choice"
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="timed runs per clip after a warm-up")
+    parser.add_argument("--beam-size", type=int, default=WhisperEngineConfig.beam_size)
+    parser.add_argument("--wer-tolerance", type=float, default=0.02, help="allowed WER above the best variant")
+    parser.add_argument("--max-memory-mb", type=float, default=None, help="skip variants above this peak RSS")
+    parser.add_argument("--force", action="store_true", help="reconvert variants that already exist")
+    parser.add_argument("--config", default=None, help="config file to update (default: the user's config)")
+    parser.add_argument("--dry-run", action="store_true", help="print the recommendation without saving it")
+    parser.add_argument("--json", default=None, help="write variants and results to this file")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    output_root = default_models_dir(args.models_dir) / "ct2"
+    try:
+        variants = build_variants(args.source, output_root, args.quantization or QUANTIZATIONS, force=args.force)
+    except (ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    cases = load_cases(args.audio, args.reference)
+    scored = has_reference(cases)
+    if not scored and not args.dry_run:
+        print(
+            f"error: {args.audio} has no reference text, so WER cannot be measured; "
+            "pass --reference with the words spoken, an audio eval manifest, or --dry-run",
+            file=sys.stderr,
+        )
+        return 2
+    if not scored:
+        print("warning: no reference text; WER is not measured and --wer-tolerance has no effect", file=sys.stderr)
+
+    results = benchmark_variants(
+        variants, cases, base=WhisperEngineConfig(beam_size=args.beam_size), runs=args.runs
+    )
+    chosen = recommend(variants, results, wer_tolerance=args.wer_tolerance, max_memory_mb=args.max_memory_mb)
+    print_audio_eval(results, next((r for r in results if chosen and r.label == chosen.name), None))
+    for variant in variants:
+        print(f"  {variant.name}: {variant.disk_bytes / (1024 * 1024):.1f} MB on disk at {variant.path}")
+
+    if args.json:
+        payload = {
+            "variants": [{**vars(variant), "path": str(variant.path)} for variant in variants],
+            "results": [result.to_dict() for result in results],
+            "recommended": chosen.name if chosen else None,
+        }
+        Path(args.json).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+    if chosen is None:
+        print("No variant meets the WER and memory limits.")
+        return 1
+    print(f"Recommended: {chosen.name} (stt.model_size={chosen.path}, stt.compute_type={chosen.compute_type})")
+    if not args.dry_run:
+        apply_recommendation(chosen, args.config)
+        print(f"Saved to {args.config or default_config_path()}")
+    return 0
+
+
+def _transformers_converter(model_dir: str, *, copy_files: list[str]) -> Any:
+    try:
+        from ctranslate2.converters import TransformersConverter
+    except ImportError as exc:
+        raise ImportError("Converting a Transformers checkpoint needs ctranslate2") from exc
+    try:
+        import torch  # noqa: F401
+        import transformers  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("Converting a Transformers checkpoint needs `pip install transformers torch`") from exc
+    return TransformersConverter(model_dir, copy_files=copy_files)
+
+
+def _directory_bytes(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,9 +5,15 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import tracemalloc
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Callable
@@ -22,6 +28,18 @@ RssReader = Callable[[], int]
 Clock = Callable[[], float]
 
 
+@dataclass(frozen=True)
+class LeakSite:
+    """Allocation site whose traced memory grew between the warm-up and final snapshot."""
+
+    module: str
+    location: str
+    size_diff_bytes: int
+    count_diff: int
+    grew_intervals: int
+    intervals: int
+
+
 @dataclass(frozen=True)
 class SoakResult:
     cycles: int
@@ -31,6 +49,8 @@ class SoakResult:
     end_rss_bytes: int
     rss_growth_ratio: float
     max_rss_growth_ratio: float
+    leak_sites: tuple[LeakSite, ...] = ()
+    traced_growth_bytes: int = 0
 
     @property
     def ok(self) -> bool:
@@ -44,11 +64,19 @@ class SoakResult:
         status = "PASS" if self.ok else "FAIL"
         growth_percent = self.rss_growth_ratio * 100.0
         limit_percent = self.max_rss_growth_ratio * 100.0
-        return (
+        lines = [
             f"{status}: cycles={self.cycles} failures={self.failures} "
             f"ui_freezes={self.ui_freezes} rss_growth={growth_percent:.1f}% "
             f"limit={limit_percent:.1f}%"
-        )
+        ]
+        if self.leak_sites:
+            lines.append(f"traced growth since warm-up: {self.traced_growth_bytes / 1024:+.1f} KiB; top sites:")
+            for site in self.leak_sites:
+                lines.append(
+                    f"  {site.size_diff_bytes / 1024:+9.1f} KiB {site.count_diff:+7d} blocks "
+                    f"grew {site.grew_intervals}/{site.intervals}  {site.module}  {site.location}"
+                )
+        return "\n".join(lines)
 
 
 class MemoryClipboard:
@@ -102,6 +130,212 @@ class SyntheticCycleRunner:
             raise RuntimeError(f"insert failed: {result.status}")
 
 
+class AudioCycleRunner:
+    """Full dictation cycles: fake-stream recorder, ``WhisperEngine``, pipeline, insert, history.
+
+    Each cycle records on the calling thread like the hotkey path, then hands
+    the audio to a processing pool, so up to ``concurrency`` dictations
+    overlap: the next recording starts while earlier ones are transcribed,
+    cleaned, inserted and written to a throwaway history database.
+    Processing errors surface on a later cycle (or from ``drain``).
+    """
+
+    def __init__(
+        self,
+        *,
+        stt: str = "stub",
+        stt_rtf: float = 0.0,
+        concurrency: int = 2,
+        audio_seconds: float = 3.0,
+        blocksize: int = 512,
+    ):
+        from benchmarks.e2e import ReplayStreamFactory, StubWhisperModel
+        from benchmarks.fixtures import BASE_FIXTURE, build_fixture, read_wav
+        from voicetray.audio.recorder import AudioRecorder
+        from voicetray.dictation import DictationConfig, DictationContext, DictationPipeline
+        from voicetray.history import DictationHistoryStore, HistoryWriter
+        from voicetray.insert.inserter import Inserter
+        from voicetray.stt.whisper_engine import WhisperEngine, WhisperEngineConfig
+
+        self.audio = build_fixture(read_wav(BASE_FIXTURE), audio_seconds).audio
+        self.streams = ReplayStreamFactory(blocksize)
+        self.recorder = AudioRecorder(stream_factory=self.streams, blocksize=blocksize)
+        if stt == "stub":
+            stub = StubWhisperModel(stt_rtf)
+            self.engine = WhisperEngine(WhisperEngineConfig(), model_factory=lambda *_args, **_kwargs: stub)
+        else:
+            self.engine = WhisperEngine(WhisperEngineConfig(model_size=stt, local_files_only=True))
+        self.model = stt
+        self.pipeline = DictationPipeline(DictationConfig())
+        self.context = DictationContext(mode="balanced", profile="notes", app_title="Notepad")
+        self.clipboard = MemoryClipboard()
+        self.keyboard = MemoryKeyboard()
+        self.inserter = Inserter(
+            clipboard=self.clipboard,
+            keyboard=self.keyboard,
+            focus_provider=lambda: "notepad",
+            sleep=lambda _seconds: None,
+        )
+        self._insert_lock = threading.Lock()
+        self._history_dir = Path(tempfile.mkdtemp(prefix="voicetray-soak-"))
+        self.store = DictationHistoryStore(self._history_dir / "history.sqlite3")
+        self.history = HistoryWriter(self.store, flush_interval=0.05)
+        self.concurrency = max(1, int(concurrency))
+        self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="voicetray-soak")
+        self._pending: deque[Future] = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        self.close()
+
+    def __call__(self, index: int) -> None:
+        self.recorder.start()
+        self.streams.stream.feed(self.audio)
+        audio = self.recorder.stop()
+        self._pending.append(self._executor.submit(self._process, index, audio))
+        if len(self._pending) >= self.concurrency:
+            self._pending.popleft().result()
+
+    def drain(self) -> int:
+        """Wait for in-flight dictations; return how many of them failed."""
+        failures = 0
+        while self._pending:
+            if self._pending.popleft().exception() is not None:
+                failures += 1
+        self.history.flush(5.0)
+        return failures
+
+    def close(self) -> None:
+        self.drain()
+        self._executor.shutdown(wait=True)
+        self.history.close()
+        self.store.close()
+        shutil.rmtree(self._history_dir, ignore_errors=True)
+
+    def _process(self, index: int, audio) -> None:
+        from voicetray.history import HistoryEntry
+
+        started = time.perf_counter()
+        raw = self.engine.transcribe(audio)
+        cleaned = self.pipeline.process_transcript(f"{raw} cycle {index}", self.context)
+        with self._insert_lock:
+            result = self.inserter.insert_text(cleaned, start_focus="notepad", app_title="Notepad")
+            # The in-memory keyboard keeps every keystroke; drop them so it does not read as a leak.
+            self.keyboard.sent.clear()
+            self.keyboard.written.clear()
+        if result.status != "inserted":
+            raise RuntimeError(f"insert failed: {result.status}")
+        self.history.submit(
+            HistoryEntry(
+                app_name="notepad",
+                raw_text=raw,
+                cleaned_text=cleaned,
+                mode=self.context.mode,
+                profile=self.context.profile,
+                duration_seconds=time.perf_counter() - started,
+                model=self.model,
+                audio_seconds=audio.size / 16_000,
+            )
+        )
+
+
+class LeakTracker:
+    """Take ``tracemalloc`` snapshots every ``interval`` cycles and rank growing sites.
+
+    The first snapshot is taken after the first interval so warm-up
+    allocations (imports, caches, model load) are not reported as growth.
+    Only the first and latest snapshots are kept; per-interval growth is
+    tallied as snapshots arrive, so tracing memory stays flat over long soaks.
+    """
+
+    _IGNORED = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+    def __init__(self, *, interval: int = 10, frames: int = 1, top: int = 10, key_type: str = "lineno"):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = int(interval)
+        self.frames = max(1, int(frames))
+        self.top = max(1, int(top))
+        self.key_type = key_type
+        self.first: tracemalloc.Snapshot | None = None
+        self.latest: tracemalloc.Snapshot | None = None
+        self.intervals = 0
+        self._grew: Counter = Counter()
+        self._started_tracing = False
+
+    @property
+    def warmed_up(self) -> bool:
+        return self.first is not None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def after_cycle(self, index: int) -> None:
+        if index % self.interval == 0:
+            self._record(self._snapshot())
+
+    def finish(self) -> tuple[tuple[LeakSite, ...], int]:
+        try:
+            if self.intervals == 0:
+                self._record(self._snapshot())
+            return self.report()
+        finally:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def report(self) -> tuple[tuple[LeakSite, ...], int]:
+        if self.first is None or self.latest is None or self.intervals == 0:
+            return (), 0
+        stats = self.latest.compare_to(self.first, self.key_type)
+        growing = [stat for stat in stats if stat.size_diff > 0][: self.top]
+        sites = tuple(
+            LeakSite(
+                module=_module_for(stat.traceback[0].filename),
+                location=f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                size_diff_bytes=int(stat.size_diff),
+                count_diff=int(stat.count_diff),
+                grew_intervals=self._grew[stat.traceback],
+                intervals=self.intervals,
+            )
+            for stat in growing
+        )
+        total = sum(stat.size_diff for stat in stats)
+        return sites, int(total)
+
+    def _record(self, snapshot: tracemalloc.Snapshot) -> None:
+        if self.first is None:
+            self.first = self.latest = snapshot
+            return
+        for stat in snapshot.compare_to(self.latest, self.key_type):
+            if stat.size_diff > 0:
+                self._grew[stat.traceback] += 1
+        self.intervals += 1
+        self.latest = snapshot
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in self._IGNORED]
+        )
+
+
+def _module_for(filename: str) -> str:
+    """Dotted module name for ``filename`` using the longest matching ``sys.path`` entry."""
+    path = Path(filename)
+    roots = sorted((Path(entry or ".").resolve() for entry in sys.path), key=lambda root: len(root.parts), reverse=True)
+    for root in roots:
+        try:
+            relative = path.resolve().relative_to(root)
+        except (OSError, ValueError):
+            continue
+        return ".".join(relative.with_suffix("").parts).removesuffix(".__init__")
+    return path.stem or filename
+
+
 class NotepadCycleRunner:
     def __init__(self):
         self.process: subprocess.Popen | None = None
@@ -133,6 +367,7 @@ def run_soak(
     max_rss_growth_ratio: float = 0.10,
     freeze_timeout_seconds: float = 2.0,
     clock: Clock = time.monotonic,
+    leak_tracker: LeakTracker | None = None,
 ) -> SoakResult:
     if cycles <= 0:
         raise ValueError("cycles must be positive")
@@ -143,9 +378,14 @@ def run_soak(
 
     rss = rss_reader or current_rss_bytes
     runner = cycle_runner or SyntheticCycleRunner()
-    start_rss = int(rss())
     failures = 0
     ui_freezes = 0
+    # Tracing costs memory of its own: start it first and take the RSS
+    # baseline once the tracker's warm-up snapshot exists, so enabling leak
+    # attribution does not show up as growth.
+    if leak_tracker is not None:
+        leak_tracker.start()
+    start_rss = None if leak_tracker is not None and int(cycles) > leak_tracker.interval else int(rss())
 
     for index in range(1, int(cycles) + 1):
         started = clock()
@@ -156,7 +396,17 @@ def run_soak(
         elapsed = max(0.0, clock() - started)
         if elapsed > freeze_timeout_seconds:
             ui_freezes += 1
-
+        if leak_tracker is not None:
+            leak_tracker.after_cycle(index)
+            if start_rss is None and leak_tracker.warmed_up:
+                start_rss = int(rss())
+    if start_rss is None:
+        start_rss = int(rss())
+
+    drain = getattr(runner, "drain", None)
+    if callable(drain):
+        failures += int(drain())
+    leak_sites, traced_growth = leak_tracker.finish() if leak_tracker is not None else ((), 0)
     end_rss = int(rss())
     growth_ratio = 0.0 if start_rss <= 0 else max(0.0, (end_rss - start_rss) / start_rss)
     return SoakResult(
@@ -167,6 +417,8 @@ def run_soak(
         end_rss_bytes=end_rss,
         rss_growth_ratio=round(growth_ratio, 6),
         max_rss_growth_ratio=float(max_rss_growth_ratio),
+        leak_sites=leak_sites,
+        traced_growth_bytes=traced_growth,
     )
 
 
@@ -215,29 +467,52 @@ def _windows_rss_bytes() -> int:
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run VoiceTray soak cycles")
     parser.add_argument("--cycles", type=int, default=50)
-    parser.add_argument("--target", choices=("synthetic", "notepad"), default="synthetic")
+    parser.add_argument("--target", choices=("synthetic", "audio", "notepad"), default="synthetic")
     parser.add_argument("--max-rss-growth", type=float, default=0.10)
     parser.add_argument("--freeze-timeout", type=float, default=2.0)
     parser.add_argument("--json", action="store_true", help="emit machine-readable result")
+    audio = parser.add_argument_group("audio target")
+    audio.add_argument("--stt", default="stub", help="'stub' or a locally installed model size such as tiny")
+    audio.add_argument("--stt-rtf", type=float, default=0.0, help="simulated stub decode time per audio second")
+    audio.add_argument("--concurrency", type=int, default=2, help="dictations processed at once")
+    audio.add_argument("--audio-seconds", type=float, default=3.0)
+    leaks = parser.add_argument_group("leak attribution")
+    leaks.add_argument(
+        "--tracemalloc",
+        type=int,
+        default=0,
+        metavar="EVERY",
+        help="snapshot tracemalloc every EVERY cycles and report the top growing sites",
+    )
+    leaks.add_argument("--tracemalloc-frames", type=int, default=1)
+    leaks.add_argument("--top", type=int, default=10, help="growing allocation sites to report")
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
     args = build_parser().parse_args(argv)
+    tracker = None
+    if args.tracemalloc > 0:
+        tracker = LeakTracker(interval=args.tracemalloc, frames=args.tracemalloc_frames, top=args.top)
+    options = {
+        "cycles": args.cycles,
+        "max_rss_growth_ratio": args.max_rss_growth,
+        "freeze_timeout_seconds": args.freeze_timeout,
+        "leak_tracker": tracker,
+    }
     if args.target == "notepad":
         with NotepadCycleRunner() as runner:
-            result = run_soak(
-                cycles=args.cycles,
-                cycle_runner=runner,
-                max_rss_growth_ratio=args.max_rss_growth,
-                freeze_timeout_seconds=args.freeze_timeout,
-            )
+            result = run_soak(cycle_runner=runner, **options)
+    elif args.target == "audio":
+        with AudioCycleRunner(
+            stt=args.stt,
+            stt_rtf=args.stt_rtf,
+            concurrency=args.concurrency,
+            audio_seconds=args.audio_seconds,
+        ) as runner:
+            result = run_soak(cycle_runner=runner, **options)
     else:
-        result = run_soak(
-            cycles=args.cycles,
-            max_rss_growth_ratio=args.max_rss_growth,
-            freeze_timeout_seconds=args.freeze_timeout,
-        )
+        result = run_soak(**options)
 
     if args.json:
         print(json.dumps(asdict(result) | {"ok": result.ok}, sort_keys=True))
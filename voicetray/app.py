@@ -9,15 +9,39 @@ from typing import Callable, Sequence
 
 from .config import load_config
 from .crash_guard import install_crash_guard
-from .model_download import download_whisper_model
-from .ui.history_window import HistoryWindow
-from .ui.onboarding import OnboardingWizard
+from .startup import FIRST_DICTATION_READY, READY, STARTUP, TRAY_ICON
 from .ui.pill import VoiceTrayPill
-from .ui.settings_window import SettingsWindow
 from .ui.tray import TrayCallbacks, TrayState, VoiceTrayTray
 
 logger = logging.getLogger(__name__)
 
+# Windows, the model downloader and the dictation core are imported on first
+# use so the tray icon and hotkeys come up before they are loaded.
+
+
+def _settings_window(**kwargs):
+    from .ui.settings_window import SettingsWindow
+
+    return SettingsWindow(**kwargs)
+
+
+def _history_window(**kwargs):
+    from .ui.history_window import HistoryWindow
+
+    return HistoryWindow(**kwargs)
+
+
+def _onboarding_window(**kwargs):
+    from .ui.onboarding import OnboardingWizard
+
+    return OnboardingWizard(**kwargs)
+
+
+def _download_whisper_model(model_size: str, progress_callback: Callable[[int], None] | None = None):
+    from .model_download import download_whisper_model
+
+    return download_whisper_model(model_size, progress_callback)
+
 
 def _load_qt_modules():
     from PySide6 import QtCore, QtGui, QtWidgets
@@ -46,9 +70,11 @@ class LegacyWorkerController:
         self.core = None
 
     def start(self) -> None:
-        from .legacy_app import VoiceTrayApp as CoreVoiceTrayApp
+        with STARTUP.phase("core_import"):
+            from .legacy_app import VoiceTrayApp as CoreVoiceTrayApp
 
-        self.core = CoreVoiceTrayApp()
+        with STARTUP.phase("core_init"):
+            self.core = CoreVoiceTrayApp()
         self.core.notification_callback = self.signals.notification_requested.emit
         self.core.recording_started_callback = self.signals.recording_started.emit
         self.core.recording_stopped_callback = self.signals.recording_stopped.emit
@@ -61,7 +87,13 @@ class LegacyWorkerController:
         self.core.start_second_launch_notification_watcher()
 
         if getattr(self.core, "auto_start_listening", True):
-            self.core.start_listening()
+            with STARTUP.phase("hotkeys"):
+                self.core.start_listening()
+
+    def preload_model(self) -> None:
+        engine = getattr(self.core, "stt_engine", None)
+        if engine is not None:
+            engine.load()
 
     def stop(self) -> None:
         if self.core is None:
@@ -106,6 +138,10 @@ class LegacyWorkerController:
 
     def history_store(self):
         if self.core is not None:
+            writer = getattr(self.core, "history_writer", None)
+            if writer is not None:
+                # Show the dictation that was just inserted, not only what was flushed.
+                writer.flush(timeout=1.0)
             return getattr(self.core, "history_store", None)
         return None
 
@@ -132,6 +168,11 @@ class LegacyWorkerController:
         self.core.load_settings()
         self.core.load_app_profiles()
         self.core.load_snippets_from_file()
+        self.core.init_history_maintenance()
+        self.core.init_metrics_endpoint()
+        self.core.init_trace_log()
+        self.core.init_profiler()
+        self.core.init_dedup_index()
         self.core.init_dictation_pipeline()
         self.core.init_speech_engine()
         self.core.audio_level_callback = self.signals.audio_level_changed.emit
@@ -159,19 +200,21 @@ class VoiceTrayApp:
         config_path=None,
         model_download_callback: Callable[[str, Callable[[int], None]], None] | None = None,
         crash_guard_installer: Callable[..., object] | None = None,
+        startup_report: bool = False,
     ):
         self.argv = list(sys.argv if argv is None else argv)
         self.qt_modules = qt_modules
         self.controller_factory = controller_factory or LegacyWorkerController
         self.tray_factory = tray_factory or VoiceTrayTray
         self.pill_factory = pill_factory or VoiceTrayPill
-        self.settings_window_factory = settings_window_factory or SettingsWindow
-        self.history_window_factory = history_window_factory or HistoryWindow
-        self.onboarding_window_factory = onboarding_window_factory or OnboardingWizard
+        self.settings_window_factory = settings_window_factory or _settings_window
+        self.history_window_factory = history_window_factory or _history_window
+        self.onboarding_window_factory = onboarding_window_factory or _onboarding_window
         self.config_loader = config_loader or load_config
         self.config_path = config_path
-        self.model_download_callback = model_download_callback or download_whisper_model
+        self.model_download_callback = model_download_callback or _download_whisper_model
         self.crash_guard_installer = crash_guard_installer or install_crash_guard
+        self.startup_report = bool(startup_report)
         self.qt_app = None
         self.signals = None
         self.controller = None
@@ -184,33 +227,38 @@ class VoiceTrayApp:
         self.crash_guard = None
 
     def run(self) -> int:
-        qt_modules = self.qt_modules or _load_qt_modules()
-        application = qt_modules.QtWidgets.QApplication.instance()
-        if application is None:
-            application = qt_modules.QtWidgets.QApplication(self.argv)
+        with STARTUP.phase("qt_app"):
+            qt_modules = self.qt_modules or _load_qt_modules()
+            application = qt_modules.QtWidgets.QApplication.instance()
+            if application is None:
+                application = qt_modules.QtWidgets.QApplication(self.argv)
 
-        application.setApplicationName("VoiceTray")
-        application.setQuitOnLastWindowClosed(False)
+            application.setApplicationName("VoiceTray")
+            application.setQuitOnLastWindowClosed(False)
 
         self.qt_app = application
-        self.config = self._load_app_config()
-        self.signals = create_worker_signals(qt_modules.QtCore)
-        self.controller = self.controller_factory(self.signals)
-        self.tray = self.tray_factory(
-            qt_modules=qt_modules,
-            callbacks=TrayCallbacks(
-                start_listening=self._start_listening,
-                stop_listening=self._stop_listening,
-                show_history=self._show_history,
-                show_settings=self._show_settings,
-                quit_app=getattr(application, "quit", lambda: None),
-            ),
-            model_label=self._controller_model_label(),
-        )
-        self.pill = self.pill_factory(
-            qt_modules=qt_modules,
-            hotkey_hint=self._controller_hotkey_hint(),
-        )
+        with STARTUP.phase("app_config"):
+            self.config = self._load_app_config()
+        with STARTUP.phase("signals"):
+            self.signals = create_worker_signals(qt_modules.QtCore)
+            self.controller = self.controller_factory(self.signals)
+        with STARTUP.phase("tray"):
+            self.tray = self.tray_factory(
+                qt_modules=qt_modules,
+                callbacks=TrayCallbacks(
+                    start_listening=self._start_listening,
+                    stop_listening=self._stop_listening,
+                    show_history=self._show_history,
+                    show_settings=self._show_settings,
+                    quit_app=getattr(application, "quit", lambda: None),
+                ),
+                model_label=self._controller_model_label(),
+            )
+        with STARTUP.phase("pill"):
+            self.pill = self.pill_factory(
+                qt_modules=qt_modules,
+                hotkey_hint=self._controller_hotkey_hint(),
+            )
 
         about_to_quit = getattr(application, "aboutToQuit", None)
         if about_to_quit is not None:
@@ -238,12 +286,48 @@ class VoiceTrayApp:
         self.crash_guard = self.crash_guard_installer(
             notify=self.signals.notification_requested.emit
         )
-        self.controller.start()
+        if self.startup_report:
+            return self._run_startup_report(application)
+        timer = getattr(qt_modules.QtCore, "QTimer", None)
+        if timer is not None:
+            # Let the event loop paint the tray before the dictation core is imported and built.
+            timer.singleShot(0, self._start_controller)
+        else:
+            self._start_controller()
+        return int(application.exec())
+
+    def _start_controller(self) -> None:
+        STARTUP.milestone(TRAY_ICON)
+        with STARTUP.phase("controller_start"):
+            self.controller.start()
+        STARTUP.milestone(READY)
+        STARTUP.publish()
+        STARTUP.log()
         self._sync_listening_state()
         if hasattr(self.tray, "set_model_label"):
             self.tray.set_model_label(self._controller_model_label())
-        self._show_onboarding_if_needed()
-        return int(application.exec())
+        if not self.startup_report:
+            self._show_onboarding_if_needed()
+
+    def _run_startup_report(self, application) -> int:
+        """Go through the launch path plus a model load without entering the event loop."""
+        process_events = getattr(application, "processEvents", None)
+        if process_events is not None:
+            process_events()
+        try:
+            self._start_controller()
+            preload = getattr(self.controller, "preload_model", None)
+            if preload is not None:
+                with STARTUP.phase("model_load"):
+                    preload()
+                STARTUP.milestone(FIRST_DICTATION_READY)
+        except Exception:
+            logger.exception("Startup report could not finish starting up")
+            return 1
+        finally:
+            STARTUP.publish()
+            self.controller.stop()
+        return 0
 
     def _log_notification(self, message: str) -> None:
         logger.info("Notification requested: %s", message)
@@ -12,6 +12,8 @@ from typing import Any
 
 import numpy as np
 
+from voicetray.metrics import count
+
 logger = logging.getLogger(__name__)
 
 LevelCallback = Callable[[float], None]
@@ -118,6 +120,7 @@ class AudioRecorder:
     def _on_audio(self, indata: Any, _frames: int, _time_info: Any, status: Any) -> None:
         if status:
             logger.debug("Input stream status: %s", status)
+            count("voicetray_recorder_stream_status_total", "Input stream callbacks flagged with a status")
 
         mono = _to_mono_float32(indata)
         if mono.size == 0:
@@ -135,6 +138,12 @@ class AudioRecorder:
         self._chunks.append(chunk)
         self._sample_count += int(chunk.shape[0])
 
+        if self._sample_count > self._max_samples:
+            count(
+                "voicetray_recorder_overflow_samples_total",
+                "Samples dropped because the recording buffer was full",
+                self._sample_count - self._max_samples,
+            )
         while self._sample_count > self._max_samples and self._chunks:
             overflow = self._sample_count - self._max_samples
             oldest = self._chunks[0]
@@ -0,0 +1,302 @@
+"""Audio-level accuracy/latency eval: WAV + reference manifest through ``WhisperEngine``.
+
+Each config in a matrix of ``WhisperEngineConfig`` overrides is run over every
+manifest case and scored by corpus-level WER and CER, real-time factor (STT
+and VAD wall time over audio length), model load time and peak resident memory.
+By default each config runs in its own short-lived process, so its memory
+figure is not inflated by models loaded before it.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from voicetray.audio.wav import SAMPLE_RATE, read_wav
+from voicetray.stt.whisper_engine import ModelFactory, WhisperEngine, WhisperEngineConfig
+
+_CONFIG_FIELDS = {field.name for field in fields(WhisperEngineConfig)}
+_NON_WORD_RE = re.compile(r"[^\w\s']+")
+_APOSTROPHE_RE = re.compile(r"(?<!\w)'|'(?!\w)")
+
+
+@dataclass(frozen=True)
+class AudioCase:
+    id: str
+    audio_path: Path
+    reference: str
+
+
+@dataclass(frozen=True)
+class AudioCaseResult:
+    id: str
+    reference: str
+    hypothesis: str
+    audio_seconds: float
+    seconds: float
+    word_errors: int
+    reference_words: int
+
+
+@dataclass(frozen=True)
+class AudioEvalResult:
+    label: str
+    config: dict[str, Any]
+    cases: tuple[AudioCaseResult, ...]
+    audio_seconds: float
+    transcribe_seconds: float
+    load_seconds: float
+    wer: float
+    cer: float
+    peak_rss_bytes: int
+
+    @property
+    def rtf(self) -> float:
+        return self.transcribe_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["rtf"] = self.rtf
+        payload["cases"] = [asdict(case) for case in self.cases]
+        return payload
+
+
+def load_audio_manifest(path: str | Path) -> list[AudioCase]:
+    """Read a JSONL manifest of ``{"audio": ..., "text": ..., "id"?: ...}`` rows.
+
+    Audio paths are resolved relative to the manifest file.
+    """
+    manifest = Path(path)
+    cases: list[AudioCase] = []
+    with manifest.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            try:
+                payload = json.loads(stripped)
+                audio = Path(str(payload["audio"]))
+                reference = str(payload["text"])
+            except (json.JSONDecodeError, KeyError, TypeError) as exc:
+                raise ValueError(f"{manifest}:{line_number}: invalid audio eval row") from exc
+            if not audio.is_absolute():
+                audio = manifest.parent / audio
+            cases.append(
+                AudioCase(id=str(payload.get("id") or audio.stem), audio_path=audio, reference=reference)
+            )
+    return cases
+
+
+def expand_matrix(spec: Mapping[str, Sequence[Any]] | Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """Turn ``{"beam_size": [1, 5], ...}`` into the cartesian product of overrides.
+
+    A list of dicts is taken as the explicit list of configs. Keys must be
+    ``WhisperEngineConfig`` fields.
+    """
+    if isinstance(spec, Mapping):
+        keys = list(spec)
+        value_lists = [value if isinstance(value, (list, tuple)) else [value] for value in spec.values()]
+        configs = [dict(zip(keys, combo)) for combo in itertools.product(*value_lists)]
+    else:
+        configs = [dict(item) for item in spec]
+    for overrides in configs:
+        unknown = sorted(set(overrides) - _CONFIG_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown WhisperEngineConfig field(s): {', '.join(unknown)}")
+    return configs or [{}]
+
+
+def config_label(overrides: Mapping[str, Any]) -> str:
+    if not overrides:
+        return "default"
+    return " ".join(f"{key}={value}" for key, value in overrides.items())
+
+
+def normalize_transcript(text: str) -> str:
+    """Lowercase, drop punctuation (keeping in-word apostrophes) and collapse spaces."""
+    lowered = _NON_WORD_RE.sub(" ", text.lower().replace("’", "'"))
+    return " ".join(_APOSTROPHE_RE.sub(" ", lowered).split())
+
+
+def edit_distance(reference: Sequence[Any], hypothesis: Sequence[Any]) -> int:
+    """Levenshtein distance over tokens or characters."""
+    if len(reference) < len(hypothesis):
+        reference, hypothesis = hypothesis, reference
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_item in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_item in enumerate(hypothesis, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_item != hyp_item),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process, or 0 where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_working_set()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def _windows_peak_working_set() -> int:
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return 0
+        return int(counters.PeakWorkingSetSize)
+    except Exception:
+        return 0
+
+
+def evaluate_config(
+    cases: Sequence[AudioCase],
+    overrides: Mapping[str, Any] | None = None,
+    *,
+    base: WhisperEngineConfig | None = None,
+    model_factory: ModelFactory | None = None,
+    runs: int = 1,
+    warmup: bool = False,
+) -> AudioEvalResult:
+    """Transcribe every case ``runs`` times and keep its fastest run.
+
+    ``warmup`` transcribes the first case once, untimed, so one-off costs after
+    loading (allocator growth, lazy kernel setup) do not land on the first case.
+    """
+    overrides = dict(overrides or {})
+    config = replace(base or WhisperEngineConfig(), **overrides)
+    engine = WhisperEngine(config, model_factory=model_factory)
+
+    load_started = time.perf_counter()
+    engine.load()
+    load_seconds = time.perf_counter() - load_started
+
+    results: list[AudioCaseResult] = []
+    char_errors = 0
+    reference_chars = 0
+    if warmup and cases:
+        engine.transcribe(read_wav(cases[0].audio_path))
+    for case in cases:
+        audio = read_wav(case.audio_path)
+        hypothesis, elapsed = "", float("inf")
+        for _run in range(max(1, runs)):
+            started = time.perf_counter()
+            hypothesis = engine.transcribe(audio)
+            elapsed = min(elapsed, time.perf_counter() - started)
+        reference = normalize_transcript(case.reference)
+        normalized = normalize_transcript(hypothesis)
+        char_errors += edit_distance(reference, normalized)
+        reference_chars += len(reference)
+        reference_words = reference.split()
+        results.append(
+            AudioCaseResult(
+                id=case.id,
+                reference=case.reference,
+                hypothesis=hypothesis,
+                audio_seconds=audio.size / SAMPLE_RATE,
+                seconds=elapsed,
+                word_errors=edit_distance(reference_words, normalized.split()),
+                reference_words=len(reference_words),
+            )
+        )
+
+    total_words = sum(result.reference_words for result in results)
+    return AudioEvalResult(
+        label=config_label(overrides),
+        config=asdict(config),
+        cases=tuple(results),
+        audio_seconds=sum(result.audio_seconds for result in results),
+        transcribe_seconds=sum(result.seconds for result in results),
+        load_seconds=load_seconds,
+        wer=sum(result.word_errors for result in results) / total_words if total_words else 0.0,
+        cer=char_errors / reference_chars if reference_chars else 0.0,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+
+
+def run_audio_eval(
+    cases: Sequence[AudioCase],
+    matrix: Iterable[Mapping[str, Any]],
+    *,
+    base: WhisperEngineConfig | None = None,
+    model_factory: ModelFactory | None = None,
+    isolate: bool = True,
+    runs: int = 1,
+    warmup: bool = False,
+) -> list[AudioEvalResult]:
+    """Evaluate every config; ``isolate`` runs each in a fresh process for honest memory numbers."""
+    cases = list(cases)
+    results: list[AudioEvalResult] = []
+    for overrides in matrix:
+        if not isolate:
+            results.append(
+                evaluate_config(
+                    cases, overrides, base=base, model_factory=model_factory, runs=runs, warmup=warmup
+                )
+            )
+            continue
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                evaluate_config,
+                cases,
+                dict(overrides),
+                base=base,
+                model_factory=model_factory,
+                runs=runs,
+                warmup=warmup,
+            )
+            results.append(future.result())
+    return results
+
+
+def pick_fastest(results: Sequence[AudioEvalResult], max_wer: float) -> AudioEvalResult | None:
+    """Lowest real-time factor among configs with WER at or below ``max_wer``."""
+    passing = [result for result in results if result.wer <= max_wer]
+    return min(passing, key=lambda result: result.rtf, default=None)
+
+
+def print_audio_eval(results: Sequence[AudioEvalResult], chosen: AudioEvalResult | None = None) -> None:
+    header = f"{'config':<44} {'WER':>7} {'CER':>7} {'RTF':>7} {'load s':>8} {'peak MB':>9}\n"
+    sys.stdout.write(header)
+    for result in results:
+        marker = " *" if result is chosen else ""
+        sys.stdout.write(
+            f"{result.label[:44]:<44} {result.wer * 100:>6.1f}% {result.cer * 100:>6.1f}% "
+            f"{result.rtf:>7.3f} {result.load_seconds:>8.2f} "
+            f"{result.peak_rss_bytes / (1024 * 1024):>9.1f}{marker}\n"
+        )
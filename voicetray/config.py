@@ -34,6 +34,8 @@ CONFIG_SCHEMA: dict[str, Any] = {
         "profile": str,
         "glossary_path": str,
         "app_profiles_path": str,
+        "dedup_window": int,
+        "dedup_history_rows": int,
     },
     "stt": {
         "model_size": str,
@@ -45,6 +47,30 @@ CONFIG_SCHEMA: dict[str, Any] = {
         "silence_padding_ms": int,
         "vad_aggressiveness": int,
         "vad_energy_threshold": float,
+        "shared_model_cache": bool,
+        "model_cache_dir": str,
+    },
+    "history": {
+        "retention_max_rows": int,
+        "retention_max_age_days": int,
+        "retention_max_mb": int,
+        "archive": bool,
+        "maintenance_interval_minutes": int,
+        "full_vacuum": bool,
+    },
+    "metrics": {
+        "endpoint_enabled": bool,
+        "port": int,
+    },
+    "tracing": {
+        "slow_dictation_ms": int,
+    },
+    "profiling": {
+        "enabled": bool,
+        "mode": str,
+        "threshold_ms": int,
+        "sample_interval_ms": int,
+        "max_files": int,
     },
     "llm": {
         "enabled": bool,
@@ -55,6 +81,9 @@ CONFIG_SCHEMA: dict[str, Any] = {
         "top_p": float,
         "threads": (int, type(None)),
         "gpu_layers": (int, type(None)),
+        "gate_enabled": bool,
+        "speculative": bool,
+        "speculative_grace_ms": int,
     },
 }
 
@@ -82,6 +111,8 @@ _DEFAULT_CONFIG: dict[str, Any] = {
         "profile": "general",
         "glossary_path": "glossary.json",
         "app_profiles_path": "app_profiles.json",
+        "dedup_window": 5,
+        "dedup_history_rows": 0,
     },
     "stt": {
         "model_size": "base",
@@ -93,6 +124,30 @@ _DEFAULT_CONFIG: dict[str, Any] = {
         "silence_padding_ms": 120,
         "vad_aggressiveness": 2,
         "vad_energy_threshold": 0.003,
+        "shared_model_cache": True,
+        "model_cache_dir": "",
+    },
+    "history": {
+        "retention_max_rows": 0,
+        "retention_max_age_days": 0,
+        "retention_max_mb": 0,
+        "archive": True,
+        "maintenance_interval_minutes": 360,
+        "full_vacuum": False,
+    },
+    "metrics": {
+        "endpoint_enabled": False,
+        "port": 9765,
+    },
+    "tracing": {
+        "slow_dictation_ms": 3000,
+    },
+    "profiling": {
+        "enabled": False,
+        "mode": "sampling",
+        "threshold_ms": 0,
+        "sample_interval_ms": 5,
+        "max_files": 10,
     },
     "llm": {
         "enabled": False,
@@ -103,6 +158,9 @@ _DEFAULT_CONFIG: dict[str, Any] = {
         "top_p": 0.9,
         "threads": None,
         "gpu_layers": None,
+        "gate_enabled": True,
+        "speculative": False,
+        "speculative_grace_ms": 250,
     },
 }
 
@@ -0,0 +1,59 @@
+"""Zip logs, slow-dictation traces and profiles into one file for bug reports."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+from .logging_config import log_file_path
+
+BUNDLE_PREFIX = "voicetray-diagnostics"
+# Subdirectories of the log folder that are copied into the bundle.
+BUNDLE_SUBDIRS = ("traces", "profiles")
+
+
+def _system_info() -> dict[str, object]:
+    from . import __version__
+    from .metrics import REGISTRY
+
+    return {
+        "voicetray": __version__,
+        "python": sys.version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "metrics": REGISTRY.snapshot(),
+    }
+
+
+def write_diagnostics_bundle(
+    target: str | os.PathLike[str] | None = None,
+    *,
+    log_dir: str | os.PathLike[str] | None = None,
+) -> Path:
+    """Write a zip with the rotating logs, traces, profiles and a system summary.
+
+    Dictation text only appears in the bundle to the extent it is already in
+    the log files; history and config are not included.
+    """
+    logs = Path(log_dir) if log_dir is not None else log_file_path().parent
+    if target is None:
+        target = logs / f"{BUNDLE_PREFIX}-{time.strftime('%Y%m%d-%H%M%S')}.zip"
+    bundle = Path(target)
+    bundle.parent.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("system.json", json.dumps(_system_info(), indent=2, default=str))
+        for path in sorted(logs.glob("*.log*")):
+            archive.write(path, f"logs/{path.name}")
+        for name in BUNDLE_SUBDIRS:
+            for path in sorted((logs / name).glob("*")):
+                if path.is_file():
+                    archive.write(path, f"{name}/{path.name}")
+    return bundle
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import zlib
+from collections import deque
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def shingles(text: str, size: int = 3) -> FrozenSet[str]:
+    normalized = _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+    if not normalized:
+        return frozenset()
+    if len(normalized) <= size:
+        return frozenset((normalized,))
+    return frozenset(normalized[i : i + size] for i in range(len(normalized) - size + 1))
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index answering "have we seen text like this?" in roughly constant time.
+
+    ``window`` bounds the index to the most recent entries; ``None`` keeps every
+    entry, which is how the full history store is indexed.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: Optional[int] = 5,
+        threshold: float = 0.7,
+        num_perm: int = 32,
+        bands: int = 8,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if num_perm <= 0 or bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        if window is not None and window <= 0:
+            raise ValueError("window must be positive or None")
+        self.window = window
+        self.threshold = float(threshold)
+        self.num_perm = int(num_perm)
+        self.bands = int(bands)
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = int(shingle_size)
+        rng = random.Random(seed)
+        self._perms: Tuple[Tuple[int, int], ...] = tuple(
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(self.num_perm)
+        )
+        self._lock = threading.Lock()
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = {}
+        self._order: Deque[int] = deque()
+        self._next_key = 0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text, self.shingle_size)]
+        if not hashes:
+            return ()
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    def add(self, text: str) -> Optional[int]:
+        signature = self.signature(text)
+        if not signature:
+            return None
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._signatures[key] = signature
+            self._order.append(key)
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            while self.window is not None and len(self._order) > self.window:
+                self._remove_locked(self._order.popleft())
+        return key
+
+    def add_many(self, texts: Iterable[str]) -> int:
+        added = 0
+        for text in texts:
+            if self.add(text) is not None:
+                added += 1
+        return added
+
+    def best_match(self, text: str) -> float:
+        """Return the highest estimated Jaccard similarity among LSH candidates."""
+        signature = self.signature(text)
+        if not signature:
+            return 0.0
+        best = 0.0
+        with self._lock:
+            candidates: Set[int] = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            for key in candidates:
+                other = self._signatures[key]
+                agree = sum(1 for x, y in zip(signature, other) if x == y)
+                best = max(best, agree / self.num_perm)
+        return best
+
+    def is_near_duplicate(self, text: str) -> bool:
+        return self.best_match(text) >= self.threshold
+
+    def clear(self) -> None:
+        with self._lock:
+            self._signatures.clear()
+            self._buckets.clear()
+            self._order.clear()
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _remove_locked(self, key: int) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is None:
+                continue
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
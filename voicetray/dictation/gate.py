@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import List
+
+from .rules import FILLER_PHRASES_AGGRESSIVE, FILLER_PHRASES_CONSERVATIVE, SELF_CORRECTION_MARKERS, WORD_RE
+
+
+# "like" is too common as a verb to count as a disfluency on its own.
+_GATE_FILLERS = FILLER_PHRASES_CONSERVATIVE + tuple(p for p in FILLER_PHRASES_AGGRESSIVE if p != "like")
+
+_DISFLUENCY_RE = re.compile(
+    "|".join(
+        [pattern for _marker, pattern in SELF_CORRECTION_MARKERS]
+        + [
+            r"(?<!\w)" + r"[\s,]+".join(re.escape(part) for part in phrase.split()) + r"(?!\w)"
+            for phrase in _GATE_FILLERS
+        ]
+    ),
+    flags=re.IGNORECASE,
+)
+_PUNCTUATION_RE = re.compile(r"[,.!?;:]")
+
+
+@dataclass(frozen=True)
+class LLMGateConfig:
+    enabled: bool = True
+    min_words: int = 4
+    heavy_edit_ratio: float = 0.25
+    long_words: int = 12
+    min_punctuation_density: float = 1.0 / 15.0
+
+
+@dataclass(frozen=True)
+class LLMGateDecision:
+    use_llm: bool
+    reason: str
+
+
+class LLMGateStats:
+    def __init__(self):
+        self.checked = 0
+        self.sent = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.checked - self.sent
+
+    @property
+    def hit_rate(self) -> float:
+        if self.checked == 0:
+            return 0.0
+        return (self.sent / self.checked) * 100.0
+
+    def record(self, decision: LLMGateDecision) -> None:
+        self.checked += 1
+        if decision.use_llm:
+            self.sent += 1
+
+
+def decide_llm_gate(source_text: str, rule_text: str, cfg: LLMGateConfig) -> LLMGateDecision:
+    """Decide whether a rule-cleaned transcript is likely to benefit from the LLM."""
+    if not cfg.enabled:
+        return LLMGateDecision(True, "gate_disabled")
+
+    rule_words = _words(rule_text)
+    if len(rule_words) < cfg.min_words:
+        return LLMGateDecision(False, "short")
+
+    if _DISFLUENCY_RE.search(source_text or ""):
+        return LLMGateDecision(True, "disfluency")
+
+    if word_edit_ratio(_words(source_text), rule_words) >= cfg.heavy_edit_ratio:
+        return LLMGateDecision(True, "heavy_edits")
+
+    if len(rule_words) >= cfg.long_words:
+        density = len(_PUNCTUATION_RE.findall(rule_text)) / len(rule_words)
+        if density < cfg.min_punctuation_density:
+            return LLMGateDecision(True, "sparse_punctuation")
+
+    return LLMGateDecision(False, "rules_confident")
+
+
+def word_edit_ratio(a_words: List[str], b_words: List[str]) -> float:
+    if not a_words and not b_words:
+        return 0.0
+    matcher = SequenceMatcher(None, [w.lower() for w in a_words], [w.lower() for w in b_words], autojunk=False)
+    return 1.0 - matcher.ratio()
+
+
+def _words(text: str) -> List[str]:
+    return WORD_RE.findall(text or "")
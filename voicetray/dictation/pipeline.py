@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 
+from voicetray.metrics import count, observe_stage
+from voicetray.tracing import propagate, span
+
+from .gate import LLMGateConfig, LLMGateDecision, LLMGateStats, decide_llm_gate
 from .glossary import Glossary, apply_replacements, learn_word, load_glossary, protect_terms, restore_terms
 from .llm_local import LocalLLMConfig, LocalLLMCleaner
 from .protect import protect_spans, restore_spans
@@ -12,6 +18,8 @@ from .rules import RuleOptions, apply_rules
 from .types import DictationContext
 from .validation import ValidationResult, validate_llm_output
 
+logger = logging.getLogger(__name__)
+
 PROFILE_TONE_HINTS = {
     "email": "formal",
     "chat": "casual",
@@ -23,6 +31,7 @@ PROFILE_TONE_HINTS = {
 class DictationConfig:
     glossary_path: str = ""
     llm: LocalLLMConfig = LocalLLMConfig()
+    llm_gate: LLMGateConfig = LLMGateConfig()
 
 
 def _options_for(context: DictationContext) -> RuleOptions:
@@ -92,12 +101,55 @@ def _tone_hint_for(context: DictationContext) -> str:
     return PROFILE_TONE_HINTS.get(context.profile, "neutral")
 
 
+@dataclass(frozen=True)
+class _RuleStage:
+    source_text: str
+    rule_text: str
+    term_mapping: Dict[str, str]
+    span_mapping: Dict[str, str]
+
+    def restore(self, text: str) -> str:
+        return restore_terms(restore_spans(text, self.span_mapping), self.term_mapping)
+
+
+class SpeculativeCleanup:
+    """Rule-cleaned text that may be upgraded by an LLM pass still in flight."""
+
+    def __init__(self, rule_text: str):
+        self.rule_text = rule_text
+        self._llm_text: Optional[str] = None
+        self._done = threading.Event()
+
+    @classmethod
+    def finished(cls, rule_text: str) -> "SpeculativeCleanup":
+        cleanup = cls(rule_text)
+        cleanup.finish(None)
+        return cleanup
+
+    @property
+    def pending(self) -> bool:
+        return not self._done.is_set()
+
+    def finish(self, llm_text: Optional[str]) -> None:
+        self._llm_text = llm_text
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        if not self._done.wait(timeout):
+            return None
+        return self._llm_text
+
+
 class DictationPipeline:
     def __init__(self, cfg: DictationConfig, llm_cleaner: Optional[LocalLLMCleaner] = None):
         self.cfg = cfg
         self.glossary: Glossary = load_glossary(cfg.glossary_path) if cfg.glossary_path else Glossary()
         self.llm = llm_cleaner if llm_cleaner is not None else LocalLLMCleaner(cfg.llm)
         self.last_timings: dict[str, float] = {"rules": 0.0, "llm": 0.0}
+        self.last_gate_decision: Optional[LLMGateDecision] = None
+        self.llm_gate_stats = LLMGateStats()
+        # llama.cpp is not thread-safe: one LLM pass at a time on the shared model.
+        self._llm_lock = threading.Lock()
 
     def reload_glossary(self):
         self.glossary = load_glossary(self.cfg.glossary_path) if self.cfg.glossary_path else Glossary()
@@ -118,37 +170,140 @@ class DictationPipeline:
 
     def process_transcript(self, raw_text: str, context: DictationContext) -> str:
         self.last_timings = {"rules": 0.0, "llm": 0.0}
+        self.last_gate_decision = None
         if not raw_text:
             return ""
 
-        text = raw_text
-        text = apply_replacements(text, self.glossary)
-        protected_text, mapping = protect_terms(text, self.glossary)
-        protected_text, span_mapping = protect_spans(protected_text)
+        stage = self._apply_rule_stage(raw_text, context)
+        if context.mode == "raw" or context.profile == "code/comments":
+            return self._restore(stage, stage.rule_text)
+
+        llm_ok_text: Optional[str] = None
+        llm_started = time.perf_counter()
+        if self._wants_llm(stage):
+            with self._llm_lock:
+                llm_ok_text = self._validated_llm_text(stage.rule_text, context)
+        self.last_timings["llm"] = time.perf_counter() - llm_started
+        observe_stage("llm", self.last_timings["llm"])
+
+        final_text = llm_ok_text if llm_ok_text is not None else stage.rule_text
+        return self._restore(stage, final_text)
+
+    def begin_transcript(self, raw_text: str, context: DictationContext) -> "SpeculativeCleanup":
+        """Run the rules now and the LLM pass in the background.
+
+        The returned cleanup exposes the restored rule text immediately; ``wait``
+        yields the validated LLM text only if it finishes in time. While an
+        earlier pass is still running, the rule text is final.
+        """
+        self.last_timings = {"rules": 0.0, "llm": 0.0}
+        self.last_gate_decision = None
+        if not raw_text:
+            return SpeculativeCleanup.finished("")
+
+        stage = self._apply_rule_stage(raw_text, context)
+        rule_text = self._restore(stage, stage.rule_text)
+        if context.mode == "raw" or context.profile == "code/comments" or not self._wants_llm(stage):
+            return SpeculativeCleanup.finished(rule_text)
+        if not self._llm_lock.acquire(blocking=False):
+            count("voicetray_llm_validation_total", "LLM cleanup outcomes", result="busy")
+            logger.info("Previous LLM cleanup still running; using rule text")
+            return SpeculativeCleanup.finished(rule_text)
+
+        cleanup = SpeculativeCleanup(rule_text)
+        timings = self.last_timings
+
+        def run_llm() -> None:
+            llm_started = time.perf_counter()
+            llm_text: Optional[str] = None
+            try:
+                candidate = self._validated_llm_text(stage.rule_text, context)
+                if candidate is not None:
+                    llm_text = self._restore(stage, candidate)
+            except Exception:
+                logger.exception("Speculative LLM cleanup failed")
+            finally:
+                self._llm_lock.release()
+                timings["llm"] = time.perf_counter() - llm_started
+                observe_stage("llm", timings["llm"], speculative="true")
+                cleanup.finish(llm_text)
+
+        try:
+            threading.Thread(target=propagate(run_llm), name="voicetray-llm-cleanup", daemon=True).start()
+        except BaseException:
+            self._llm_lock.release()
+            raise
+        return cleanup
+
+    def _apply_rule_stage(self, raw_text: str, context: DictationContext) -> "_RuleStage":
+        with span("glossary"):
+            text = apply_replacements(raw_text, self.glossary)
+        with span("protect") as protect_span:
+            protected_text, mapping = protect_terms(text, self.glossary)
+            protected_text, span_mapping = protect_spans(protected_text)
+            protect_span.set(terms=len(mapping), spans=len(span_mapping))
 
         rule_opts = _options_for(context)
         rules_started = time.perf_counter()
-        rule_clean = apply_rules(protected_text, rule_opts)
+        with span("rules", mode=context.mode, profile=context.profile):
+            rule_clean = apply_rules(protected_text, rule_opts)
         self.last_timings["rules"] = time.perf_counter() - rules_started
+        observe_stage("rules", self.last_timings["rules"])
+        return _RuleStage(
+            source_text=protected_text,
+            rule_text=rule_clean,
+            term_mapping=mapping,
+            span_mapping=span_mapping,
+        )
 
-        if context.mode == "raw" or context.profile == "code/comments":
-            out = restore_spans(rule_clean, span_mapping)
-            return restore_terms(out, mapping)
+    def _restore(self, stage: "_RuleStage", text: str) -> str:
+        with span("restore"):
+            return stage.restore(text)
 
-        llm_ok_text: Optional[str] = None
-        llm_started = time.perf_counter()
-        if self.llm.available():
-            candidate, status = self.llm.clean(rule_clean, tone_hint=_tone_hint_for(context))
-            if candidate:
-                validation = validate_llm_output(rule_clean, candidate, mode=context.mode)
-                if validation.ok:
-                    llm_ok_text = candidate
-        self.last_timings["llm"] = time.perf_counter() - llm_started
+    def _wants_llm(self, stage: "_RuleStage") -> bool:
+        return self.llm.available() and self._gate_llm(stage.source_text, stage.rule_text).use_llm
 
-        final_text = llm_ok_text if llm_ok_text is not None else rule_clean
-        final_text = restore_spans(final_text, span_mapping)
-        final_text = restore_terms(final_text, mapping)
-        return final_text
+    def _validated_llm_text(self, rule_text: str, context: DictationContext) -> Optional[str]:
+        with span("llm", tone=_tone_hint_for(context)) as llm_span:
+            candidate, status = self.llm.clean(rule_text, tone_hint=_tone_hint_for(context))
+            llm_span.set(status=status)
+        if not candidate:
+            count("voicetray_llm_validation_total", "LLM cleanup outcomes", result="no_output")
+            return None
+        validate_started = time.perf_counter()
+        with span("validate") as validate_span:
+            validation = validate_llm_output(rule_text, candidate, mode=context.mode)
+            validate_span.set(ok=validation.ok, reason=validation.reason)
+        observe_stage("validate", time.perf_counter() - validate_started)
+        count(
+            "voicetray_llm_validation_total",
+            "LLM cleanup outcomes",
+            result="accepted" if validation.ok else validation.reason or "rejected",
+        )
+        return candidate if validation.ok else None
+
+    def _gate_llm(self, source_text: str, rule_text: str) -> LLMGateDecision:
+        with span("llm_gate") as gate_span:
+            decision = decide_llm_gate(source_text, rule_text, self.cfg.llm_gate)
+            gate_span.set(use_llm=decision.use_llm, reason=decision.reason)
+        self.last_gate_decision = decision
+        self.llm_gate_stats.record(decision)
+        count(
+            "voicetray_llm_gate_total",
+            "LLM gate decisions",
+            decision="send" if decision.use_llm else "skip",
+            reason=decision.reason,
+        )
+        stats = self.llm_gate_stats
+        logger.info(
+            "LLM gate: %s reason=%s sent=%d/%d (%.1f%%)",
+            "send" if decision.use_llm else "skip",
+            decision.reason,
+            stats.sent,
+            stats.checked,
+            stats.hit_rate,
+        )
+        return decision
 
 
 _DEFAULT_PIPELINE: Optional[DictationPipeline] = None
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import Dict, Mapping, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_trigger(trigger: str) -> str:
+    return _WHITESPACE_RE.sub(" ", (trigger or "").strip().lower())
+
+
+def load_snippets(path: str) -> Dict[str, str]:
+    """Parse ``trigger=expansion`` lines, skipping blanks and ``#`` comments."""
+    snippets: Dict[str, str] = {}
+    if not path or not os.path.exists(path):
+        return snippets
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            trigger, expansion = line.split("=", 1)
+            trigger = normalize_trigger(trigger)
+            if trigger:
+                snippets[trigger] = expansion.strip()
+    return snippets
+
+
+def _trie_pattern(node: dict) -> str:
+    terminal = "" in node
+    branches = []
+    for ch in sorted(k for k in node if k):
+        piece = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(piece + _trie_pattern(node[ch]))
+    if not branches:
+        return ""
+    if len(branches) == 1:
+        body = branches[0]
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+    body = "(?:" + "|".join(branches) + ")"
+    if terminal:
+        body += "?"
+    return body
+
+
+def compile_triggers(triggers) -> Optional[Pattern[str]]:
+    """Compile triggers into one trie-shaped regex that prefers the longest match."""
+    trie: dict = {}
+    for trigger in triggers:
+        trigger = normalize_trigger(trigger)
+        if not trigger:
+            continue
+        node = trie
+        for ch in trigger:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    if not trie:
+        return None
+    return re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?!\w)", re.IGNORECASE)
+
+
+class SnippetExpander:
+    """Expands spoken triggers (including multi-word ones) in a single scan."""
+
+    def __init__(self, snippets: Optional[Mapping[str, str]] = None):
+        self.snippets: Dict[str, str] = {}
+        for trigger, expansion in (snippets or {}).items():
+            trigger = normalize_trigger(trigger)
+            if trigger:
+                self.snippets[trigger] = expansion
+        self._pattern = compile_triggers(self.snippets)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SnippetExpander":
+        return cls(load_snippets(path))
+
+    def __len__(self) -> int:
+        return len(self.snippets)
+
+    def expand(self, text: str) -> str:
+        if not text or self._pattern is None:
+            return text
+        return self._pattern.sub(self._replacement, text)
+
+    def _replacement(self, match: "re.Match[str]") -> str:
+        return self.snippets.get(normalize_trigger(match.group(0)), match.group(0))
@@ -1,50 +1,77 @@
 from __future__ import annotations
 
 import re
+from collections import Counter
 from dataclasses import dataclass
 from difflib import SequenceMatcher
-from typing import Dict, Iterable, List, Sequence, Set, Tuple
+from typing import FrozenSet, List, Sequence, Set, Tuple
 
 
-def extract_numbers(text: str) -> List[str]:
-    return re.findall(r"\b\d+(?:[.,]\d+)?\b", text or "")
-
-
-def extract_urls(text: str) -> List[str]:
-    return re.findall(r"https?://[^\s)>\]]+", text or "")
-
+@dataclass(frozen=True)
+class ValidationResult:
+    ok: bool
+    reason: str
 
-def extract_words(text: str) -> List[str]:
-    return re.findall(r"[A-Za-z][A-Za-z']*", text or "")
 
+# Above this many characters SequenceMatcher.ratio() is replaced by a linear
+# token-bigram similarity so long transcripts cannot go quadratic.
+LONG_INPUT_CHARS = 2000
 
-def has_same_placeholders(a: str, b: str) -> bool:
-    pa = set(re.findall(r"__GLOSSARY_\d+__", a or ""))
-    pb = set(re.findall(r"__GLOSSARY_\d+__", b or ""))
-    sa = set(re.findall(r"__SPAN_\d+__", a or ""))
-    sb = set(re.findall(r"__SPAN_\d+__", b or ""))
-    return pa == pb and sa == sb
+_TOKEN_RE = re.compile(
+    r"(?P<url>https?://[^\s)>\]]+)"
+    r"|(?P<placeholder>__(?P<kind>GLOSSARY|SPAN)_\d+__)"
+    r"|(?P<number>\b\d+(?:[.,]\d+)?\b)"
+    r"|(?P<word>[A-Za-z][A-Za-z']*)"
+)
+_NUMBER_RE = re.compile(r"\b\d+(?:[.,]\d+)?\b")
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z']*")
 
 
 @dataclass(frozen=True)
-class ValidationResult:
-    ok: bool
-    reason: str
+class _Tokens:
+    numbers: Tuple[str, ...]
+    urls: Tuple[str, ...]
+    words: Tuple[str, ...]
+    placeholders: FrozenSet[str]
+
+
+def _tokenize(text: str) -> _Tokens:
+    numbers: List[str] = []
+    urls: List[str] = []
+    words: List[str] = []
+    placeholders: Set[str] = set()
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group(0)
+        if kind == "url":
+            urls.append(value)
+            # URLs still contribute their digits and words to the number and word checks.
+            numbers.extend(_NUMBER_RE.findall(value))
+            words.extend(w.lower() for w in _WORD_RE.findall(value))
+        elif kind == "placeholder":
+            placeholders.add(value)
+            words.append(match.group("kind").lower())
+        elif kind == "number":
+            numbers.append(value)
+        else:
+            words.append(value.lower())
+    return _Tokens(tuple(numbers), tuple(urls), tuple(words), frozenset(placeholders))
 
 
 def validate_llm_output(rule_text: str, llm_text: str, mode: str) -> ValidationResult:
     if not llm_text:
         return ValidationResult(False, "empty")
-    if not has_same_placeholders(rule_text, llm_text):
-        return ValidationResult(False, "glossary_changed")
-
-    if extract_numbers(rule_text) != extract_numbers(llm_text):
-        return ValidationResult(False, "numbers_changed")
 
-    a = rule_text.strip()
+    a = (rule_text or "").strip()
     b = llm_text.strip()
+    a_tokens = _tokenize(a)
+    b_tokens = _tokenize(b)
 
-    if extract_urls(a) != extract_urls(b):
+    if a_tokens.placeholders != b_tokens.placeholders:
+        return ValidationResult(False, "glossary_changed")
+    if a_tokens.numbers != b_tokens.numbers:
+        return ValidationResult(False, "numbers_changed")
+    if a_tokens.urls != b_tokens.urls:
         return ValidationResult(False, "urls_changed")
 
     if a and b:
@@ -52,19 +79,39 @@ def validate_llm_output(rule_text: str, llm_text: str, mode: str) -> ValidationR
         if length_ratio < 0.6 or length_ratio > 1.4:
             return ValidationResult(False, "length_ratio")
 
-    ratio = SequenceMatcher(None, a, b).ratio() if a and b else 0.0
     min_ratio = 0.75 if mode == "balanced" else 0.65
-    if ratio < min_ratio:
+    if not _similar_enough(a, b, a_tokens.words, b_tokens.words, min_ratio):
         return ValidationResult(False, "too_different")
 
-    a_words = [w.lower() for w in extract_words(a)]
-    b_words = [w.lower() for w in extract_words(b)]
-    a_set = set(a_words)
-    b_set = set(b_words)
-    added = [w for w in b_set.difference(a_set) if len(w) > 2]
-    if a_words:
+    a_set = set(a_tokens.words)
+    added = [w for w in set(b_tokens.words).difference(a_set) if len(w) > 2]
+    if a_tokens.words:
         if len(added) > max(2, int(0.05 * len(a_set))):
             return ValidationResult(False, "added_words")
 
     return ValidationResult(True, "ok")
 
+
+def _similar_enough(a: str, b: str, a_words: Sequence[str], b_words: Sequence[str], min_ratio: float) -> bool:
+    if not a or not b:
+        return 0.0 >= min_ratio
+    if a == b:
+        return True
+    if max(len(a), len(b)) > LONG_INPUT_CHARS:
+        return _bigram_similarity(a_words, b_words) >= min_ratio
+
+    matcher = SequenceMatcher(None, a, b)
+    # Both quick ratios are upper bounds on ratio(), so failing either is final.
+    if matcher.real_quick_ratio() < min_ratio or matcher.quick_ratio() < min_ratio:
+        return False
+    return matcher.ratio() >= min_ratio
+
+
+def _bigram_similarity(a_words: Sequence[str], b_words: Sequence[str]) -> float:
+    a_grams = Counter(zip(a_words, a_words[1:])) if len(a_words) > 1 else Counter(a_words)
+    b_grams = Counter(zip(b_words, b_words[1:])) if len(b_words) > 1 else Counter(b_words)
+    total = sum(a_grams.values()) + sum(b_grams.values())
+    if total == 0:
+        return 1.0
+    shared = sum((a_grams & b_grams).values())
+    return 2.0 * shared / total
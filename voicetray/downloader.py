@@ -0,0 +1,382 @@
+"""Resumable, parallel, verified HTTP downloads for model files.
+
+Each file is fetched into ``<name>.part`` with HTTP range requests split into
+fixed-size chunks that several connections download at once. Finished chunks
+are recorded in ``<name>.part.json``, so an interrupted download (a dropped
+connection, a crash, the app quitting) resumes from the missing chunks. A
+chunk that fails half-way is retried from the byte where it stopped. The
+finished file is checked against its SHA-256 (or Git blob SHA-1 for small
+non-LFS files) before it is renamed into place. Servers without range support
+fall back to a single stream.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import http.client
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .model_cache import sha256_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+DEFAULT_CONNECTIONS = 4
+DEFAULT_RETRIES = 6
+DEFAULT_TIMEOUT_SECONDS = 30.0
+READ_BYTES = 256 * 1024
+PROGRESS_INTERVAL_SECONDS = 0.1
+STATE_SUFFIX = ".part.json"
+PART_SUFFIX = ".part"
+HF_ENDPOINT = "https://huggingface.co"
+# The files faster-whisper itself downloads for a CTranslate2 Whisper model.
+WHISPER_FILE_PATTERNS = ("config.json", "preprocessor_config.json", "model.bin", "tokenizer.json", "vocabulary.*")
+
+ByteProgress = Callable[[int, int], None]
+
+
+class DownloadError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    url: str
+    name: str
+    size: int | None = None
+    sha256: str | None = None
+    git_sha1: str | None = None
+
+
+class _Progress:
+    """Byte counter shared by download threads.
+
+    The callback only runs on the thread that started the download (it usually
+    updates a Qt widget); worker threads just add to the count, and that thread
+    reports it while it waits for them.
+    """
+
+    def __init__(self, total: int, callback: ByteProgress | None):
+        self.total = total
+        self.done = 0
+        self.callback = callback
+        self._owner = threading.get_ident()
+        self._reported = -1
+        self._lock = threading.Lock()
+
+    def add(self, amount: int) -> None:
+        with self._lock:
+            self.done += amount
+        if threading.get_ident() == self._owner:
+            self.report()
+
+    def report(self) -> None:
+        with self._lock:
+            done = self.done
+        if self.callback is not None and done != self._reported:
+            self._reported = done
+            self.callback(done, self.total)
+
+
+class DownloadManager:
+    def __init__(
+        self,
+        *,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        connections: int = DEFAULT_CONNECTIONS,
+        retries: int = DEFAULT_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        backoff_seconds: float = 0.5,
+        headers: dict[str, str] | None = None,
+    ):
+        self.chunk_bytes = max(64 * 1024, int(chunk_bytes))
+        self.connections = max(1, int(connections))
+        self.retries = max(0, int(retries))
+        self.timeout = float(timeout)
+        self.backoff_seconds = max(0.0, float(backoff_seconds))
+        self.headers = {"User-Agent": "VoiceTray-downloader", **(headers or {})}
+
+    def download(
+        self,
+        files: Sequence[RemoteFile],
+        target_dir: str | os.PathLike[str],
+        *,
+        progress_callback: ByteProgress | None = None,
+    ) -> list[Path]:
+        """Download ``files`` into ``target_dir``; progress reports ``(bytes_done, bytes_total)``."""
+        target = Path(target_dir)
+        target.mkdir(parents=True, exist_ok=True)
+        sized = [file if file.size is not None else self._with_size(file) for file in files]
+        progress = _Progress(sum(file.size or 0 for file in sized), progress_callback)
+        return [self._download_file(file, target / file.name, progress) for file in sized]
+
+    def _download_file(self, file: RemoteFile, path: Path, progress: _Progress) -> Path:
+        if path.exists() and file.size is not None and path.stat().st_size == file.size and _matches(path, file):
+            progress.add(file.size)
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part = path.with_name(path.name + PART_SUFFIX)
+        state_path = path.with_name(path.name + STATE_SUFFIX)
+
+        validator, accepts_ranges = self._probe(file)
+        if file.size and accepts_ranges:
+            self._download_ranges(file, part, state_path, validator, progress)
+        else:
+            self._download_stream(file, part, progress)
+
+        if not _matches(part, file):
+            part.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise DownloadError(f"{file.name}: checksum mismatch after download")
+        os.replace(part, path)
+        state_path.unlink(missing_ok=True)
+        return path
+
+    def _download_ranges(
+        self, file: RemoteFile, part: Path, state_path: Path, validator: str, progress: _Progress
+    ) -> None:
+        size = int(file.size or 0)
+        chunks = [(start, min(start + self.chunk_bytes, size) - 1) for start in range(0, size, self.chunk_bytes)]
+        state = _read_state(state_path)
+        resumable = (
+            part.exists()
+            and state.get("url") == file.url
+            and state.get("size") == size
+            and state.get("chunk_bytes") == self.chunk_bytes
+            and state.get("validator") == validator
+        )
+        done: set[int] = {int(index) for index in state.get("done", [])} if resumable else set()
+        if not resumable:
+            with open(part, "wb") as handle:
+                handle.truncate(size)
+        else:
+            logger.info("Resuming %s: %s of %s chunks already downloaded", file.name, len(done), len(chunks))
+        progress.add(sum(chunks[index][1] - chunks[index][0] + 1 for index in done if index < len(chunks)))
+
+        lock = threading.Lock()
+
+        def record(index: int) -> None:
+            with lock:
+                done.add(index)
+                _write_state(
+                    state_path,
+                    {
+                        "url": file.url,
+                        "size": size,
+                        "chunk_bytes": self.chunk_bytes,
+                        "validator": validator,
+                        "done": sorted(done),
+                    },
+                )
+
+        pending = [index for index in range(len(chunks)) if index not in done]
+        workers = min(self.connections, len(pending) or 1)
+        errors: list[BaseException] = []
+        with ThreadPoolExecutor(workers, thread_name_prefix="voicetray-download") as pool:
+            futures = {
+                pool.submit(self._fetch_chunk, file, part, *chunks[index], progress): index for index in pending
+            }
+            waiting = set(futures)
+            while waiting:
+                finished, waiting = wait(waiting, timeout=PROGRESS_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future.exception() is None:
+                        record(futures[future])
+                    else:
+                        errors.append(future.exception())
+                progress.report()
+        if errors:
+            raise DownloadError(f"{file.name}: {len(errors)} chunk(s) failed; rerun to resume") from errors[0]
+
+    def _fetch_chunk(self, file: RemoteFile, part: Path, start: int, end: int, progress: _Progress) -> None:
+        position = start
+        attempt = 0
+        while position <= end:
+            try:
+                with self._open(file.url, {"Range": f"bytes={position}-{end}"}) as response:
+                    if response.status != 206:
+                        raise DownloadError(f"{file.name}: server ignored range request ({response.status})")
+                    with open(part, "r+b") as handle:
+                        handle.seek(position)
+                        while position <= end:
+                            block = response.read(min(READ_BYTES, end - position + 1))
+                            if not block:
+                                break
+                            handle.write(block)
+                            position += len(block)
+                            progress.add(len(block))
+                if position <= end:
+                    raise ConnectionError(f"connection closed at byte {position}")
+            except DownloadError:
+                raise
+            except (OSError, http.client.HTTPException) as exc:
+                attempt += 1
+                if attempt > self.retries or not _retryable(exc):
+                    raise DownloadError(f"{file.name}: bytes {position}-{end} failed: {exc}") from exc
+                delay = self.backoff_seconds * (2 ** (attempt - 1))
+                logger.warning("Retrying %s from byte %s in %.1fs: %s", file.name, position, delay, exc)
+                time.sleep(delay)
+
+    def _download_stream(self, file: RemoteFile, part: Path, progress: _Progress) -> None:
+        attempt = 0
+        while True:
+            written = 0
+            try:
+                with self._open(file.url) as response, open(part, "wb") as handle:
+                    while True:
+                        block = response.read(READ_BYTES)
+                        if not block:
+                            break
+                        handle.write(block)
+                        written += len(block)
+                        progress.add(len(block))
+                if file.size is not None and written != file.size:
+                    raise ConnectionError(f"received {written} of {file.size} bytes")
+                return
+            except (OSError, http.client.HTTPException) as exc:
+                progress.add(-written)
+                attempt += 1
+                if attempt > self.retries or not _retryable(exc):
+                    raise DownloadError(f"{file.name}: download failed: {exc}") from exc
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+
+    def _probe(self, file: RemoteFile) -> tuple[str, bool]:
+        """``(validator, accepts_ranges)`` from a HEAD request; the validator ties a partial file to one version."""
+        try:
+            with self._open(file.url, method="HEAD") as response:
+                headers = response.headers
+                validator = headers.get("ETag") or headers.get("Last-Modified") or ""
+                return validator, headers.get("Accept-Ranges", "").lower() == "bytes"
+        except (OSError, urllib.error.URLError, http.client.HTTPException):
+            logger.debug("HEAD %s failed; probing with a range request", file.url, exc_info=True)
+        # Without HEAD, range support is unknown: ask for one byte and see if the server honours it.
+        try:
+            with self._open(file.url, {"Range": "bytes=0-0"}) as response:
+                headers = response.headers
+                validator = headers.get("ETag") or headers.get("Last-Modified") or ""
+                return validator, response.status == 206
+        except (OSError, urllib.error.URLError, http.client.HTTPException):
+            logger.debug("Range probe of %s failed; downloading in one stream", file.url, exc_info=True)
+            return "", False
+
+    def _with_size(self, file: RemoteFile) -> RemoteFile:
+        with self._open(file.url, method="HEAD") as response:
+            length = response.headers.get("Content-Length")
+        return RemoteFile(file.url, file.name, int(length) if length else None, file.sha256, file.git_sha1)
+
+    def _open(self, url: str, headers: dict[str, str] | None = None, *, method: str = "GET"):
+        request = urllib.request.Request(url, headers={**self.headers, **(headers or {})}, method=method)
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def get_json(self, url: str) -> Any:
+        with self._open(url, {"Accept": "application/json"}) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+
+def whisper_repo_id(model_size: str) -> str:
+    if "/" in model_size:
+        return model_size
+    try:
+        from faster_whisper.utils import _MODELS
+
+        return _MODELS.get(model_size, f"Systran/faster-whisper-{model_size}")
+    except ImportError:
+        return f"Systran/faster-whisper-{model_size}"
+
+
+def whisper_remote_files(
+    model_size: str,
+    *,
+    manager: DownloadManager | None = None,
+    endpoint: str | None = None,
+    revision: str = "main",
+) -> list[RemoteFile]:
+    """Files, sizes and hashes for a faster-whisper model from the Hugging Face API."""
+    manager = manager or DownloadManager()
+    base = (endpoint or os.environ.get("HF_ENDPOINT") or HF_ENDPOINT).rstrip("/")
+    repo = whisper_repo_id(model_size)
+    quoted_revision = urllib.parse.quote(revision, safe="")
+    info = manager.get_json(f"{base}/api/models/{repo}/revision/{quoted_revision}?blobs=true")
+    files = []
+    for sibling in info.get("siblings", []):
+        name = str(sibling.get("rfilename", ""))
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in WHISPER_FILE_PATTERNS):
+            continue
+        lfs = sibling.get("lfs") or {}
+        files.append(
+            RemoteFile(
+                url=f"{base}/{repo}/resolve/{quoted_revision}/{urllib.parse.quote(name)}",
+                name=name,
+                size=lfs.get("size", sibling.get("size")),
+                sha256=lfs.get("sha256"),
+                git_sha1=None if lfs else sibling.get("blobId"),
+            )
+        )
+    if not any(file.name == "model.bin" for file in files):
+        raise DownloadError(f"{repo}@{revision} has no model.bin")
+    return files
+
+
+def download_whisper_files(
+    model_size: str,
+    target_dir: str | os.PathLike[str],
+    *,
+    progress_callback: ByteProgress | None = None,
+    manager: DownloadManager | None = None,
+    endpoint: str | None = None,
+) -> list[Path]:
+    manager = manager or DownloadManager()
+    files = whisper_remote_files(model_size, manager=manager, endpoint=endpoint)
+    return manager.download(files, target_dir, progress_callback=progress_callback)
+
+
+def git_blob_sha1(path: str | os.PathLike[str]) -> str:
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(f"blob {size}\0".encode("ascii"))
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(READ_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500 or exc.code in (408, 429)
+    return True
+
+
+def _matches(path: Path, file: RemoteFile) -> bool:
+    if file.size is not None and path.stat().st_size != file.size:
+        return False
+    if file.sha256:
+        return sha256_file(path) == file.sha256.lower()
+    if file.git_sha1:
+        return git_blob_sha1(path) == file.git_sha1.lower()
+    return True
+
+
+def _read_state(path: Path) -> dict[str, Any]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _write_state(path: Path, state: dict[str, Any]) -> None:
+    staged = path.with_name(path.name + ".tmp")
+    staged.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(staged, path)
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import gc
 import json
+import os
+import re
 import sys
-from dataclasses import dataclass
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from itertools import islice
 from pathlib import Path
 from typing import Iterable, Sequence
 
@@ -13,6 +24,13 @@ from voicetray.dictation.llm_local import LocalLLMConfig
 
 DEFAULT_CORPUS_PATH = Path(__file__).resolve().parents[1] / "tests" / "eval_corpus.jsonl"
 DEFAULT_MIN_PASS_RATE = 90.0
+DEFAULT_BENCH_BASELINE_PATH = Path(__file__).resolve().parents[1] / "tests" / "eval_bench_baseline.json"
+DEFAULT_BENCH_TOLERANCE = 0.25
+BENCH_ROUNDS = 5
+# Extra runs of a group that looks regressed before the gate fails.
+BENCH_CONFIRM_RUNS = 2
+BENCH_SCHEMA = 1
+DEFAULT_CHUNK_SIZE = 500
 
 
 @dataclass(frozen=True)
@@ -30,11 +48,22 @@ class EvalFailure:
     actual: str
 
 
+@dataclass(frozen=True)
+class CaseTiming:
+    id: str
+    mode: str
+    profile: str
+    chars: int
+    passed: bool
+    seconds: float
+
+
 @dataclass(frozen=True)
 class EvalResult:
     total: int
     passed: int
     failures: tuple[EvalFailure, ...]
+    timings: tuple[CaseTiming, ...] = ()
 
     @property
     def failed(self) -> int:
@@ -48,8 +77,12 @@ class EvalResult:
 
 
 def load_eval_corpus(path: str | Path = DEFAULT_CORPUS_PATH) -> list[EvalCase]:
+    return list(iter_eval_corpus(path))
+
+
+def iter_eval_corpus(path: str | Path = DEFAULT_CORPUS_PATH) -> Iterator[EvalCase]:
+    """Yield cases one line at a time so large corpora never sit in memory whole."""
     corpus_path = Path(path)
-    cases: list[EvalCase] = []
     with corpus_path.open("r", encoding="utf-8") as handle:
         for line_number, line in enumerate(handle, start=1):
             line = line.strip()
@@ -61,37 +94,342 @@ def load_eval_corpus(path: str | Path = DEFAULT_CORPUS_PATH) -> list[EvalCase]:
             expected = str(data["expected"])
             mode = str(data.get("mode", "balanced"))
             profile = str(data.get("profile", "general"))
-            cases.append(
-                EvalCase(
-                    id=case_id,
-                    input_text=input_text,
-                    expected=expected,
-                    mode=mode,
-                    profile=profile,
-                )
+            yield EvalCase(
+                id=case_id,
+                input_text=input_text,
+                expected=expected,
+                mode=mode,
+                profile=profile,
             )
-    return cases
+
+
+def _default_pipeline() -> DictationPipeline:
+    return DictationPipeline(DictationConfig(glossary_path="", llm=LocalLLMConfig(enabled=False)))
 
 
 def run_eval(
     cases: Iterable[EvalCase],
     pipeline: DictationPipeline | None = None,
+    *,
+    record_timings: bool = False,
 ) -> EvalResult:
-    active_pipeline = pipeline or DictationPipeline(
-        DictationConfig(glossary_path="", llm=LocalLLMConfig(enabled=False))
-    )
+    active_pipeline = pipeline or _default_pipeline()
     failures: list[EvalFailure] = []
+    timings: list[CaseTiming] = []
     total = 0
     passed = 0
     for case in cases:
         total += 1
         context = DictationContext(mode=case.mode, profile=case.profile)
+        started = time.perf_counter()
         actual = active_pipeline.process_transcript(case.input_text, context)
-        if actual == case.expected:
+        elapsed = time.perf_counter() - started
+        ok = actual == case.expected
+        if ok:
             passed += 1
         else:
             failures.append(EvalFailure(case=case, actual=actual))
-    return EvalResult(total=total, passed=passed, failures=tuple(failures))
+        if record_timings:
+            timings.append(
+                CaseTiming(case.id, case.mode, case.profile, len(case.input_text), ok, round(elapsed, 9))
+            )
+    return EvalResult(total=total, passed=passed, failures=tuple(failures), timings=tuple(timings))
+
+
+def merge_results(results: Iterable[EvalResult], *, keep_timings: bool = True) -> EvalResult:
+    total = passed = 0
+    failures: list[EvalFailure] = []
+    timings: list[CaseTiming] = []
+    for result in results:
+        total += result.total
+        passed += result.passed
+        failures.extend(result.failures)
+        if keep_timings:
+            timings.extend(result.timings)
+    return EvalResult(total=total, passed=passed, failures=tuple(failures), timings=tuple(timings))
+
+
+_WORKER_PIPELINE: DictationPipeline | None = None
+
+
+def _init_worker() -> None:
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = _default_pipeline()
+
+
+def _run_chunk(cases: list[EvalCase], record_timings: bool) -> EvalResult:
+    return run_eval(cases, _WORKER_PIPELINE, record_timings=record_timings)
+
+
+def _chunks(cases: Iterable[EvalCase], size: int) -> Iterator[list[EvalCase]]:
+    iterator = iter(cases)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_eval_chunks(
+    cases: Iterable[EvalCase],
+    *,
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    record_timings: bool = False,
+) -> Iterator[EvalResult]:
+    """Evaluate ``cases`` in shards across ``workers`` processes, yielding results in corpus order.
+
+    Each worker builds its own pipeline once; at most ``2 * workers`` shards are
+    read ahead, so memory stays flat however long the corpus is.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if workers <= 1:
+        pipeline = _default_pipeline()
+        for chunk in _chunks(cases, chunk_size):
+            yield run_eval(chunk, pipeline, record_timings=record_timings)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending: deque[Future[EvalResult]] = deque()
+        for chunk in _chunks(cases, chunk_size):
+            pending.append(executor.submit(_run_chunk, chunk, record_timings))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_eval_sharded(
+    cases: Iterable[EvalCase],
+    *,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    record_timings: bool = False,
+) -> EvalResult:
+    return merge_results(
+        iter_eval_chunks(
+            cases,
+            workers=resolve_workers(workers),
+            chunk_size=chunk_size,
+            record_timings=record_timings,
+        )
+    )
+
+
+def resolve_workers(workers: int | None) -> int:
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def write_timings(handle, timings: Iterable[CaseTiming], *, header: bool = False) -> None:
+    writer = csv.writer(handle, delimiter="\t", lineterminator="\n")
+    if header:
+        writer.writerow(("id", "mode", "profile", "chars", "passed", "ms"))
+    for timing in timings:
+        writer.writerow(
+            (timing.id, timing.mode, timing.profile, timing.chars, int(timing.passed), f"{timing.seconds * 1000:.4f}")
+        )
+
+
+@dataclass(frozen=True)
+class BenchGroup:
+    """Cleanup cost for one mode/profile; ``relative_cost`` is ns/char over the calibration loop."""
+
+    mode: str
+    profile: str
+    cases: int
+    chars: int
+    ns_per_char: float
+    relative_cost: float
+    alloc_peak_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.mode}/{self.profile}"
+
+
+@dataclass(frozen=True)
+class BenchRegression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+_CALIBRATION_TEXT = "um so the quarterly report is uh due on friday, you know, and we need two more slides " * 4
+_CALIBRATION_RE = re.compile(r"\b(?:um|uh|you know)\b,?\s*", re.IGNORECASE)
+
+
+def calibration_ns_per_char(repeat: int = 200, rounds: int = BENCH_ROUNDS) -> float:
+    """Time a fixed regex-and-string workload so baselines survive moving to a faster machine."""
+    best = float("inf")
+    for _round in range(max(1, rounds)):
+        with _gc_paused():
+            started = time.perf_counter_ns()
+            for _ in range(repeat):
+                text = _CALIBRATION_RE.sub("", _CALIBRATION_TEXT)
+                " ".join(word.capitalize() for word in text.split())
+            best = min(best, time.perf_counter_ns() - started)
+    return best / (repeat * len(_CALIBRATION_TEXT))
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # As in timeit: a collection landing in one group's rounds is not its cost.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def run_bench(
+    cases: Iterable[EvalCase],
+    repeat: int,
+    pipeline: DictationPipeline | None = None,
+    *,
+    rounds: int = BENCH_ROUNDS,
+    calibration: float | None = None,
+) -> list[BenchGroup]:
+    """Run every case ``repeat`` times per round and keep the fastest round per mode/profile."""
+    if repeat <= 0:
+        raise ValueError("repeat must be positive")
+    active_pipeline = pipeline or _default_pipeline()
+    groups: dict[tuple[str, str], list[EvalCase]] = {}
+    for case in cases:
+        groups.setdefault((case.mode, case.profile), []).append(case)
+
+    results = []
+    for (mode, profile), group_cases in sorted(groups.items()):
+        context = DictationContext(mode=mode, profile=profile)
+        texts = [case.input_text for case in group_cases]
+        chars = sum(len(text) for text in texts)
+        for text in texts:
+            active_pipeline.process_transcript(text, context)
+
+        best = float("inf")
+        for _round in range(max(1, rounds)):
+            with _gc_paused():
+                started = time.perf_counter_ns()
+                for _ in range(repeat):
+                    for text in texts:
+                        active_pipeline.process_transcript(text, context)
+                best = min(best, time.perf_counter_ns() - started)
+        ns_per_char = best / (repeat * max(1, chars))
+        # Calibrate next to each group so clock-speed drift during the run cancels out.
+        local_calibration = calibration if calibration is not None else calibration_ns_per_char(repeat=50)
+
+        results.append(
+            BenchGroup(
+                mode=mode,
+                profile=profile,
+                cases=len(texts),
+                chars=chars,
+                ns_per_char=round(ns_per_char, 2),
+                relative_cost=round(ns_per_char / local_calibration, 4),
+                alloc_peak_bytes=_mean_alloc_peak(active_pipeline, texts, context),
+            )
+        )
+    return results
+
+
+def _mean_alloc_peak(pipeline: DictationPipeline, texts: list[str], context: DictationContext) -> int:
+    # CPython has no allocation counter; the traced peak above the starting
+    # footprint is the closest stable per-dictation measure.
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        peaks = []
+        for text in texts:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            pipeline.process_transcript(text, context)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(0, peak - before))
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return int(sum(peaks) / len(peaks)) if peaks else 0
+
+
+def bench_baseline_payload(groups: Sequence[BenchGroup]) -> dict:
+    return {"schema": BENCH_SCHEMA, "groups": {group.key: asdict(group) for group in groups}}
+
+
+def load_bench_baseline(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_bench(
+    groups: Sequence[BenchGroup],
+    baseline: dict,
+    tolerance: float = DEFAULT_BENCH_TOLERANCE,
+) -> list[BenchRegression]:
+    """Groups whose relative cost or allocation peak grew past ``tolerance``."""
+    stored = baseline.get("groups", {})
+    regressions = []
+    for group in groups:
+        previous = stored.get(group.key)
+        if previous is None:
+            continue
+        for metric in ("relative_cost", "alloc_peak_bytes"):
+            old = float(previous.get(metric) or 0.0)
+            new = float(getattr(group, metric))
+            if old > 0 and new > old * (1.0 + tolerance):
+                regressions.append(BenchRegression(key=group.key, metric=metric, baseline=old, current=new))
+    return regressions
+
+
+def confirm_bench(
+    cases: Sequence[EvalCase],
+    groups: Sequence[BenchGroup],
+    baseline: dict,
+    repeat: int,
+    tolerance: float = DEFAULT_BENCH_TOLERANCE,
+    *,
+    runs: int = BENCH_CONFIRM_RUNS,
+    pipeline: DictationPipeline | None = None,
+    calibration: float | None = None,
+) -> list[BenchGroup]:
+    """Re-run groups that look regressed and keep each metric's best run.
+
+    Most groups hold one to three short cases, so a single scheduling hiccup can
+    push one past the tolerance; a real regression stays slow on every re-run.
+    """
+    merged = {group.key: group for group in groups}
+    for _run in range(max(0, runs)):
+        suspects = {regression.key for regression in compare_bench(list(merged.values()), baseline, tolerance)}
+        if not suspects:
+            break
+        retry = [case for case in cases if f"{case.mode}/{case.profile}" in suspects]
+        for group in run_bench(retry, repeat, pipeline, calibration=calibration):
+            best = merged[group.key]
+            merged[group.key] = replace(
+                best,
+                ns_per_char=min(best.ns_per_char, group.ns_per_char),
+                relative_cost=min(best.relative_cost, group.relative_cost),
+                alloc_peak_bytes=min(best.alloc_peak_bytes, group.alloc_peak_bytes),
+            )
+    return [merged[group.key] for group in groups]
+
+
+def print_bench(groups: Sequence[BenchGroup], regressions: Sequence[BenchRegression] = ()) -> None:
+    for group in groups:
+        sys.stdout.write(
+            f"{group.key:<24} {group.ns_per_char:8.1f} ns/char  x{group.relative_cost:<7.2f} "
+            f"{group.alloc_peak_bytes / 1024:7.1f} KiB/dictation  ({group.cases} cases)\n"
+        )
+    for regression in regressions:
+        sys.stdout.write(
+            f"REGRESSION {regression.key} {regression.metric}: "
+            f"{regression.baseline:g} -> {regression.current:g} ({regression.ratio:.2f}x)\n"
+        )
 
 
 def print_result(result: EvalResult) -> None:
@@ -120,12 +458,152 @@ def main(argv: Sequence[str] | None = None) -> int:
         default=DEFAULT_MIN_PASS_RATE,
         help="Minimum pass rate percentage required for exit code 0.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes to shard the corpus across; 0 uses every CPU.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Cases per shard sent to a worker.",
+    )
+    parser.add_argument(
+        "--timings",
+        help="Write a per-case timing TSV (id, mode, profile, chars, passed, ms) to this path.",
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="N",
+        help="Benchmark cleanup speed instead: run every case N times per round.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BENCH_BASELINE_PATH),
+        help="Benchmark baseline JSON to compare against.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_BENCH_TOLERANCE,
+        help="Allowed fractional slowdown over the baseline before exiting non-zero.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the benchmark results to --baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--audio",
+        metavar="MANIFEST",
+        help="Run the audio WER eval over a JSONL manifest of WAV files and reference text instead.",
+    )
+    parser.add_argument(
+        "--matrix",
+        help="WhisperEngineConfig overrides for --audio: inline JSON or a JSON file, "
+        'e.g. \'{"model_size": ["tiny", "base"], "beam_size": [1, 5]}\'.',
+    )
+    parser.add_argument(
+        "--max-wer",
+        type=float,
+        help="Accuracy bar for --audio (fraction, e.g. 0.1); exits 1 if no config meets it.",
+    )
+    parser.add_argument(
+        "--json",
+        help="Write the --audio results to this JSON file.",
+    )
     args = parser.parse_args(argv)
 
-    result = run_eval(load_eval_corpus(args.corpus))
+    if args.audio is not None:
+        return run_audio_command(args)
+    if args.bench is not None:
+        return run_bench_command(args)
+
+    result = run_eval_command(args)
     print_result(result)
     return 0 if result.pass_rate >= args.min_pass_rate else 1
 
 
+def run_eval_command(args: argparse.Namespace) -> EvalResult:
+    chunks = iter_eval_chunks(
+        iter_eval_corpus(args.corpus),
+        workers=resolve_workers(args.workers),
+        chunk_size=args.chunk_size,
+        record_timings=bool(args.timings),
+    )
+    if not args.timings:
+        return merge_results(chunks)
+
+    def written(handle) -> Iterator[EvalResult]:
+        write_timings(handle, (), header=True)
+        for chunk in chunks:
+            write_timings(handle, chunk.timings)
+            yield chunk
+
+    with open(args.timings, "w", encoding="utf-8", newline="") as handle:
+        return merge_results(written(handle), keep_timings=False)
+
+
+def run_bench_command(args: argparse.Namespace) -> int:
+    cases = list(load_eval_corpus(args.corpus))
+    groups = run_bench(cases, args.bench)
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(bench_baseline_payload(groups), indent=2) + "\n", encoding="utf-8")
+        print_bench(groups)
+        sys.stdout.write(f"Baseline written to {baseline_path}\n")
+        return 0
+    if not baseline_path.exists():
+        print_bench(groups)
+        sys.stdout.write(f"No baseline at {baseline_path}; rerun with --update-baseline to create one.\n")
+        return 0
+    baseline = load_bench_baseline(baseline_path)
+    groups = confirm_bench(cases, groups, baseline, args.bench, args.tolerance)
+    regressions = compare_bench(groups, baseline, args.tolerance)
+    print_bench(groups, regressions)
+    return 1 if regressions else 0
+
+
+def _load_matrix(value: str) -> object:
+    """Inline JSON, or the path of a JSON file; long inline specs are not valid file names."""
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return json.loads(Path(value).read_text(encoding="utf-8"))
+
+
+def run_audio_command(args: argparse.Namespace) -> int:
+    from voicetray.audio_eval import (
+        expand_matrix,
+        load_audio_manifest,
+        pick_fastest,
+        print_audio_eval,
+        run_audio_eval,
+    )
+
+    spec: object = {}
+    if args.matrix:
+        spec = _load_matrix(args.matrix)
+    results = run_audio_eval(load_audio_manifest(args.audio), expand_matrix(spec))
+    chosen = pick_fastest(results, args.max_wer) if args.max_wer is not None else None
+    print_audio_eval(results, chosen)
+    if args.json:
+        payload = {
+            "results": [result.to_dict() for result in results],
+            "chosen": chosen.label if chosen else None,
+        }
+        Path(args.json).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    if args.max_wer is None:
+        return 0
+    if chosen is None:
+        sys.stdout.write(f"No config meets WER <= {args.max_wer * 100:.1f}%\n")
+        return 1
+    sys.stdout.write(f"Fastest config within WER <= {args.max_wer * 100:.1f}%: {chosen.label}\n")
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
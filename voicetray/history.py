@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import logging
+import math
 import os
+import queue
+import re
 import sqlite3
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 
+from .metrics import count, observe_stage
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class HistoryEntry:
@@ -17,6 +30,9 @@ class HistoryEntry:
     profile: str
     duration_seconds: float | None
     model: str
+    timings: Mapping[str, float] | None = None
+    audio_seconds: float | None = None
+    trimmed_seconds: float | None = None
 
 
 @dataclass(frozen=True)
@@ -32,86 +48,633 @@ class HistoryRow:
     model: str
 
 
+_INSERT_SQL = """
+    INSERT INTO dictations (
+        app_name,
+        raw_text,
+        cleaned_text,
+        mode,
+        profile,
+        duration_seconds,
+        model
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+TIMING_STAGES = ("record", "vad", "stt", "rules", "llm", "insert", "total")
+LATENCY_GROUPS = {"model": "d.model", "app": "d.app_name", "profile": "d.profile"}
+
+_INSERT_TIMINGS_SQL = """
+    INSERT INTO dictation_timings (
+        dictation_id,
+        record_s,
+        vad_s,
+        stt_s,
+        rules_s,
+        llm_s,
+        insert_s,
+        total_s,
+        audio_seconds,
+        trimmed_seconds
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_ROW_COLUMNS = """
+    id,
+    created_at,
+    app_name,
+    raw_text,
+    cleaned_text,
+    mode,
+    profile,
+    duration_seconds,
+    model
+"""
+
+# Ordered schema migrations; ``PRAGMA user_version`` records the last one applied.
+_MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (
+        1,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS dictations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+                app_name TEXT,
+                raw_text TEXT NOT NULL,
+                cleaned_text TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                duration_seconds REAL,
+                model TEXT NOT NULL
+            )
+            """,
+        ),
+    ),
+    (
+        2,
+        (
+            "CREATE INDEX IF NOT EXISTS idx_dictations_created_at ON dictations (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_dictations_app_name ON dictations (app_name, id)",
+            "CREATE INDEX IF NOT EXISTS idx_dictations_profile ON dictations (profile, id)",
+            "CREATE INDEX IF NOT EXISTS idx_dictations_mode ON dictations (mode, id)",
+            "CREATE INDEX IF NOT EXISTS idx_dictations_model ON dictations (model, id)",
+        ),
+    ),
+    (
+        3,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS dictation_timings (
+                dictation_id INTEGER PRIMARY KEY,
+                record_s REAL,
+                vad_s REAL,
+                stt_s REAL,
+                rules_s REAL,
+                llm_s REAL,
+                insert_s REAL,
+                total_s REAL,
+                audio_seconds REAL,
+                trimmed_seconds REAL
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS dictation_timings_delete AFTER DELETE ON dictations BEGIN
+                DELETE FROM dictation_timings WHERE dictation_id = old.id;
+            END
+            """,
+        ),
+    ),
+)
+
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+# Rank in the FTS table alone, then join rows and build snippets for the page only.
+_SEARCH_SQL = """
+    WITH page AS (
+        SELECT rowid AS id, bm25(dictations_fts, 1.0, 2.0, 0.5) AS rank
+        FROM dictations_fts
+        WHERE dictations_fts MATCH ?1
+        ORDER BY rank, rowid DESC
+        LIMIT ?2 OFFSET ?3
+    )
+    SELECT
+        d.id,
+        d.created_at,
+        d.app_name,
+        d.raw_text,
+        d.cleaned_text,
+        d.mode,
+        d.profile,
+        d.duration_seconds,
+        d.model,
+        page.rank,
+        snippet(dictations_fts, -1, '[', ']', '...', 12)
+    FROM page
+    JOIN dictations AS d ON d.id = page.id
+    JOIN dictations_fts ON dictations_fts.rowid = page.id
+    WHERE dictations_fts MATCH ?1
+    ORDER BY page.rank, page.id DESC
+"""
+
+_LIKE_SEARCH_SQL = """
+    SELECT
+        id,
+        created_at,
+        app_name,
+        raw_text,
+        cleaned_text,
+        mode,
+        profile,
+        duration_seconds,
+        model
+    FROM dictations
+    WHERE raw_text LIKE ? ESCAPE '\\' OR cleaned_text LIKE ? ESCAPE '\\' OR app_name LIKE ? ESCAPE '\\'
+    ORDER BY id DESC
+    LIMIT ? OFFSET ?
+"""
+
+_FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS dictations_fts USING fts5(
+        raw_text,
+        cleaned_text,
+        app_name,
+        content='dictations',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dictations_fts_insert AFTER INSERT ON dictations BEGIN
+        INSERT INTO dictations_fts(rowid, raw_text, cleaned_text, app_name)
+        VALUES (new.id, new.raw_text, new.cleaned_text, new.app_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dictations_fts_delete AFTER DELETE ON dictations BEGIN
+        INSERT INTO dictations_fts(dictations_fts, rowid, raw_text, cleaned_text, app_name)
+        VALUES ('delete', old.id, old.raw_text, old.cleaned_text, old.app_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dictations_fts_update AFTER UPDATE ON dictations BEGIN
+        INSERT INTO dictations_fts(dictations_fts, rowid, raw_text, cleaned_text, app_name)
+        VALUES ('delete', old.id, old.raw_text, old.cleaned_text, old.app_name);
+        INSERT INTO dictations_fts(rowid, raw_text, cleaned_text, app_name)
+        VALUES (new.id, new.raw_text, new.cleaned_text, new.app_name);
+    END
+    """,
+)
+
+_SEARCH_TOKEN_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    stage: str
+    group: str | None
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return float(sorted_values[min(rank, len(sorted_values)) - 1])
+
+
+@dataclass(frozen=True)
+class HistorySearchResult:
+    row: HistoryRow
+    rank: float
+    snippet: str
+
+
+def history_timestamp(value: datetime | str) -> str:
+    """Format a datetime the way ``created_at`` is stored (UTC, millisecond ISO)."""
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query that prefix-matches every word."""
+    return " ".join(f'"{token}"*' for token in _SEARCH_TOKEN_RE.findall(text or ""))
+
+
 def default_history_path(local_appdata: str | os.PathLike[str] | None = None) -> Path:
     base = Path(local_appdata) if local_appdata is not None else _default_local_appdata()
     return base / "VoiceTray" / "history.db"
 
 
 class DictationHistoryStore:
+    """History store holding one long-lived WAL connection per calling thread.
+
+    Each thread gets its own connection on first use and it is closed when that
+    thread exits, so one-off worker threads do not pile up open connections;
+    ``close`` shuts all of them down, and a later call simply reopens one.
+    """
+
     def __init__(self, db_path: str | os.PathLike[str] | None = None):
         self.db_path = Path(db_path) if db_path is not None else default_history_path()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.fts_enabled = False
         self._ensure_schema()
 
+    def __enter__(self) -> "DictationHistoryStore":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
     def append(self, entry: HistoryEntry) -> int:
-        with self._connect() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO dictations (
-                    app_name,
-                    raw_text,
-                    cleaned_text,
-                    mode,
-                    profile,
-                    duration_seconds,
-                    model
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    entry.app_name,
-                    entry.raw_text,
-                    entry.cleaned_text,
-                    entry.mode,
-                    entry.profile,
-                    entry.duration_seconds,
-                    entry.model,
-                ),
-            )
-            return int(cursor.lastrowid)
+        conn = self._connect()
+        with conn:
+            return _insert_entry(conn, entry)
+
+    def append_many(self, entries: Iterable[HistoryEntry]) -> list[int]:
+        """Insert ``entries`` in a single transaction and return their ids."""
+        conn = self._connect()
+        ids = []
+        with conn:
+            for entry in entries:
+                ids.append(_insert_entry(conn, entry))
+        return ids
 
     def list_recent(self, *, limit: int = 100) -> list[HistoryRow]:
-        with self._connect() as conn:
+        return self.query(limit=limit)
+
+    def query(
+        self,
+        *,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        app_name: str | None = None,
+        profile: str | None = None,
+        mode: str | None = None,
+        model: str | None = None,
+        before_id: int | None = None,
+        limit: int = 100,
+    ) -> list[HistoryRow]:
+        """Return matching rows newest first.
+
+        Pass the last row's id as ``before_id`` to fetch the next page; keyset
+        paging stays index-backed however deep the caller scrolls.
+        """
+        clauses = []
+        params: list[object] = []
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(history_timestamp(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(history_timestamp(until))
+        for column, value in (("app_name", app_name), ("profile", profile), ("mode", mode), ("model", model)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(int(before_id))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(int(limit))
+        rows = self._connect().execute(
+            f"SELECT {_ROW_COLUMNS} FROM dictations {where} ORDER BY id DESC LIMIT ?",
+            params,
+        ).fetchall()
+        return [HistoryRow(*row) for row in rows]
+
+    def latency_stats(
+        self,
+        *,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        group_by: str | None = None,
+        stages: Iterable[str] = TIMING_STAGES,
+    ) -> list[LatencyStats]:
+        """p50/p95/p99 per stage, optionally split by ``model``, ``app`` or ``profile``."""
+        if group_by is not None and group_by not in LATENCY_GROUPS:
+            raise ValueError(f"group_by must be one of {sorted(LATENCY_GROUPS)}")
+        clauses = []
+        params: list[object] = []
+        if since is not None:
+            clauses.append("d.created_at >= ?")
+            params.append(history_timestamp(since))
+        if until is not None:
+            clauses.append("d.created_at < ?")
+            params.append(history_timestamp(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        group_sql = LATENCY_GROUPS[group_by] if group_by else "NULL"
+        conn = self._connect()
+
+        results = []
+        for stage in stages:
+            if stage not in TIMING_STAGES:
+                raise ValueError(f"unknown timing stage: {stage}")
+            column = f"t.{stage}_s"
             rows = conn.execute(
-                """
-                SELECT
-                    id,
-                    created_at,
-                    app_name,
-                    raw_text,
-                    cleaned_text,
-                    mode,
-                    profile,
-                    duration_seconds,
-                    model
-                FROM dictations
-                ORDER BY id DESC
-                LIMIT ?
+                f"""
+                SELECT {group_sql}, {column}
+                FROM dictation_timings AS t
+                JOIN dictations AS d ON d.id = t.dictation_id
+                {where} {"AND" if where else "WHERE"} {column} IS NOT NULL
+                ORDER BY 1, 2
                 """,
-                (int(limit),),
+                params,
             ).fetchall()
-        return [HistoryRow(*row) for row in rows]
+            grouped: dict[str | None, list[float]] = {}
+            for group, value in rows:
+                grouped.setdefault(group, []).append(float(value))
+            for group, values in grouped.items():
+                results.append(
+                    LatencyStats(
+                        stage=stage,
+                        group=group,
+                        count=len(values),
+                        p50=percentile(values, 50),
+                        p95=percentile(values, 95),
+                        p99=percentile(values, 99),
+                    )
+                )
+        return results
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's pooled connection (for maintenance jobs)."""
+        return self._connect()
+
+    def schema_version(self) -> int:
+        return int(self._connect().execute("PRAGMA user_version").fetchone()[0])
+
+    def search(self, query: str, *, limit: int = 50, offset: int = 0) -> list[HistorySearchResult]:
+        """Full-text search over raw/cleaned text and app name, best matches first."""
+        match = fts_query(query)
+        if not match:
+            return []
+        conn = self._connect()
+        if self.fts_enabled:
+            rows = conn.execute(_SEARCH_SQL, (match, int(limit), int(offset))).fetchall()
+            return [
+                HistorySearchResult(row=HistoryRow(*row[:9]), rank=float(row[9]), snippet=row[10])
+                for row in rows
+            ]
+
+        pattern = "%" + re.sub(r"([%_\\])", r"\\\1", query.strip()) + "%"
+        rows = conn.execute(
+            _LIKE_SEARCH_SQL, (pattern, pattern, pattern, int(limit), int(offset))
+        ).fetchall()
+        return [HistorySearchResult(row=HistoryRow(*row), rank=0.0, snippet=row[4]) for row in rows]
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            local, self._local = self._local, threading.local()
+        # Dropping the old locals runs their finalizers, which take the lock.
+        del local
+        for conn in connections:
+            conn.close()
 
     def _ensure_schema(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS dictations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
-                    app_name TEXT,
-                    raw_text TEXT NOT NULL,
-                    cleaned_text TEXT NOT NULL,
-                    mode TEXT NOT NULL,
-                    profile TEXT NOT NULL,
-                    duration_seconds REAL,
-                    model TEXT NOT NULL
-                )
-                """
-            )
+        conn = self._connect()
+        current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+        for version, statements in _MIGRATIONS:
+            if version <= current:
+                continue
+            with conn:
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+        self.fts_enabled = self._ensure_fts(conn)
+
+    def _ensure_fts(self, conn: sqlite3.Connection) -> bool:
+        try:
+            with conn:
+                existed = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'dictations_fts'"
+                ).fetchone()
+                for statement in _FTS_SCHEMA:
+                    conn.execute(statement)
+                if not existed:
+                    conn.execute("INSERT INTO dictations_fts(dictations_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            logger.warning("SQLite FTS5 unavailable; history search falls back to LIKE", exc_info=True)
+            return False
+        return True
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            return held.conn
+        # Only the owning thread uses the connection; close() may run elsewhere.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Only takes effect on a brand-new file, before WAL writes the header;
+        # lets maintenance use incremental vacuum without a full rewrite.
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        held = _ThreadConnection(conn)
+        # A thread's locals are freed when it exits, which closes its connection.
+        weakref.finalize(held, _release_connection, conn, self._connections, self._connections_lock)
+        self._local.held = held
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+
+class _ThreadConnection:
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_connection(
+    conn: sqlite3.Connection, connections: list[sqlite3.Connection], lock: threading.Lock
+) -> None:
+    with lock:
+        if conn in connections:
+            connections.remove(conn)
+    conn.close()
+
+
+_STOP = object()
+
+
+class HistoryWriter:
+    """Write-behind queue that batches history appends off the dictation path.
+
+    Entries are grouped into one transaction per ``flush_interval`` (or per
+    ``max_batch`` entries); ``close`` drains the queue before returning.
+    """
+
+    def __init__(
+        self,
+        store: DictationHistoryStore,
+        *,
+        flush_interval: float = 0.5,
+        max_batch: int = 64,
+        busy_retry_seconds: float = 60.0,
+        busy_backoff_seconds: float = 0.1,
+    ):
+        self.store = store
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.max_batch = max(1, int(max_batch))
+        self.busy_retry_seconds = max(0.0, float(busy_retry_seconds))
+        self.busy_backoff_seconds = max(0.0, float(busy_backoff_seconds))
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, entry: HistoryEntry) -> None:
+        self._ensure_started()
+        self._queue.put(entry)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything submitted so far is written."""
+        if self._thread is None:
+            return True
+        written = threading.Event()
+        self._queue.put(written)
+        return written.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("History writer did not finish within %.1fs", timeout)
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="voicetray-history-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: list[HistoryEntry] = []
+            waiters: list[threading.Event] = []
+            stop = self._collect(self._queue.get(), batch, waiters)
+            deadline = time.monotonic() + self.flush_interval
+            while not stop and not waiters and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                stop = self._collect(item, batch, waiters)
+            if stop:
+                # Pick up anything queued behind the stop marker by a racing submit.
+                while True:
+                    try:
+                        self._collect(self._queue.get_nowait(), batch, waiters)
+                    except queue.Empty:
+                        break
+            self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    @staticmethod
+    def _collect(item, batch: list[HistoryEntry], waiters: list[threading.Event]) -> bool:
+        if item is _STOP:
+            return True
+        if isinstance(item, threading.Event):
+            waiters.append(item)
+        else:
+            batch.append(item)
+        return False
+
+    def _write(self, batch: list[HistoryEntry]) -> None:
+        if not batch:
+            return
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.busy_retry_seconds
+        delay = self.busy_backoff_seconds
+        while True:
+            try:
+                self.store.append_many(batch)
+                break
+            except sqlite3.OperationalError as exc:
+                # Another connection (e.g. maintenance) holds the write lock;
+                # the batch was rolled back, so it can be written again.
+                if _is_busy(exc) and time.monotonic() + delay < deadline:
+                    count("voicetray_history_write_retries_total", "History batches retried after SQLITE_BUSY")
+                    logger.warning("History database busy; retrying %s entries in %.2fs", len(batch), delay)
+                    time.sleep(delay)
+                    delay = min(delay * 2, 5.0)
+                    continue
+                self._lose(batch)
+                return
+            except Exception:
+                self._lose(batch)
+                return
+        observe_stage("history_write", time.perf_counter() - started)
+        count("voicetray_history_entries_written_total", "History entries written", len(batch))
+
+    @staticmethod
+    def _lose(batch: list[HistoryEntry]) -> None:
+        count("voicetray_history_write_failures_total", "History entries lost to failed writes", len(batch))
+        logger.exception("Could not write %s dictation history entries", len(batch))
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+def _insert_entry(conn: sqlite3.Connection, entry: HistoryEntry) -> int:
+    entry_id = int(conn.execute(_INSERT_SQL, _entry_params(entry)).lastrowid)
+    if entry.timings or entry.audio_seconds is not None or entry.trimmed_seconds is not None:
+        timings = entry.timings or {}
+        conn.execute(
+            _INSERT_TIMINGS_SQL,
+            (
+                entry_id,
+                *(_optional_float(timings.get(stage)) for stage in TIMING_STAGES),
+                _optional_float(entry.audio_seconds),
+                _optional_float(entry.trimmed_seconds),
+            ),
+        )
+    return entry_id
+
+
+def _optional_float(value) -> float | None:
+    return None if value is None else float(value)
+
+
+def _entry_params(entry: HistoryEntry) -> tuple:
+    return (
+        entry.app_name,
+        entry.raw_text,
+        entry.cleaned_text,
+        entry.mode,
+        entry.profile,
+        entry.duration_seconds,
+        entry.model,
+    )
 
 
 def _default_local_appdata() -> Path:
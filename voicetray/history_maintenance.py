@@ -0,0 +1,265 @@
+"""Retention, archival, and compaction for the dictation history database."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .history import DictationHistoryStore, HistoryRow, history_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Rough per-row overhead on top of the text columns when estimating size.
+_ROW_OVERHEAD_BYTES = 64
+# Larger pre-existing databases are only fully vacuumed with ``history.full_vacuum``.
+SMALL_DB_BYTES = 8 * 1024 * 1024
+_ROW_BYTES_SQL = (
+    "length(CAST(raw_text AS BLOB)) + length(CAST(cleaned_text AS BLOB))"
+    f" + coalesce(length(CAST(app_name AS BLOB)), 0) + {_ROW_OVERHEAD_BYTES}"
+)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits applied by maintenance; ``0`` disables a limit."""
+
+    max_rows: int = 0
+    max_age_days: int = 0
+    max_bytes: int = 0
+    archive: bool = True
+    interval_seconds: float = 6 * 60 * 60
+    batch_size: int = 500
+    # Allow the one-time full VACUUM that converts a pre-existing database to
+    # incremental vacuum even when it is larger than ``SMALL_DB_BYTES``.
+    full_vacuum: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit > 0 for limit in (self.max_rows, self.max_age_days, self.max_bytes))
+
+    @classmethod
+    def from_app_config(cls, config: dict[str, Any]) -> "RetentionPolicy":
+        history = config.get("history", {}) if isinstance(config, dict) else {}
+        return cls(
+            max_rows=max(0, int(history.get("retention_max_rows", 0))),
+            max_age_days=max(0, int(history.get("retention_max_age_days", 0))),
+            max_bytes=max(0, int(history.get("retention_max_mb", 0))) * 1024 * 1024,
+            archive=bool(history.get("archive", True)),
+            interval_seconds=max(1, int(history.get("maintenance_interval_minutes", 360))) * 60.0,
+            full_vacuum=bool(history.get("full_vacuum", False)),
+        )
+
+
+@dataclass(frozen=True)
+class MaintenanceResult:
+    archived: int
+    deleted: int
+    freed_pages: int
+
+
+def default_archive_dir(db_path: str | Path) -> Path:
+    return Path(db_path).parent / "history-archive"
+
+
+def archive_rows(rows: list[HistoryRow], archive_dir: str | Path) -> int:
+    """Append rows to gzip JSONL files named by the month they were dictated in."""
+    by_month: dict[str, list[HistoryRow]] = {}
+    for row in rows:
+        by_month.setdefault(row.created_at[:7] or "unknown", []).append(row)
+
+    target = Path(archive_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    for month, month_rows in by_month.items():
+        # Appending adds a gzip member; readers see one continuous stream.
+        with gzip.open(target / f"history-{month}.jsonl.gz", "at", encoding="utf-8") as f:
+            for row in month_rows:
+                f.write(json.dumps(asdict(row), ensure_ascii=False) + "\n")
+    return len(rows)
+
+
+def apply_retention(
+    store: DictationHistoryStore,
+    policy: RetentionPolicy,
+    *,
+    archive_dir: str | Path | None = None,
+    now: datetime | None = None,
+    is_idle: Callable[[], bool] = lambda: True,
+) -> tuple[int, int]:
+    """Archive then delete rows outside ``policy`` in batches; returns ``(archived, deleted)``.
+
+    Stops between batches once ``is_idle`` turns false; the next run continues.
+    """
+    if not policy.enabled:
+        return 0, 0
+
+    conn = store.connection()
+    max_id = _cutoff_id(conn, policy)
+    age_cutoff = None
+    if policy.max_age_days > 0:
+        age_cutoff = history_timestamp((now or datetime.now(timezone.utc)) - timedelta(days=policy.max_age_days))
+    if max_id is None and age_cutoff is None:
+        return 0, 0
+
+    archive_target = Path(archive_dir) if archive_dir is not None else default_archive_dir(store.db_path)
+    archived = deleted = 0
+    while is_idle():
+        rows = [
+            HistoryRow(*row)
+            for row in conn.execute(
+                """
+                SELECT id, created_at, app_name, raw_text, cleaned_text, mode, profile, duration_seconds, model
+                FROM dictations
+                WHERE id <= ? OR created_at < ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (max_id if max_id is not None else -1, age_cutoff or "", int(policy.batch_size)),
+            )
+        ]
+        if not rows:
+            break
+        if policy.archive:
+            archived += archive_rows(rows, archive_target)
+        with conn:
+            conn.executemany("DELETE FROM dictations WHERE id = ?", [(row.id,) for row in rows])
+        deleted += len(rows)
+
+    if deleted:
+        logger.info("History retention archived %s and deleted %s dictations", archived, deleted)
+    return archived, deleted
+
+
+def _cutoff_id(conn, policy: RetentionPolicy) -> int | None:
+    """Highest id that must go to satisfy the row and size limits."""
+    cutoffs = []
+    if policy.max_rows > 0:
+        row = conn.execute(
+            "SELECT id FROM dictations ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (int(policy.max_rows),),
+        ).fetchone()
+        if row is not None:
+            cutoffs.append(int(row[0]))
+    if policy.max_bytes > 0:
+        total = int(conn.execute(f"SELECT coalesce(sum({_ROW_BYTES_SQL}), 0) FROM dictations").fetchone()[0])
+        excess = total - policy.max_bytes
+        if excess > 0:
+            freed = 0
+            for row_id, size in conn.execute(f"SELECT id, {_ROW_BYTES_SQL} FROM dictations ORDER BY id"):
+                freed += int(size)
+                if freed >= excess:
+                    cutoffs.append(int(row_id))
+                    break
+    return max(cutoffs) if cutoffs else None
+
+
+def compact(
+    store: DictationHistoryStore,
+    *,
+    max_pages: int | None = None,
+    full_vacuum: bool = False,
+    is_idle: Callable[[], bool] = lambda: True,
+) -> int:
+    """Return free pages to the filesystem and refresh planner statistics."""
+    conn = store.connection()
+    freelist = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+    if store.fts_enabled and freelist:
+        with conn:
+            conn.execute("INSERT INTO dictations_fts(dictations_fts) VALUES ('optimize')")
+    auto_vacuum = int(conn.execute("PRAGMA auto_vacuum").fetchone()[0])
+    if auto_vacuum != 2:
+        # Databases created before incremental vacuum need one full VACUUM to
+        # switch. It holds the write lock for the whole rewrite, so it only runs
+        # unprompted on small databases, and never once a dictation has started.
+        page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+        size = page_size * int(conn.execute("PRAGMA page_count").fetchone()[0])
+        if (full_vacuum or size <= SMALL_DB_BYTES) and is_idle():
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            logger.info("Skipping full VACUUM of %s byte history database; set history.full_vacuum to run it", size)
+    else:
+        # sqlite3's execute() steps this pragma only once (one page); a script runs it to completion.
+        pages = f"({int(max_pages)})" if max_pages else ""
+        conn.executescript(f"PRAGMA incremental_vacuum{pages};")
+    conn.execute("PRAGMA optimize")
+    return freelist
+
+
+def run_maintenance(
+    store: DictationHistoryStore,
+    policy: RetentionPolicy,
+    *,
+    archive_dir: str | Path | None = None,
+    now: datetime | None = None,
+    is_idle: Callable[[], bool] = lambda: True,
+) -> MaintenanceResult:
+    """Apply ``policy`` and compact; does nothing while no retention limit is set."""
+    if not policy.enabled:
+        return MaintenanceResult(archived=0, deleted=0, freed_pages=0)
+    archived, deleted = apply_retention(store, policy, archive_dir=archive_dir, now=now, is_idle=is_idle)
+    freed_pages = compact(store, full_vacuum=policy.full_vacuum, is_idle=is_idle) if is_idle() else 0
+    return MaintenanceResult(archived=archived, deleted=deleted, freed_pages=freed_pages)
+
+
+class HistoryMaintenance:
+    """Background job that runs :func:`run_maintenance` while the app is idle."""
+
+    IDLE_RETRY_SECONDS = 30.0
+
+    def __init__(
+        self,
+        store: DictationHistoryStore,
+        policy: RetentionPolicy | None = None,
+        *,
+        is_idle: Callable[[], bool] = lambda: True,
+        archive_dir: str | Path | None = None,
+        initial_delay: float = 60.0,
+    ):
+        self.store = store
+        self.policy = policy or RetentionPolicy()
+        self.is_idle = is_idle
+        self.archive_dir = archive_dir
+        self.initial_delay = max(0.0, float(initial_delay))
+        self.last_result: MaintenanceResult | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="voicetray-history-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def run_once(self) -> MaintenanceResult | None:
+        try:
+            self.last_result = run_maintenance(
+                self.store, self.policy, archive_dir=self.archive_dir, is_idle=self.is_idle
+            )
+        except Exception:
+            logger.exception("History maintenance failed")
+            return None
+        return self.last_result
+
+    def _run(self) -> None:
+        if self._stop.wait(self.initial_delay):
+            return
+        while not self._stop.is_set():
+            if not self.is_idle():
+                self._stop.wait(self.IDLE_RETRY_SECONDS)
+                continue
+            self.run_once()
+            self._stop.wait(self.policy.interval_seconds)
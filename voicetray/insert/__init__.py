@@ -1,5 +1,5 @@
 """Text insertion package."""
 
-from .inserter import Inserter, InsertionResult
+from .inserter import Inserter, InsertionResult, PreparedInsertion
 
-__all__ = ["Inserter", "InsertionResult"]
+__all__ = ["Inserter", "InsertionResult", "PreparedInsertion"]
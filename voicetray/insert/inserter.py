@@ -8,6 +8,9 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
+from voicetray.metrics import count, observe_stage
+from voicetray.tracing import span
+
 logger = logging.getLogger(__name__)
 
 FocusProvider = Callable[[], Any]
@@ -21,6 +24,16 @@ class InsertionResult:
     reason: str = ""
 
 
+@dataclass
+class PreparedInsertion:
+    text: str
+    method: str
+    start_focus: Any | None = None
+    previous_clipboard: str | None = None
+    staged: bool = False
+    skipped: InsertionResult | None = None
+
+
 class Inserter:
     """Insert text with clipboard paste by default and per-app typing fallback."""
 
@@ -50,34 +63,125 @@ class Inserter:
         start_focus: Any | None = None,
         app_title: str | None = None,
     ) -> InsertionResult:
+        prepared = self.prepare_insertion(text, start_focus=start_focus, app_title=app_title)
+        # Staging just compared focus against ``start_focus``; nothing waits in
+        # between, so asking the focus provider again would only add latency.
+        return self._commit_measured(prepared, None, recheck_focus=False)
+
+    def commit_insertion(self, prepared: PreparedInsertion, text: str | None = None) -> InsertionResult:
+        """Insert staged text, optionally swapping in replacement text first.
+
+        Focus is checked again against the window captured at staging; if it
+        moved while the insert was staged, the clipboard is restored and
+        nothing is pasted or typed.
+        """
+
+        return self._commit_measured(prepared, text, recheck_focus=True)
+
+    def _commit_measured(
+        self,
+        prepared: PreparedInsertion,
+        text: str | None,
+        *,
+        recheck_focus: bool,
+    ) -> InsertionResult:
+        started = time.perf_counter()
+        with span("insert", method=prepared.method) as insert_span:
+            result = self._commit(prepared, text, recheck_focus)
+            insert_span.set(status=result.status)
+        observe_stage("insert", time.perf_counter() - started, method=result.method)
+        count("voicetray_insertions_total", "Insertion attempts by outcome", status=result.status, method=result.method)
+        return result
+
+    def prepare_insertion(
+        self,
+        text: str,
+        *,
+        start_focus: Any | None = None,
+        app_title: str | None = None,
+    ) -> PreparedInsertion:
+        """Check focus and stage the clipboard so a later commit only has to paste."""
+
+        with span("insert_prepare"):
+            return self._prepare(text, start_focus, app_title)
+
+    def _prepare(self, text: str, start_focus: Any | None, app_title: str | None) -> PreparedInsertion:
         if not text:
+            return PreparedInsertion(
+                text=text,
+                method="none",
+                start_focus=start_focus,
+                skipped=InsertionResult(status="skipped_empty", method="none", reason="empty_text"),
+            )
+
+        if self._focus_changed(start_focus):
+            return PreparedInsertion(
+                text=text,
+                method="none",
+                start_focus=start_focus,
+                skipped=InsertionResult(
+                    status="skipped_focus_changed",
+                    method="none",
+                    reason="focus_changed",
+                ),
+            )
+
+        method = self._method_for_app(app_title)
+        prepared = PreparedInsertion(text=text, method=method, start_focus=start_focus)
+        if method == "paste":
+            prepared.previous_clipboard = self.clipboard.paste()
+            try:
+                self.clipboard.copy(text)
+                prepared.staged = True
+                self.sleep(self.restore_delay)
+            except BaseException:
+                self.discard_insertion(prepared)
+                raise
+        return prepared
+
+    def _commit(self, prepared: PreparedInsertion, text: str | None, recheck_focus: bool) -> InsertionResult:
+        if prepared.skipped is not None:
+            return prepared.skipped
+        final_text = prepared.text if text is None else text
+        if not final_text:
+            self.discard_insertion(prepared)
             return InsertionResult(status="skipped_empty", method="none", reason="empty_text")
 
-        current_focus = self.focus_provider() if self.focus_provider is not None else None
-        if start_focus is not None and current_focus is not None and current_focus != start_focus:
+        if recheck_focus and self._focus_changed(prepared.start_focus):
+            self.discard_insertion(prepared)
             return InsertionResult(
                 status="skipped_focus_changed",
                 method="none",
                 reason="focus_changed",
             )
 
-        method = self._method_for_app(app_title)
-        if method == "typing":
-            self.keyboard.write(text)
+        if prepared.method == "typing":
+            self.keyboard.write(final_text)
             return InsertionResult(status="inserted", method="typing")
 
-        self._paste_with_restore(text)
-        return InsertionResult(status="inserted", method="paste")
-
-    def _paste_with_restore(self, text: str) -> None:
-        previous = self.clipboard.paste()
         try:
-            self.clipboard.copy(text)
-            self.sleep(self.restore_delay)
+            if final_text != prepared.text:
+                self.clipboard.copy(final_text)
+                self.sleep(self.restore_delay)
             self.keyboard.send(self.paste_hotkey)
             self.sleep(self.restore_delay)
         finally:
-            self.clipboard.copy(previous)
+            self.discard_insertion(prepared)
+        return InsertionResult(status="inserted", method="paste")
+
+    def discard_insertion(self, prepared: PreparedInsertion) -> None:
+        """Restore the clipboard captured by ``prepare_insertion`` if it was staged."""
+
+        if not prepared.staged:
+            return
+        prepared.staged = False
+        self.clipboard.copy(prepared.previous_clipboard)
+
+    def _focus_changed(self, start_focus: Any | None) -> bool:
+        if start_focus is None or self.focus_provider is None:
+            return False
+        current_focus = self.focus_provider()
+        return current_focus is not None and current_focus != start_focus
 
     def _method_for_app(self, app_title: str | None) -> str:
         if not app_title:
@@ -7,15 +7,21 @@ import os
 import atexit
 import json
 import re
-from difflib import SequenceMatcher
 
 from voicetray.audio.recorder import AudioRecorder, NoInputDeviceError
 from voicetray.config import load_config
 from voicetray.dictation import DictationConfig, DictationContext, DictationPipeline
+from voicetray.dictation.dedup import NearDuplicateIndex
+from voicetray.dictation.snippets import SnippetExpander
+from voicetray.dictation.gate import LLMGateConfig
 from voicetray.dictation.llm_local import LocalLLMConfig
-from voicetray.history import DictationHistoryStore, HistoryEntry
+from voicetray.history import DictationHistoryStore, HistoryEntry, HistoryWriter
+from voicetray.history_maintenance import HistoryMaintenance, RetentionPolicy
 from voicetray.hotkeys import HotkeyConfig, HotkeyController
 from voicetray.insert.inserter import Inserter
+from voicetray.metrics import MetricsServer, observe_stage
+from voicetray.profiling import DictationProfiler, ProfilingConfig
+from voicetray.tracing import Trace, TraceLog, activate, current_trace, span
 from voicetray.stt.whisper_engine import WhisperEngine, WhisperEngineConfig
 
 logger = logging.getLogger(__name__)
@@ -60,9 +66,11 @@ class VoiceTrayApp:
         self.stt_engine = None
         self.stt_config = WhisperEngineConfig()
         
-        # Store recent text for repetition detection
-        self.recent_texts = []
+        # Recent output index for repetition detection
         self.max_recent_texts = 5
+        self.dedup_history_rows = 0
+        self.recent_text_index = None
+        self.history_text_index = None
         
         # Load settings from file
         self.load_settings()
@@ -76,6 +84,11 @@ class VoiceTrayApp:
         self.load_app_profiles()
         self.init_inserter()
         self.init_history_store()
+        self.init_history_maintenance()
+        self.init_metrics_endpoint()
+        self.init_trace_log()
+        self.init_profiler()
+        self.init_dedup_index()
         self.init_dictation_pipeline()
         self.init_speech_engine()
         self.init_hotkey_controller()
@@ -133,14 +146,47 @@ class VoiceTrayApp:
     
     def check_similarity_with_recent(self, text):
         """Check if text is too similar to recently processed text"""
-        if not text or not self.recent_texts:
+        if not text:
             return False
-        
-        for recent_text in self.recent_texts:
-            similarity = SequenceMatcher(None, text.lower(), recent_text.lower()).ratio()
-            if similarity > 0.8:  # 80% similarity threshold
+        for index in (self._recent_index(), getattr(self, 'history_text_index', None)):
+            if index is not None and index.is_near_duplicate(text):
                 return True
         return False
+
+    def remember_processed_text(self, text):
+        """Index processed output so later near-duplicates can be skipped."""
+        self._recent_index().add(text)
+        history_index = getattr(self, 'history_text_index', None)
+        if history_index is not None:
+            history_index.add(text)
+
+    def init_dedup_index(self):
+        self.recent_text_index = NearDuplicateIndex(window=max(1, int(self.max_recent_texts)))
+        self.history_text_index = None
+        rows = int(getattr(self, 'dedup_history_rows', 0) or 0)
+        if rows <= 0 or getattr(self, 'history_store', None) is None:
+            return
+        self.history_text_index = NearDuplicateIndex(window=rows)
+        threading.Thread(
+            target=self.index_history_texts,
+            args=(self.history_text_index, rows),
+            daemon=True,
+        ).start()
+
+    def index_history_texts(self, index, rows):
+        try:
+            entries = self.history_store.list_recent(limit=rows)
+            added = index.add_many(row.cleaned_text for row in reversed(entries))
+            logger.info("Indexed %s history dictations for duplicate detection", added)
+        except Exception:
+            logger.exception("Could not index dictation history for duplicate detection")
+
+    def _recent_index(self):
+        if getattr(self, 'recent_text_index', None) is None:
+            self.recent_text_index = NearDuplicateIndex(
+                window=max(1, int(getattr(self, 'max_recent_texts', 5)))
+            )
+        return self.recent_text_index
     
     def basic_grammar_check(self, text):
         """Apply basic grammar corrections"""
@@ -204,12 +250,54 @@ class VoiceTrayApp:
         final_text = self.expand_snippets(final_text)
         
         # Store in recent texts for future comparison
-        self.recent_texts.append(final_text)
-        if len(self.recent_texts) > self.max_recent_texts:
-            self.recent_texts.pop(0)
+        self.remember_processed_text(final_text)
         
         return final_text
     
+    def process_text_speculative(self, raw_text, context, timings=None):
+        """Stage rule-cleaned text for insertion while the LLM pass runs.
+
+        Returns ``(final_text, prepared)``; the caller must commit or discard
+        ``prepared``.
+        """
+        if not raw_text:
+            return None, None
+        if self.check_similarity_with_recent(raw_text):
+            logger.info("Skipping similar text to avoid repetition")
+            return None, None
+
+        cleanup = self.dictation_pipeline.begin_transcript(raw_text, context)
+        staged_text = self.expand_snippets(cleanup.rule_text)
+        prepared = self.inserter.prepare_insertion(
+            staged_text,
+            start_focus=getattr(self, 'recording_focus_token', None),
+            app_title=getattr(context, 'app_title', None) or self.get_active_window_title(),
+        )
+        try:
+            wait_started = self._performance_now()
+            llm_text = cleanup.wait(float(getattr(self, 'llm_speculative_grace_seconds', 0.25)))
+            llm_wait = self._elapsed_since(wait_started)
+            if cleanup.pending:
+                logger.info("Speculative LLM cleanup missed the grace window; inserting rule output")
+            final_text = self.expand_snippets(llm_text) if llm_text else staged_text
+        except BaseException:
+            self.inserter.discard_insertion(prepared)
+            raise
+
+        self._merge_component_timings(timings, getattr(self.dictation_pipeline, 'last_timings', None))
+        if timings is not None:
+            # Only the time spent blocked on the LLM is on the critical path here.
+            timings["llm"] = llm_wait
+        self.remember_processed_text(final_text)
+        return final_text, prepared
+
+    def use_speculative_llm(self):
+        return (
+            bool(getattr(self, 'llm_speculative', False))
+            and hasattr(getattr(self, 'dictation_pipeline', None), 'begin_transcript')
+            and hasattr(getattr(self, 'inserter', None), 'prepare_insertion')
+        )
+
     def resolve_project_path(self, value):
         if not value or os.path.isabs(value):
             return value
@@ -225,6 +313,7 @@ class VoiceTrayApp:
             recording = cfg.get('recording', {})
             dictation = cfg.get('dictation', {})
             llm = cfg.get('llm', {})
+            metrics = cfg.get('metrics', {})
 
             self.hotkey = hotkey_cfg.record_hotkey
             self.alternate_hotkey = hotkey_cfg.alternate_record_hotkey
@@ -243,6 +332,8 @@ class VoiceTrayApp:
             self.app_profiles_path = self.resolve_project_path(
                 str(dictation.get('app_profiles_path', 'app_profiles.json'))
             )
+            self.max_recent_texts = max(1, int(dictation.get('dedup_window', 5)))
+            self.dedup_history_rows = max(0, int(dictation.get('dedup_history_rows', 0)))
 
             self.llm_enabled = bool(llm.get('enabled', False))
             self.llm_model_path = self.resolve_project_path(
@@ -254,7 +345,15 @@ class VoiceTrayApp:
             self.llm_top_p = float(llm.get('top_p', 0.9))
             self.llm_threads = llm.get('threads')
             self.llm_gpu_layers = llm.get('gpu_layers')
+            self.llm_gate_enabled = bool(llm.get('gate_enabled', True))
+            self.llm_speculative = bool(llm.get('speculative', False))
+            self.llm_speculative_grace_seconds = max(0, int(llm.get('speculative_grace_ms', 250))) / 1000.0
             self.stt_config = WhisperEngineConfig.from_app_config(cfg)
+            self.history_retention = RetentionPolicy.from_app_config(cfg)
+            self.profiling_config = ProfilingConfig.from_app_config(cfg)
+            self.metrics_endpoint_enabled = bool(metrics.get('endpoint_enabled', False))
+            self.metrics_port = int(metrics.get('port', 9765))
+            self.trace_slow_seconds = max(0, int(cfg.get('tracing', {}).get('slow_dictation_ms', 3000))) / 1000.0
 
             logger.info(
                 "Settings loaded: speech_hotkey=%s, save_hotkey=%s",
@@ -274,6 +373,8 @@ class VoiceTrayApp:
             self.recording_warning_seconds = 540
             self.glossary_path = self.resolve_project_path('glossary.json')
             self.app_profiles_path = self.resolve_project_path('app_profiles.json')
+            self.max_recent_texts = 5
+            self.dedup_history_rows = 0
             self.llm_enabled = False
             self.llm_model_path = self.resolve_project_path('models/llm/model.gguf')
             self.llm_n_ctx = 2048
@@ -282,7 +383,15 @@ class VoiceTrayApp:
             self.llm_top_p = 0.9
             self.llm_threads = None
             self.llm_gpu_layers = None
+            self.llm_gate_enabled = True
+            self.llm_speculative = False
+            self.llm_speculative_grace_seconds = 0.25
             self.stt_config = WhisperEngineConfig()
+            self.history_retention = RetentionPolicy()
+            self.profiling_config = ProfilingConfig()
+            self.metrics_endpoint_enabled = False
+            self.metrics_port = 9765
+            self.trace_slow_seconds = 3.0
     
     def init_support_files(self):
         """Initialize editable support files if they don't exist."""
@@ -318,7 +427,11 @@ class VoiceTrayApp:
             n_threads=self.llm_threads,
             n_gpu_layers=self.llm_gpu_layers,
         )
-        cfg = DictationConfig(glossary_path=self.glossary_path, llm=llm_cfg)
+        cfg = DictationConfig(
+            glossary_path=self.glossary_path,
+            llm=llm_cfg,
+            llm_gate=LLMGateConfig(enabled=bool(getattr(self, 'llm_gate_enabled', True))),
+        )
         self.dictation_pipeline = DictationPipeline(cfg)
 
     def init_speech_engine(self):
@@ -442,8 +555,11 @@ class VoiceTrayApp:
             timings.setdefault(stage, 0.0)
         total = self._processing_total_seconds(timings)
         model_size = str(getattr(getattr(self, 'stt_config', None), 'model_size', 'unknown'))
+        observe_stage("record", float(timings["record"] or 0.0))
+        observe_stage("total", total, model=model_size)
+        trace = current_trace()
         logger.info(
-            "Dictation timings: record=%.3fs vad=%.3fs stt=%.3fs rules=%.3fs llm=%.3fs insert=%.3fs total=%.3fs model=%s",
+            "Dictation timings: record=%.3fs vad=%.3fs stt=%.3fs rules=%.3fs llm=%.3fs insert=%.3fs total=%.3fs model=%s trace=%s",
             float(timings["record"] or 0.0),
             float(timings["vad"] or 0.0),
             float(timings["stt"] or 0.0),
@@ -452,12 +568,9 @@ class VoiceTrayApp:
             float(timings["insert"] or 0.0),
             total,
             model_size,
+            trace.trace_id if trace is not None else "-",
         )
-        budget = (
-            float(getattr(self, 'llm_budget_seconds', 3.0))
-            if getattr(self, 'llm_enabled', False)
-            else float(getattr(self, 'small_model_budget_seconds', 1.5))
-        )
+        budget = self.latency_budget_seconds()
         if (
             model_size.lower() == "small"
             and total > budget
@@ -509,6 +622,69 @@ class VoiceTrayApp:
 
     def init_history_store(self):
         self.history_store = DictationHistoryStore()
+        self.history_writer = HistoryWriter(self.history_store)
+
+    def init_history_maintenance(self):
+        existing = getattr(self, 'history_maintenance', None)
+        if existing is not None:
+            existing.stop()
+        self.history_maintenance = HistoryMaintenance(
+            self.history_store,
+            getattr(self, 'history_retention', None),
+            is_idle=lambda: not getattr(self, 'is_recording', False),
+        )
+        self.history_maintenance.start()
+
+    def init_metrics_endpoint(self):
+        existing = getattr(self, 'metrics_server', None)
+        if existing is not None:
+            existing.stop()
+            self.metrics_server = None
+        if not getattr(self, 'metrics_endpoint_enabled', False):
+            return
+        server = MetricsServer(port=getattr(self, 'metrics_port', 9765))
+        try:
+            server.start()
+        except OSError:
+            logger.exception("Could not start metrics endpoint on port %s", server.port)
+            return
+        self.metrics_server = server
+
+    def latency_budget_seconds(self):
+        if getattr(self, 'llm_enabled', False):
+            return float(getattr(self, 'llm_budget_seconds', 3.0))
+        return float(getattr(self, 'small_model_budget_seconds', 1.5))
+
+    def init_profiler(self):
+        self.dictation_profiler = DictationProfiler(getattr(self, 'profiling_config', None))
+
+    def start_dictation_profile(self):
+        profiler = getattr(self, 'dictation_profiler', None)
+        if profiler is None:
+            return None
+        try:
+            return profiler.start()
+        except Exception:
+            logger.exception("Could not start dictation profiler")
+            return None
+
+    def init_trace_log(self):
+        self.trace_log = TraceLog(slow_seconds=getattr(self, 'trace_slow_seconds', 3.0))
+
+    def finish_dictation_trace(self, trace, timings=None, profile=None):
+        processing = self._processing_total_seconds(timings) if timings else None
+        if profile is not None:
+            self.dictation_profiler.finish(
+                profile,
+                processing,
+                budget_seconds=self.latency_budget_seconds(),
+                label=trace.trace_id,
+            )
+        trace_log = getattr(self, 'trace_log', None)
+        if trace_log is None:
+            trace.finish()
+            return
+        trace_log.record(trace, processing_seconds=processing)
 
     def get_active_window_title(self):
         if sys.platform != "win32":
@@ -559,62 +735,43 @@ class VoiceTrayApp:
         return DictationContext(mode=mode, profile=profile, app_title=title)
     
     def load_snippets_from_file(self):
-        """Load snippets from snippets.txt file into memory"""
+        """Load snippets from snippets.txt file and compile the expander"""
         try:
             snippets_path = os.path.join(os.path.dirname(__file__), 'snippets.txt')
-            self.snippets = {}
-            
-            if os.path.exists(snippets_path):
-                with open(snippets_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            trigger_word, expansion_text = line.split('=', 1)
-                            trigger_word = trigger_word.strip().lower()
-                            expansion_text = expansion_text.strip()
-                            self.snippets[trigger_word] = expansion_text
-            
+            self.snippet_expander = SnippetExpander.from_file(snippets_path)
+            self.snippets = self.snippet_expander.snippets
             logger.info("Loaded %s snippets from file", len(self.snippets))
             
         except Exception as e:
+            self.snippet_expander = SnippetExpander()
+            self.snippets = self.snippet_expander.snippets
             logger.exception("Error loading snippets from file")
     
     def expand_snippets(self, text):
         """Expand any snippets found in the text"""
         try:
-            if not hasattr(self, 'snippets') or not self.snippets:
-                return text
-            
-            expanded_text = text
-            words = text.lower().split()
-            
-            for trigger_word, expansion_text in self.snippets.items():
-                # Check if trigger word exists as a whole word
-                if trigger_word in words:
-                    # Replace the trigger word with expansion text (case insensitive)
-                    pattern = r'\b' + re.escape(trigger_word) + r'\b'
-                    expanded_text = re.sub(pattern, expansion_text, expanded_text, flags=re.IGNORECASE)
-            
-            return expanded_text
+            with span("snippets"):
+                expander = getattr(self, 'snippet_expander', None)
+                if expander is None:
+                    expander = SnippetExpander(getattr(self, 'snippets', None))
+                    self.snippet_expander = expander
+                return expander.expand(text)
         except Exception as e:
             logger.exception("Error expanding snippets")
             return text
     
-
-    
-
-     
     def record_legacy_audio(self, timings=None):
         """Record a short clip until the hold-to-talk controller lands in M2."""
         logger.info("Listening")
         started = self._performance_now()
-        self.audio_recorder.start()
-        try:
-            time.sleep(self.legacy_record_seconds)
-        finally:
-            audio = self.audio_recorder.stop()
-            if timings is not None:
-                timings["record"] = self._elapsed_since(started)
+        with span("record"):
+            self.audio_recorder.start()
+            try:
+                time.sleep(self.legacy_record_seconds)
+            finally:
+                audio = self.audio_recorder.stop()
+                if timings is not None:
+                    timings["record"] = self._elapsed_since(started)
         return audio
 
     def transcribe_legacy_recording(self, timings=None):
@@ -628,6 +785,11 @@ class VoiceTrayApp:
             return None
         raw_text = self.stt_engine.transcribe(audio).strip()
         self._merge_component_timings(timings, getattr(self.stt_engine, 'last_timings', None))
+        if timings is not None:
+            for key, attr in (("audio_seconds", 'last_audio_seconds'), ("trimmed_seconds", 'last_trimmed_seconds')):
+                value = getattr(self.stt_engine, attr, None)
+                if value is not None:
+                    timings[key] = value
         return raw_text or None
 
     def process_raw_transcript(self, raw_text, *, insert_text, duration_seconds=None, timings=None):
@@ -636,34 +798,61 @@ class VoiceTrayApp:
         timings = timings if timings is not None else {}
 
         context = self.select_dictation_context()
-        processed_text = self.process_text(raw_text, context=context, timings=timings)
+        prepared = None
+        with span("cleanup", mode=context.mode, profile=context.profile):
+            if insert_text and self.use_speculative_llm():
+                processed_text, prepared = self.process_text_speculative(raw_text, context, timings=timings)
+            else:
+                processed_text = self.process_text(raw_text, context=context, timings=timings)
         if not processed_text:
+            if prepared is not None:
+                self.inserter.discard_insertion(prepared)
             return None
 
         app_title = getattr(context, 'app_title', None) or self.get_active_window_title()
-        self.record_history_entry(raw_text, processed_text, context, duration_seconds, app_title)
         self.last_recognized_text = processed_text
-        if insert_text:
-            insert_started = self._performance_now()
-            result = self.inserter.insert_text(
-                processed_text,
-                start_focus=getattr(self, 'recording_focus_token', None),
-                app_title=app_title,
+        try:
+            if insert_text:
+                insert_started = self._performance_now()
+                if prepared is not None:
+                    result = self.inserter.commit_insertion(prepared, processed_text)
+                else:
+                    result = self.inserter.insert_text(
+                        processed_text,
+                        start_focus=getattr(self, 'recording_focus_token', None),
+                        app_title=app_title,
+                    )
+                timings["insert"] = self._elapsed_since(insert_started)
+                if result.status == "skipped_focus_changed":
+                    self.show_tray_notification("Copied to history; focus changed before insertion.")
+                elif result.status != "inserted":
+                    logger.warning("Text insertion skipped: %s", result.reason or result.status)
+            else:
+                timings.setdefault("insert", 0.0)
+        finally:
+            # History is queued after insertion so the write never delays the paste.
+            self.record_history_entry(
+                raw_text, processed_text, context, duration_seconds, app_title, timings=timings
             )
-            timings["insert"] = self._elapsed_since(insert_started)
-            if result.status == "skipped_focus_changed":
-                self.show_tray_notification("Copied to history; focus changed before insertion.")
-            elif result.status != "inserted":
-                logger.warning("Text insertion skipped: %s", result.reason or result.status)
-        else:
-            timings.setdefault("insert", 0.0)
         logger.info("Original: %s", raw_text)
         logger.info("Processed: %s", processed_text)
         self.report_dictation_performance(timings)
         return processed_text
 
-    def record_history_entry(self, raw_text, cleaned_text, context, duration_seconds, app_title):
+    def record_history_entry(self, raw_text, cleaned_text, context, duration_seconds, app_title, timings=None):
+        with span("history"):
+            self._record_history_entry(raw_text, cleaned_text, context, duration_seconds, app_title, timings)
+
+    def _record_history_entry(self, raw_text, cleaned_text, context, duration_seconds, app_title, timings):
         try:
+            timings = timings or {}
+            stage_timings = {
+                stage: float(timings[stage])
+                for stage in PERFORMANCE_STAGES
+                if timings.get(stage) is not None
+            }
+            if stage_timings:
+                stage_timings["total"] = self._processing_total_seconds(stage_timings)
             entry = HistoryEntry(
                 app_name=app_title,
                 raw_text=raw_text,
@@ -672,30 +861,46 @@ class VoiceTrayApp:
                 profile=context.profile,
                 duration_seconds=duration_seconds,
                 model=getattr(self.stt_config, 'model_size', 'unknown'),
+                timings=stage_timings or None,
+                audio_seconds=timings.get('audio_seconds'),
+                trimmed_seconds=timings.get('trimmed_seconds'),
             )
-            self.history_store.append(entry)
+            writer = getattr(self, 'history_writer', None)
+            if writer is not None:
+                writer.submit(entry)
+            else:
+                self.history_store.append(entry)
         except Exception:
             logger.exception("Could not append dictation history")
 
     def speech_to_text(self):
         """Convert local audio to text and insert it into the active field."""
+        trace = Trace("dictation", trigger="legacy")
+        timings = {}
+        profile = self.start_dictation_profile()
         try:
-            timings = {}
-            raw_text = self.transcribe_legacy_recording(timings=timings)
-            return self.process_raw_transcript(raw_text, insert_text=True, timings=timings)
+            with activate(trace):
+                raw_text = self.transcribe_legacy_recording(timings=timings)
+                return self.process_raw_transcript(raw_text, insert_text=True, timings=timings)
         except Exception:
             logger.exception("Local dictation error")
             return None
+        finally:
+            self.finish_dictation_trace(trace, timings, profile)
 
     def start_hotkey_recording(self):
         """Start recording immediately for hold-to-talk hotkeys."""
         if self.is_recording:
             return
+        trace = Trace("dictation", trigger="hotkey")
         try:
             self.is_recording = True
-            self.recording_focus_token = self.get_active_window_identity()
-            logger.info("Recording started")
-            self.audio_recorder.start()
+            with activate(trace), span("hotkey_start"):
+                self.recording_focus_token = self.get_active_window_identity()
+                logger.info("Recording started")
+                self.audio_recorder.start()
+            self.dictation_trace = trace
+            self.recording_span = trace.start_span("record", parent=trace.root)
             self.emit_ui_callback('recording_started_callback')
             self.schedule_recording_limit_timers()
         except NoInputDeviceError:
@@ -757,8 +962,18 @@ class VoiceTrayApp:
             return
         self.cancel_recording_limit_timers()
         self.last_recording_duration_seconds = getattr(session, "duration_seconds", None)
+        trace = getattr(self, 'dictation_trace', None)
+        self.dictation_trace = None
+        recording_span = getattr(self, 'recording_span', None)
+        self.recording_span = None
+        if recording_span is not None:
+            recording_span.finish(
+                duration_seconds=self.last_recording_duration_seconds,
+                locked=bool(getattr(session, "locked", False)),
+            )
         try:
-            audio = self.audio_recorder.stop()
+            with activate(trace), span("recorder_stop"):
+                audio = self.audio_recorder.stop()
             logger.info(
                 "Recording stopped after %.2fs%s",
                 getattr(session, "duration_seconds", 0.0),
@@ -776,21 +991,24 @@ class VoiceTrayApp:
 
         threading.Thread(
             target=self.process_recorded_audio,
-            args=(audio, True),
+            args=(audio, True, trace),
             daemon=True,
         ).start()
 
-    def process_recorded_audio(self, audio, insert_text=True):
+    def process_recorded_audio(self, audio, insert_text=True, trace=None):
+        trace = trace if trace is not None else Trace("dictation", trigger="audio")
+        timings = {"record": float(getattr(self, 'last_recording_duration_seconds', None) or 0.0)}
+        profile = self.start_dictation_profile()
         try:
             self.emit_ui_callback('processing_started_callback')
-            timings = {"record": float(getattr(self, 'last_recording_duration_seconds', None) or 0.0)}
-            raw_text = self.transcribe_audio_to_text(audio, timings=timings)
-            result = self.process_raw_transcript(
-                raw_text,
-                insert_text=insert_text,
-                duration_seconds=getattr(self, 'last_recording_duration_seconds', None),
-                timings=timings,
-            )
+            with activate(trace), span("process"):
+                raw_text = self.transcribe_audio_to_text(audio, timings=timings)
+                result = self.process_raw_transcript(
+                    raw_text,
+                    insert_text=insert_text,
+                    duration_seconds=getattr(self, 'last_recording_duration_seconds', None),
+                    timings=timings,
+                )
             if result:
                 logger.info("Converted: %s", result)
             self.emit_ui_callback('processing_finished_callback', result or "")
@@ -800,6 +1018,7 @@ class VoiceTrayApp:
             self.emit_ui_callback('error_callback', str(exc) or type(exc).__name__)
             return None
         finally:
+            self.finish_dictation_trace(trace, timings, profile)
             self.is_recording = False
             self.recording_focus_token = None
             self.last_recording_duration_seconds = None
@@ -840,13 +1059,18 @@ class VoiceTrayApp:
     
     def speech_to_text_for_saving(self):
         """Convert speech to text for history-only saving."""
+        trace = Trace("dictation", trigger="save")
+        timings = {}
+        profile = self.start_dictation_profile()
         try:
-            timings = {}
-            raw_text = self.transcribe_legacy_recording(timings=timings)
-            return self.process_raw_transcript(raw_text, insert_text=False, timings=timings)
+            with activate(trace):
+                raw_text = self.transcribe_legacy_recording(timings=timings)
+                return self.process_raw_transcript(raw_text, insert_text=False, timings=timings)
         except Exception:
             logger.exception("Error in local dictation for saving")
             return None
+        finally:
+            self.finish_dictation_trace(trace, timings, profile)
     
 
     
@@ -978,6 +1202,24 @@ These files can be edited in Settings or with a text editor while VoiceTray is s
     def cleanup(self):
         """Cleanup function called on exit"""
         self.stop_listening()
+        history_maintenance = getattr(self, 'history_maintenance', None)
+        if history_maintenance is not None:
+            history_maintenance.stop()
+        metrics_server = getattr(self, 'metrics_server', None)
+        if metrics_server is not None:
+            metrics_server.stop()
+        history_writer = getattr(self, 'history_writer', None)
+        if history_writer is not None:
+            try:
+                history_writer.close()
+            except Exception:
+                logger.exception("Could not flush dictation history")
+        history_store = getattr(self, 'history_store', None)
+        if history_store is not None and hasattr(history_store, 'close'):
+            try:
+                history_store.close()
+            except Exception:
+                logger.exception("Could not close dictation history store")
 
 def main():
     """Main entry point"""
@@ -2,24 +2,54 @@
 
 from __future__ import annotations
 
+import argparse
+import sys
+from collections.abc import Sequence
 
-def main() -> int:
+from .startup import STARTUP
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="voicetray", add_help=False, allow_abbrev=False)
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Start up fully (including the speech model), print the phase timings and exit.",
+    )
+    # Qt and the frozen launcher may pass their own arguments; leave them alone.
+    args, _unknown = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
     """Run VoiceTray."""
-    from .config import load_config
-    from .logging_config import configure_logging
-    from .single_instance import SingleInstanceLock, default_lock_path
+    args = parse_args(argv)
+    with STARTUP.phase("logging"):
+        from .logging_config import configure_logging
+
+        configure_logging()
+    with STARTUP.phase("config"):
+        from .config import load_config
+
+        load_config()
 
-    configure_logging()
-    load_config()
+    with STARTUP.phase("lock"):
+        from .single_instance import SingleInstanceLock, default_lock_path
 
-    lock = SingleInstanceLock(default_lock_path())
-    if not lock.acquire():
+        lock = SingleInstanceLock(default_lock_path())
+        acquired = lock.acquire()
+    if not acquired:
         lock.notify_existing_instance("VoiceTray is already running")
         return 1
 
     try:
-        from .app import VoiceTrayApp
+        with STARTUP.phase("app_import"):
+            from .app import VoiceTrayApp
 
+        if args.startup_report:
+            exit_code = int(VoiceTrayApp(startup_report=True).run())
+            sys.stdout.write(STARTUP.format_report())
+            return exit_code
         return int(VoiceTrayApp().run())
     finally:
         lock.release()
@@ -0,0 +1,500 @@
+"""Machine-wide, content-addressed model cache shared by every VoiceTray session.
+
+Layout under the cache root::
+
+    blobs/sha256/ab/abcdef...      immutable, read-only file contents
+    models/<name>/<digest>/        one snapshot per manifest, files hard-linked to blobs
+    models/<name>/<digest>/voicetray-manifest.json
+    tmp/                           staging for downloads and half-built snapshots
+
+Every file is written to ``tmp`` and moved into place with an atomic rename, so
+sessions of different users can install the same model at the same time
+without a shared writable index. Identical files share one blob, and a
+snapshot's files are hard links to blobs. Every session therefore opens the
+same inodes and shares their pages in the OS file cache instead of keeping a
+per-user copy. CTranslate2 still copies the weights into its own buffers when
+it loads, so the sharing applies to disk, downloads and file-cache pages, not
+to the converted weights in each process.
+
+The shared directories are writable by every user, so nothing found there is
+taken on trust. A snapshot, its manifest and its files must be owned by root,
+the owner of the cache root or the current user, and must not be writable by
+anyone else; a file must also hash to its manifest digest the first time a
+session uses it. A blob is only reused when it hashes to its file name. When
+another user already holds a snapshot or blob name, this user's copy gets a
+per-user name next to it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "voicetray-manifest.json"
+CACHE_ENV = "VOICETRAY_MODEL_CACHE"
+DIGEST_CHARS = 20
+INSTALL_LOCK_STALE_SECONDS = 30 * 60
+INSTALL_LOCK_WAIT_SECONDS = 15 * 60
+SHARED_DIR_MODE = 0o1777
+READ_ONLY_DIR_MODE = 0o755
+
+# (st_dev, st_ino, st_size, st_mtime_ns) -> sha256 of files hashed by this process.
+_VERIFIED: dict[tuple[int, int, int, int], str] = {}
+_VERIFIED_LOCK = threading.Lock()
+
+Fetch = Callable[[Path], Any]
+ProgressCallback = Callable[[int], None]
+
+
+class ModelCacheError(RuntimeError):
+    pass
+
+
+def default_cache_root(configured: str | os.PathLike[str] | None = None) -> Path:
+    """Machine-wide cache location; ``VOICETRAY_MODEL_CACHE`` or config overrides it."""
+    override = os.environ.get(CACHE_ENV) or (str(configured) if configured else "")
+    if override:
+        return Path(override).expanduser()
+    if os.name == "nt":
+        return Path(os.environ.get("PROGRAMDATA") or r"C:\ProgramData") / "VoiceTray" / "models"
+    if sys.platform == "darwin":
+        return Path("/Users/Shared/VoiceTray/models")
+    shared = Path("/var/cache/voicetray/models")
+    # The shared directory is provisioned by an administrator (e.g. mode 1777);
+    # without it each user falls back to a private cache.
+    if shared.is_dir() and os.access(shared, os.W_OK | os.X_OK):
+        return shared
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "voicetray" / "models"
+
+
+def whisper_cache_name(model_size: str) -> str:
+    return "whisper-" + str(model_size).strip().replace("/", "--").replace("\\", "--")
+
+
+def sha256_file(path: str | os.PathLike[str]) -> str:
+    """Hash through a read-only memory map, so the file's cached pages are read in place."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+    return digest.hexdigest()
+
+
+class ModelCache:
+    def __init__(self, root: str | os.PathLike[str] | None = None):
+        self.root = Path(root) if root is not None else default_cache_root()
+
+    @classmethod
+    def from_app_config(cls, config: dict[str, Any]) -> "ModelCache":
+        stt = config.get("stt", {}) if isinstance(config, dict) else {}
+        return cls(default_cache_root(stt.get("model_cache_dir") or None))
+
+    def resolve(self, name: str, *, verify: bool = False) -> Path | None:
+        """Newest trusted, complete snapshot for ``name``.
+
+        Each file is hashed the first time this process sees it; ``verify``
+        re-hashes every file even if it was checked before.
+        """
+        candidates = []
+        for manifest_path in (self.root / "models" / name).glob(f"*/{MANIFEST_NAME}"):
+            if not self._published(manifest_path.parent):
+                logger.warning("Ignoring cached model %s owned by an untrusted user", manifest_path.parent)
+                continue
+            manifest = _read_manifest(manifest_path)
+            if manifest is not None:
+                candidates.append((float(manifest.get("created_at", 0.0)), manifest_path.parent, manifest))
+        for _created, snapshot, manifest in sorted(candidates, key=lambda item: item[0], reverse=True):
+            problems = self._check(snapshot, manifest, rehash=verify)
+            if not problems:
+                return snapshot
+            logger.warning("Ignoring damaged cached model %s: %s", snapshot, ", ".join(problems))
+        return None
+
+    def verify(self, snapshot: str | os.PathLike[str]) -> list[str]:
+        """Files in ``snapshot`` that are missing or whose contents no longer match the manifest."""
+        manifest = _read_manifest(Path(snapshot) / MANIFEST_NAME)
+        if manifest is None:
+            return [MANIFEST_NAME]
+        return self._check(Path(snapshot), manifest, rehash=True)
+
+    def add_directory(self, name: str, source: str | os.PathLike[str], *, move: bool = False) -> Path:
+        """Store every file under ``source`` and publish them as a snapshot of ``name``.
+
+        With ``move`` the files (or the targets of symlinks, as in a Hugging Face
+        cache) are renamed into the cache instead of copied; use it for staging
+        directories on the same volume.
+        """
+        source = Path(source)
+        files = sorted(path for path in source.rglob("*") if path.is_file())
+        if not files:
+            raise ModelCacheError(f"{source} contains no files")
+        stored = [(path, *self._store_blob(path, move=move)) for path in files]
+        entries = [{"path": path.relative_to(source).as_posix(), **entry} for path, entry, _blob in stored]
+        manifest = {"name": name, "created_at": time.time(), "files": entries}
+        identity = json.dumps(
+            [[entry["path"], entry["sha256"]] for entry in entries], separators=(",", ":")
+        ).encode("utf-8")
+        digest = hashlib.sha256(identity).hexdigest()[:DIGEST_CHARS]
+        snapshot = self.root / "models" / name / digest
+        if self._published(snapshot):
+            return snapshot
+        if snapshot.exists():
+            # Published by another user, whose files this session does not trust.
+            snapshot = snapshot.with_name(digest + _owner_tag())
+            if self._published(snapshot):
+                return snapshot
+
+        staging = self._staging_dir("snapshot")
+        try:
+            for (path, _entry, blob), entry in zip(stored, entries):
+                target = staging / entry["path"]
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if blob is not None:
+                    _link_or_copy(blob, target)
+                else:
+                    shutil.copyfile(path.resolve(), target)
+                    os.chmod(target, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+            os.chmod(staging / MANIFEST_NAME, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            # Readable by every user whatever this session's umask is.
+            for directory in [staging, *(path for path in staging.rglob("*") if path.is_dir())]:
+                os.chmod(directory, READ_ONLY_DIR_MODE)
+            self._shared_dir(snapshot.parent)
+            try:
+                os.rename(staging, snapshot)
+            except OSError:
+                # Another session published the same snapshot first.
+                if not (snapshot / MANIFEST_NAME).exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        if not self._published(snapshot):
+            raise ModelCacheError(f"{snapshot} is held by another user")
+        logger.info("Cached model %s at %s", name, snapshot)
+        return snapshot
+
+    def ensure(
+        self,
+        name: str,
+        fetch: Fetch,
+        *,
+        progress_callback: ProgressCallback | None = None,
+        wait_seconds: float = INSTALL_LOCK_WAIT_SECONDS,
+    ) -> Path:
+        """Return the cached snapshot, calling ``fetch(staging_dir)`` only if no session has it yet.
+
+        ``fetch`` may be called again with the same, partly filled directory
+        after an earlier attempt failed.
+        """
+        cached = self.resolve(name)
+        if cached is not None:
+            _emit_progress(progress_callback, 100)
+            return cached
+
+        self._shared_dir(self.root / "tmp")
+        with _InstallLock(self.root / "tmp" / f"{name}.lock", wait_seconds=wait_seconds) as lock:
+            cached = self.resolve(name)
+            if cached is not None:
+                _emit_progress(progress_callback, 100)
+                return cached
+            if lock.held:
+                # Only the lock holder uses the per-model staging directory. It
+                # is kept when ``fetch`` fails, so a resumable fetch picks up
+                # where it stopped.
+                staging = self._resume_dir(name)
+                staging.mkdir(exist_ok=True)
+            else:
+                # Another session still holds the lock and may be writing the
+                # shared staging directory.
+                staging = self._staging_dir("download")
+            try:
+                _emit_progress(progress_callback, 5)
+                fetch(staging)
+                _emit_progress(progress_callback, 90)
+                snapshot = self.add_directory(name, _model_dir(staging), move=True)
+            except BaseException:
+                if not lock.held:
+                    shutil.rmtree(staging, ignore_errors=True)
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+        _emit_progress(progress_callback, 100)
+        return snapshot
+
+    def _check(self, snapshot: Path, manifest: dict[str, Any], *, rehash: bool) -> list[str]:
+        problems = []
+        for entry in manifest.get("files", []):
+            path = snapshot / entry["path"]
+            try:
+                info = path.stat()
+                if (
+                    info.st_size != int(entry["size"])
+                    or not self._trusted(info)
+                    or not _content_matches(path, entry["sha256"], info, rehash=rehash)
+                ):
+                    problems.append(entry["path"])
+            except OSError:
+                problems.append(entry["path"])
+        return problems
+
+    def _published(self, snapshot: Path) -> bool:
+        try:
+            return self._trusted(snapshot.stat()) and self._trusted((snapshot / MANIFEST_NAME).stat())
+        except OSError:
+            return False
+
+    def _trusted(self, info: os.stat_result) -> bool:
+        """Owned by root, the cache root's owner or this user, and writable by nobody else."""
+        if os.name == "nt":
+            return True
+        if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            return False
+        owners = {0, os.getuid()}
+        try:
+            owners.add(self.root.stat().st_uid)
+        except OSError:
+            pass
+        return info.st_uid in owners
+
+    def _store_blob(self, path: Path, *, move: bool) -> tuple[dict[str, Any], Path | None]:
+        """Content-address ``path``; the blob is ``None`` if every name for it is held by someone untrusted."""
+        real = path.resolve()
+        entry = {"sha256": sha256_file(real), "size": real.stat().st_size}
+        for blob in self._blob_paths(entry["sha256"]):
+            if not blob.exists():
+                self._install_blob(real, blob, entry["sha256"], move=move)
+            try:
+                if self._trusted(blob.stat()) and _content_matches(blob, entry["sha256"]):
+                    return entry, blob
+            except OSError:
+                pass
+            logger.warning("Ignoring cached blob %s: untrusted owner or contents do not match its name", blob)
+        return entry, None
+
+    def _install_blob(self, source: Path, blob: Path, digest: str, *, move: bool) -> None:
+        self._shared_dir(blob.parent)
+        staged = self._staging_dir("blob") / "data"
+        try:
+            if move:
+                os.replace(source, staged)
+            else:
+                shutil.copyfile(source, staged)
+            if sha256_file(staged) != digest:
+                raise ModelCacheError(f"{source} changed while it was being cached")
+            os.chmod(staged, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            try:
+                os.replace(staged, blob)
+            except OSError:
+                if not blob.exists():
+                    raise
+                if move:
+                    # Someone else took the name first; keep the file for the next candidate.
+                    os.replace(staged, source)
+            else:
+                _remember_verified(blob, digest)
+        finally:
+            shutil.rmtree(staged.parent, ignore_errors=True)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / "sha256" / digest[:2] / digest
+
+    def _blob_paths(self, digest: str) -> list[Path]:
+        blob = self._blob_path(digest)
+        owned = blob.with_name(digest + _owner_tag())
+        return [blob, owned] if owned != blob else [blob]
+
+    def _resume_dir(self, name: str) -> Path:
+        # Per user, since another user's partial files are not writable here.
+        return self.root / "tmp" / f"download-{name}{_owner_tag()}"
+
+    def _staging_dir(self, kind: str) -> Path:
+        self._shared_dir(self.root / "tmp")
+        path = self.root / "tmp" / f"{kind}-{uuid.uuid4().hex}"
+        path.mkdir()
+        return path
+
+    def _shared_dir(self, path: Path) -> None:
+        """Create ``path`` and the directories between it and the root writable by every user.
+
+        The mode is sticky, as on ``/tmp``, so users can add entries but only
+        remove their own. Directories created by another user keep their mode.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        if os.name == "nt":
+            return
+        try:
+            relative = path.relative_to(self.root)
+        except ValueError:
+            return
+        current = self.root
+        for part in relative.parts:
+            current = current / part
+            try:
+                if stat.S_IMODE(current.stat().st_mode) != SHARED_DIR_MODE:
+                    os.chmod(current, SHARED_DIR_MODE)
+            except OSError:
+                pass
+
+
+def cached_whisper_model(model_size: str, root: str | os.PathLike[str]) -> Path | None:
+    """Snapshot directory for ``model_size`` in the shared cache, if one has been installed."""
+    if os.path.isdir(model_size):
+        return None
+    return ModelCache(root).resolve(whisper_cache_name(model_size))
+
+
+class _InstallLock:
+    """Keeps sessions from downloading the same model twice.
+
+    Installs are safe without it, because every write is an atomic rename of
+    content-addressed data and a session without the lock stages its download
+    privately. So a lock whose holder stopped refreshing it for
+    ``INSTALL_LOCK_STALE_SECONDS`` is broken, and a waiter that times out
+    installs anyway.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        wait_seconds: float,
+        poll_seconds: float = 0.5,
+        heartbeat_seconds: float = INSTALL_LOCK_STALE_SECONDS / 6,
+    ):
+        self.path = path
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._held = False
+        self._stop = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    def __enter__(self) -> "_InstallLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                # A stale lock we cannot remove (e.g. owned by another user)
+                # is waited out like a live one.
+                if self._is_stale() and self._break():
+                    continue
+                if time.monotonic() >= deadline:
+                    logger.warning("Model install lock %s still held; installing anyway", self.path)
+                    return self
+                time.sleep(self.poll_seconds)
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"pid": os.getpid(), "created_at": time.time()}, handle)
+            self._held = True
+            self._stop.clear()
+            self._heartbeat = threading.Thread(
+                target=self._refresh, name="voicetray-model-install-lock", daemon=True
+            )
+            self._heartbeat.start()
+            return self
+
+    def __exit__(self, *_exc_info) -> None:
+        if self._held:
+            self._stop.set()
+            if self._heartbeat is not None:
+                self._heartbeat.join()
+                self._heartbeat = None
+            self._break()
+            self._held = False
+
+    def _refresh(self) -> None:
+        """Touch the lock while it is held, so a long download never looks stale."""
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                os.utime(self.path)
+            except OSError:
+                logger.debug("Could not refresh model install lock %s", self.path, exc_info=True)
+
+    def _is_stale(self) -> bool:
+        try:
+            return time.time() - self.path.stat().st_mtime > INSTALL_LOCK_STALE_SECONDS
+        except FileNotFoundError:
+            return True
+
+    def _break(self) -> bool:
+        """Remove the lock file; ``False`` if it is still there."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+        return True
+
+
+def _owner_tag() -> str:
+    return f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+
+
+def _content_matches(path: Path, digest: str, info: os.stat_result | None = None, *, rehash: bool = False) -> bool:
+    """Whether ``path`` hashes to ``digest``; each unchanged file is hashed once per process."""
+    info = info or path.stat()
+    key = (info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns)
+    with _VERIFIED_LOCK:
+        known = None if rehash else _VERIFIED.get(key)
+    if known is None:
+        known = sha256_file(path)
+        with _VERIFIED_LOCK:
+            _VERIFIED[key] = known
+    return known == digest
+
+
+def _remember_verified(path: Path, digest: str) -> None:
+    info = path.stat()
+    with _VERIFIED_LOCK:
+        _VERIFIED[(info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns)] = digest
+
+
+def _model_dir(staging: Path) -> Path:
+    """The directory holding ``model.bin`` inside a download, e.g. a Hugging Face snapshot."""
+    markers = sorted(staging.rglob("model.bin"), key=lambda path: len(path.parts))
+    return markers[0].parent if markers else staging
+
+
+def _link_or_copy(blob: Path, target: Path) -> None:
+    try:
+        os.link(blob, target)
+    except OSError:
+        shutil.copyfile(blob, target)
+        os.chmod(target, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+
+def _read_manifest(path: Path) -> dict[str, Any] | None:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files"), list):
+        return None
+    return manifest
+
+
+def _emit_progress(callback: ProgressCallback | None, value: int) -> None:
+    if callback is not None:
+        callback(int(value))
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any
 
 from .config import load_config
+from .model_cache import ModelCache, whisper_cache_name
 
 ProgressCallback = Callable[[int], None]
 ModelFactory = Callable[..., Any]
@@ -29,20 +30,45 @@ def download_whisper_model(
     models_dir: str | Path | None = None,
     config: dict[str, Any] | None = None,
 ) -> Path:
+    """Download ``model_size`` and return where it was stored.
+
+    Unless ``models_dir`` is given (or ``stt.shared_model_cache`` is off), the
+    model goes into the machine-wide cache and is skipped if any session
+    already installed it; the returned path is then the cached snapshot.
+    """
     cfg = config if config is not None else load_config()
     stt = cfg.get("stt", {}) if isinstance(cfg, dict) else {}
+    factory = model_factory or _default_model_factory
+
+    def fetch(target: Path) -> None:
+        factory(
+            str(model_size),
+            device=str(stt.get("device", "cpu")),
+            compute_type=str(stt.get("compute_type", "int8")),
+            local_files_only=False,
+            download_root=str(target),
+        )
+
+    if models_dir is None and bool(stt.get("shared_model_cache", True)):
+        cache = ModelCache.from_app_config(cfg)
+        if model_factory is None:
+            # Fetch the files directly: resumable, parallel and hash-checked,
+            # with byte-accurate progress between the cache's 5% and 90% marks.
+            def fetch_files(target: Path) -> None:
+                from .downloader import download_whisper_files
+
+                download_whisper_files(
+                    str(model_size), target, progress_callback=_byte_progress(progress_callback, 5, 90)
+                )
+
+            return cache.ensure(whisper_cache_name(model_size), fetch_files, progress_callback=progress_callback)
+        return cache.ensure(whisper_cache_name(model_size), fetch, progress_callback=progress_callback)
+
     target = default_models_dir(models_dir) / "whisper"
     target.mkdir(parents=True, exist_ok=True)
 
     _emit_progress(progress_callback, 5)
-    factory = model_factory or _default_model_factory
-    factory(
-        str(model_size),
-        device=str(stt.get("device", "cpu")),
-        compute_type=str(stt.get("compute_type", "int8")),
-        local_files_only=False,
-        download_root=str(target),
-    )
+    fetch(target)
     _emit_progress(progress_callback, 100)
     return target
 
@@ -52,6 +78,21 @@ def _emit_progress(callback: ProgressCallback | None, value: int) -> None:
         callback(int(value))
 
 
+def _byte_progress(callback: ProgressCallback | None, start: int, end: int) -> Callable[[int, int], None] | None:
+    if callback is None:
+        return None
+    last = [start]
+
+    def report(done: int, total: int) -> None:
+        value = start + (end - start) * done // total if total else start
+        # ``end`` itself is reported by the caller once the download finishes.
+        if last[0] < value < end:
+            last[0] = value
+            callback(int(value))
+
+    return report
+
+
 def _default_model_factory(*args: Any, **kwargs: Any) -> Any:
     from faster_whisper import WhisperModel
 
@@ -0,0 +1,200 @@
+"""Opt-in profiling of slow dictations."""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import cProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sampling", "cprofile")
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """``threshold_seconds`` of ``0`` defers to the caller's latency budget."""
+
+    enabled: bool = False
+    mode: str = "sampling"
+    threshold_seconds: float = 0.0
+    sample_interval_seconds: float = 0.005
+    max_files: int = 10
+
+    @classmethod
+    def from_app_config(cls, config: dict[str, Any]) -> "ProfilingConfig":
+        profiling = config.get("profiling", {}) if isinstance(config, dict) else {}
+        mode = str(profiling.get("mode", "sampling")).lower()
+        return cls(
+            enabled=bool(profiling.get("enabled", False)),
+            mode=mode if mode in PROFILE_MODES else "sampling",
+            threshold_seconds=max(0, int(profiling.get("threshold_ms", 0))) / 1000.0,
+            sample_interval_seconds=max(1, int(profiling.get("sample_interval_ms", 5))) / 1000.0,
+            max_files=max(1, int(profiling.get("max_files", 10))),
+        )
+
+
+def default_profile_dir(local_appdata: str | os.PathLike[str] | None = None) -> Path:
+    from .logging_config import log_file_path
+
+    return log_file_path(local_appdata).parent / "profiles"
+
+
+class StackSampler:
+    """Samples every other thread's Python stack and counts folded stacks.
+
+    Unlike cProfile this sees the speculative LLM and history threads too, and
+    costs one ``sys._current_frames()`` walk per interval regardless of how
+    many Python calls the dictation makes.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = max(0.001, float(interval))
+        self.samples: Counter[str] = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="voicetray-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def sample_once(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.samples[";".join(reversed(stack))] += 1
+        self.sample_count += 1
+
+    def folded(self) -> str:
+        """Brendan Gregg's folded-stack format, readable by speedscope and flamegraph.pl."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample_once()
+
+
+class ProfileSession:
+    def __init__(self, mode: str, interval: float):
+        self.mode = mode
+        self.started = time.perf_counter()
+        self.elapsed: float | None = None
+        self._profile: cProfile.Profile | None = None
+        self._sampler: StackSampler | None = None
+        if mode == "cprofile":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+        else:
+            self._sampler = StackSampler(interval)
+
+    def start(self) -> "ProfileSession":
+        if self._profile is not None:
+            self._profile.enable()
+        else:
+            self._sampler.start()
+        return self
+
+    def stop(self) -> None:
+        if self.elapsed is not None:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            self._sampler.stop()
+        self.elapsed = time.perf_counter() - self.started
+
+    def write(self, stem: Path) -> list[Path]:
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            stats_path = stem.with_suffix(".prof")
+            self._profile.dump_stats(str(stats_path))
+            import pstats
+
+            summary = io.StringIO()
+            pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(40)
+            summary_path = stem.with_suffix(".txt")
+            summary_path.write_text(summary.getvalue(), encoding="utf-8")
+            return [stats_path, summary_path]
+        folded_path = stem.with_suffix(".folded.txt")
+        folded_path.write_text(self._sampler.folded(), encoding="utf-8")
+        return [folded_path]
+
+
+class DictationProfiler:
+    """Profiles each dictation while enabled and keeps only the slow ones."""
+
+    def __init__(self, config: ProfilingConfig | None = None, directory: str | Path | None = None):
+        self.config = config or ProfilingConfig()
+        self.directory = Path(directory) if directory is not None else default_profile_dir()
+
+    def start(self) -> ProfileSession | None:
+        if not self.config.enabled:
+            return None
+        return ProfileSession(self.config.mode, self.config.sample_interval_seconds).start()
+
+    def finish(
+        self,
+        session: ProfileSession | None,
+        elapsed_seconds: float | None = None,
+        *,
+        budget_seconds: float = 0.0,
+        label: str = "",
+    ) -> list[Path]:
+        """Stop ``session`` and write it out if the dictation was over the threshold."""
+        if session is None:
+            return []
+        session.stop()
+        elapsed = session.elapsed if elapsed_seconds is None else elapsed_seconds
+        threshold = self.config.threshold_seconds or budget_seconds
+        if threshold <= 0 or elapsed < threshold:
+            return []
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        suffix = f"-{label}" if label else ""
+        try:
+            paths = session.write(self.directory / f"dictation-{stamp}{suffix}")
+        except OSError:
+            logger.exception("Could not write dictation profile")
+            return []
+        self._prune()
+        logger.info("Slow dictation (%.3fs > %.3fs) profile written to %s", elapsed, threshold, paths[0])
+        return paths
+
+    def _prune(self) -> None:
+        runs: dict[str, list[Path]] = {}
+        for path in self.directory.glob("dictation-*"):
+            runs.setdefault(path.name.split(".", 1)[0], []).append(path)
+        ordered = sorted(runs.values(), key=lambda files: max(item.stat().st_mtime for item in files))
+        for files in ordered[: max(0, len(ordered) - self.config.max_files)]:
+            for stale in files:
+                try:
+                    stale.unlink()
+                except OSError:
+                    logger.debug("Could not remove old profile %s", stale, exc_info=True)
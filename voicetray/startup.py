@@ -0,0 +1,161 @@
+"""Launch phase timing: where time goes between process start and a ready dictation.
+
+``STARTUP`` is a process-wide timeline. Its origin is when this module is first
+imported, which ``voicetray.main`` does before anything else; the interpreter
+and frozen-bundle start-up before that is reported separately as
+``process_start`` where the OS exposes the process creation time.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PHASE_GAUGE = "voicetray_startup_phase_seconds"
+MILESTONE_GAUGE = "voicetray_startup_milestone_seconds"
+# Milestones are seconds since the timeline origin.
+TRAY_ICON = "tray_icon"
+READY = "ready"
+# When the speech model first finishes loading. ``--startup-report`` loads it
+# eagerly; in a normal launch it loads on the first dictation, so the number
+# also includes however long the user waited before dictating.
+FIRST_DICTATION_READY = "first_dictation_ready"
+
+
+class StartupTimeline:
+    def __init__(self, *, clock: Callable[[], float] = time.perf_counter, origin: float | None = None):
+        self.clock = clock
+        self.origin = clock() if origin is None else origin
+        self.process_start_seconds = process_age_seconds()
+        self._phases: list[tuple[str, float, float]] = []
+        self._milestones: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = self.clock()
+        try:
+            yield
+        finally:
+            finished = self.clock()
+            with self._lock:
+                self._phases.append((name, started - self.origin, finished - started))
+
+    def milestone(self, name: str) -> float:
+        """Record ``name`` at the current time unless it was already reached."""
+        with self._lock:
+            return self._milestones.setdefault(name, self.clock() - self.origin)
+
+    def milestone_if_new(self, name: str) -> float | None:
+        """Record ``name`` and return its offset, or ``None`` if it was already reached."""
+        with self._lock:
+            if name in self._milestones:
+                return None
+            offset = self._milestones[name] = self.clock() - self.origin
+            return offset
+
+    def phases(self) -> list[tuple[str, float, float]]:
+        """``(name, offset_seconds, duration_seconds)`` in start order."""
+        with self._lock:
+            return sorted(self._phases, key=lambda phase: phase[1])
+
+    def milestones(self) -> dict[str, float]:
+        with self._lock:
+            return dict(sorted(self._milestones.items(), key=lambda item: item[1]))
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "process_start_seconds": self.process_start_seconds,
+            "phases": [
+                {"name": name, "offset_seconds": round(offset, 6), "seconds": round(seconds, 6)}
+                for name, offset, seconds in self.phases()
+            ],
+            "milestones": {name: round(offset, 6) for name, offset in self.milestones().items()},
+        }
+
+    def publish(self, registry=None) -> None:
+        """Copy phases and milestones into gauges so they show up in the metrics snapshot."""
+        from .metrics import REGISTRY
+
+        registry = registry or REGISTRY
+        phases = registry.gauge(PHASE_GAUGE, "Launch phase duration")
+        milestones = registry.gauge(MILESTONE_GAUGE, "Seconds from launch to a startup milestone")
+        if self.process_start_seconds is not None:
+            phases.set(self.process_start_seconds, phase="process_start")
+        for name, _offset, seconds in self.phases():
+            phases.set(seconds, phase=name)
+        for name, offset in self.milestones().items():
+            milestones.set(offset, milestone=name)
+
+    def log(self) -> None:
+        phases = " ".join(f"{name}={seconds * 1000:.0f}ms" for name, _offset, seconds in self.phases())
+        milestones = " ".join(f"{name}={offset * 1000:.0f}ms" for name, offset in self.milestones().items())
+        logger.info("Startup timings: %s | milestones: %s", phases, milestones)
+
+    def format_report(self) -> str:
+        lines = ["VoiceTray startup", ""]
+        if self.process_start_seconds is not None:
+            lines.append(f"  {'process_start (before main)':<30} {self.process_start_seconds * 1000:>9.1f} ms")
+        for name, offset, seconds in self.phases():
+            lines.append(f"  {name:<30} {seconds * 1000:>9.1f} ms   at {offset * 1000:>8.1f} ms")
+        milestones = self.milestones()
+        if milestones:
+            lines.append("")
+            for name, offset in milestones.items():
+                lines.append(f"  {name:<30} {offset * 1000:>9.1f} ms after main")
+        return "\n".join(lines) + "\n"
+
+
+def process_age_seconds() -> float | None:
+    """How long ago the OS created this process, or ``None`` where that is unavailable."""
+    try:
+        if sys.platform.startswith("linux"):
+            return _linux_process_age()
+        if os.name == "nt":
+            return _windows_process_age()
+    except Exception:
+        logger.debug("Could not read process start time", exc_info=True)
+    return None
+
+
+def _linux_process_age() -> float:
+    with open("/proc/self/stat", encoding="ascii") as handle:
+        # Field 22 (starttime) comes after the parenthesised command name, which may contain spaces.
+        fields = handle.read().rsplit(")", 1)[1].split()
+    started_ticks = int(fields[19])
+    with open("/proc/uptime", encoding="ascii") as handle:
+        uptime = float(handle.read().split()[0])
+    return max(0.0, uptime - started_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+def _windows_process_age() -> float:
+    import ctypes
+    from ctypes import wintypes
+
+    creation, exit_time, kernel, user, now = (wintypes.FILETIME() for _ in range(5))
+    kernel32 = ctypes.windll.kernel32
+    if not kernel32.GetProcessTimes(
+        kernel32.GetCurrentProcess(),
+        ctypes.byref(creation),
+        ctypes.byref(exit_time),
+        ctypes.byref(kernel),
+        ctypes.byref(user),
+    ):
+        raise OSError("GetProcessTimes failed")
+    kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+
+    def ticks(value) -> int:
+        return (value.dwHighDateTime << 32) | value.dwLowDateTime
+
+    return max(0.0, (ticks(now) - ticks(creation)) / 10_000_000)
+
+
+STARTUP = StartupTimeline()
@@ -12,9 +12,15 @@ from typing import Any
 import numpy as np
 
 from voicetray.audio.vad import SilenceTrimConfig, trim_silence
+from voicetray.metrics import observe_stage
+from voicetray.model_cache import cached_whisper_model, default_cache_root
+from voicetray.startup import FIRST_DICTATION_READY, STARTUP
+from voicetray.tracing import span
 
 logger = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16_000
+
 StateCallback = Callable[[str], None]
 ModelFactory = Callable[..., Any]
 
@@ -33,6 +39,8 @@ class WhisperEngineConfig:
     silence_padding_ms: int = 120
     vad_aggressiveness: int = 2
     vad_energy_threshold: float = 0.003
+    # Shared model cache to look in before the Hugging Face cache; empty disables it.
+    model_cache_dir: str = ""
 
     @classmethod
     def from_app_config(cls, config: dict[str, Any]) -> "WhisperEngineConfig":
@@ -49,6 +57,11 @@ class WhisperEngineConfig:
             vad_energy_threshold=float(
                 stt.get("vad_energy_threshold", cls.vad_energy_threshold)
             ),
+            model_cache_dir=(
+                str(default_cache_root(stt.get("model_cache_dir") or None))
+                if bool(stt.get("shared_model_cache", True))
+                else ""
+            ),
         )
 
 
@@ -68,33 +81,46 @@ class WhisperEngine:
         self._model: Any | None = None
         self._model_lock = threading.Lock()
         self.last_timings: dict[str, float] = {"vad": 0.0, "stt": 0.0}
+        self.last_audio_seconds = 0.0
+        self.last_trimmed_seconds = 0.0
 
     def transcribe(self, audio: Any) -> str:
         self.last_timings = {"vad": 0.0, "stt": 0.0}
         waveform = _to_mono_float32(audio)
+        self.last_audio_seconds = waveform.size / SAMPLE_RATE
         vad_started = time.perf_counter()
-        waveform = self._trim_waveform(waveform)
+        with span("vad", audio_seconds=self.last_audio_seconds) as vad_span:
+            waveform = self._trim_waveform(waveform)
+            self.last_trimmed_seconds = waveform.size / SAMPLE_RATE
+            vad_span.set(trimmed_seconds=self.last_trimmed_seconds)
         self.last_timings["vad"] = time.perf_counter() - vad_started
+        observe_stage("vad", self.last_timings["vad"])
         if waveform.size == 0:
             return ""
 
         stt_started = time.perf_counter()
-        model = self._load_model()
-        self._emit_state("transcribing")
         try:
-            segments, _info = model.transcribe(
-                waveform,
-                beam_size=self.config.beam_size,
-                language=_language_arg(self.config.language),
-                vad_filter=self.config.vad_filter,
-                condition_on_previous_text=self.config.condition_on_previous_text,
-            )
-            text = " ".join(segment.text.strip() for segment in segments if segment.text.strip())
+            with span("stt", model=self.config.model_size, beam_size=self.config.beam_size):
+                model = self._load_model()
+                self._emit_state("transcribing")
+                segments, _info = model.transcribe(
+                    waveform,
+                    beam_size=self.config.beam_size,
+                    language=_language_arg(self.config.language),
+                    vad_filter=self.config.vad_filter,
+                    condition_on_previous_text=self.config.condition_on_previous_text,
+                )
+                text = " ".join(segment.text.strip() for segment in segments if segment.text.strip())
             return " ".join(text.split())
         finally:
             self.last_timings["stt"] = time.perf_counter() - stt_started
+            observe_stage("stt", self.last_timings["stt"], model=self.config.model_size)
             self._emit_state("idle")
 
+    def load(self) -> None:
+        """Load the model now rather than on the first ``transcribe``."""
+        self._load_model()
+
     def _load_model(self) -> Any:
         if self._model is not None:
             return self._model
@@ -108,14 +134,30 @@ class WhisperEngine:
                     self.config.device,
                     self.config.compute_type,
                 )
-                self._model = self.model_factory(
-                    self.config.model_size,
-                    device=self.config.device,
-                    compute_type=self.config.compute_type,
-                    local_files_only=self.config.local_files_only,
-                )
+                load_started = time.perf_counter()
+                with span("stt_load", model=self.config.model_size, device=self.config.device):
+                    self._model = self.model_factory(
+                        self._model_path(),
+                        device=self.config.device,
+                        compute_type=self.config.compute_type,
+                        local_files_only=self.config.local_files_only,
+                    )
+                observe_stage("stt_load", time.perf_counter() - load_started, model=self.config.model_size)
+                # The first model load of the process is when speech can actually be turned into text.
+                ready = STARTUP.milestone_if_new(FIRST_DICTATION_READY)
+                if ready is not None:
+                    STARTUP.publish()
+                    logger.info("First speech model load finished %.0f ms after launch", ready * 1000)
             return self._model
 
+    def _model_path(self) -> str:
+        if self.config.model_cache_dir:
+            cached = cached_whisper_model(self.config.model_size, self.config.model_cache_dir)
+            if cached is not None:
+                logger.info("Using shared cached model %s", cached)
+                return str(cached)
+        return self.config.model_size
+
     def _emit_state(self, state: str) -> None:
         if self.state_callback:
             self.state_callback(state)
@@ -126,7 +168,7 @@ class WhisperEngine:
         return trim_silence(
             waveform,
             SilenceTrimConfig(
-                sample_rate=16_000,
+                sample_rate=SAMPLE_RATE,
                 padding_ms=self.config.silence_padding_ms,
                 aggressiveness=self.config.vad_aggressiveness,
                 energy_threshold=self.config.vad_energy_threshold,
@@ -0,0 +1,301 @@
+"""Per-dictation trace spans, exportable as Chrome trace-event JSON."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RECENT_TRACE_LIMIT = 20
+MAX_TRACE_FILES = 20
+
+_CURRENT: contextvars.ContextVar[tuple["Trace", "Span | None"] | None] = contextvars.ContextVar(
+    "voicetray_trace", default=None
+)
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent", "start", "end", "thread_id", "thread_name", "attributes")
+
+    def __init__(self, trace: "Trace", name: str, parent: "Span | None", attributes: dict[str, Any]):
+        thread = threading.current_thread()
+        self.trace = trace
+        self.name = name
+        self.span_id = trace._next_span_id()
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.thread_id = thread.ident or 0
+        self.thread_name = thread.name
+        self.attributes = attributes
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self, **attributes: Any) -> None:
+        if attributes:
+            self.attributes.update(attributes)
+        if self.end is None:
+            self.end = time.perf_counter()
+
+
+class _NullSpan:
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def finish(self, **attributes: Any) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """Spans recorded for one dictation, from hotkey press to insertion."""
+
+    def __init__(self, name: str = "dictation", **attributes: Any):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.wall_start = time.time()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._span_ids = 0
+        self.root = self.start_span(name, parent=None, **attributes)
+
+    @property
+    def duration(self) -> float | None:
+        return self.root.duration
+
+    def _next_span_id(self) -> int:
+        with self._lock:
+            self._span_ids += 1
+            return self._span_ids
+
+    def start_span(self, name: str, parent: Span | None = None, **attributes: Any) -> Span:
+        """Open a span that is finished explicitly, e.g. one that spans two hotkey callbacks."""
+        span = Span(self, name, parent, attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def finish(self, **attributes: Any) -> None:
+        self.root.finish(**attributes)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Complete ("X") events per span, thread names, and flow arrows for thread hops."""
+        with self._lock:
+            spans = list(self.spans)
+        origin = self.root.start
+        now = time.perf_counter()
+        pid = os.getpid()
+
+        def micros(value: float) -> float:
+            return round((value - origin) * 1_000_000, 3)
+
+        events: list[dict[str, Any]] = []
+        threads: dict[int, str] = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            end = span.end if span.end is not None else now
+            args = {key: _json_value(value) for key, value in span.attributes.items()}
+            args.update(trace_id=self.trace_id, span_id=span.span_id)
+            if span.parent is not None:
+                args["parent_id"] = span.parent.span_id
+            if span.end is None:
+                args["unfinished"] = True
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "voicetray",
+                    "ph": "X",
+                    "ts": micros(span.start),
+                    "dur": micros(end) - micros(span.start),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": args,
+                }
+            )
+            parent = span.parent
+            if parent is not None and parent.thread_id != span.thread_id:
+                # Anchor the arrow inside the parent slice even if it closed before the hop ran.
+                parent_end = parent.end if parent.end is not None else now
+                hop_start = min(max(span.start, parent.start), parent_end)
+                flow = {"name": "thread hop", "cat": "voicetray.flow", "id": span.span_id, "pid": pid}
+                events.append({**flow, "ph": "s", "ts": micros(hop_start), "tid": parent.thread_id})
+                events.append({**flow, "ph": "f", "bp": "e", "ts": micros(span.start), "tid": span.thread_id})
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": self.trace_id, "name": self.name, "wall_start": self.wall_start},
+        }
+
+    def write(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return target
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class _SpanScope:
+    __slots__ = ("name", "attributes", "span", "token")
+
+    def __init__(self, name: str, attributes: dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.span: Span | None = None
+        self.token: contextvars.Token | None = None
+
+    def __enter__(self) -> Span:
+        trace, parent = _CURRENT.get()
+        self.span = trace.start_span(self.name, parent=parent or trace.root, **self.attributes)
+        self.token = _CURRENT.set((trace, self.span))
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        self.span.finish()
+        _CURRENT.reset(self.token)
+
+
+class _NullScope:
+    def __enter__(self) -> _NullSpan:
+        return NULL_SPAN
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_SCOPE = _NullScope()
+
+
+def span(name: str, **attributes: Any) -> _SpanScope | _NullScope:
+    """Time a block as a child of the current span; a no-op outside a trace."""
+    if _CURRENT.get() is None:
+        return _NULL_SCOPE
+    return _SpanScope(name, attributes)
+
+
+def current_trace() -> Trace | None:
+    active = _CURRENT.get()
+    return active[0] if active is not None else None
+
+
+def current_span() -> Span | _NullSpan:
+    active = _CURRENT.get()
+    if active is None:
+        return NULL_SPAN
+    return active[1] or active[0].root
+
+
+class activate:
+    """Make ``trace`` (and optionally ``parent``) current for the enclosed block."""
+
+    def __init__(self, trace: Trace | None, parent: Span | None = None):
+        self.trace = trace
+        self.parent = parent
+        self._token: contextvars.Token | None = None
+
+    def __enter__(self) -> Trace | None:
+        if self.trace is not None:
+            self._token = _CURRENT.set((self.trace, self.parent))
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._token is not None:
+            _CURRENT.reset(self._token)
+            self._token = None
+
+
+def propagate(target: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a thread target so spans it opens nest under the caller's current span."""
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return context.run(target, *args, **kwargs)
+
+    return run
+
+
+class TraceLog:
+    """Keeps the most recent finished traces and exports slow ones to disk."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        slow_seconds: float = 0.0,
+        limit: int = RECENT_TRACE_LIMIT,
+        max_files: int = MAX_TRACE_FILES,
+    ):
+        self.directory = Path(directory) if directory is not None else default_trace_dir()
+        self.slow_seconds = max(0.0, float(slow_seconds))
+        self.max_files = max(1, int(max_files))
+        self._recent: deque[Trace] = deque(maxlen=max(1, int(limit)))
+        self._lock = threading.Lock()
+
+    def recent(self) -> list[Trace]:
+        with self._lock:
+            return list(self._recent)
+
+    def find(self, trace_id: str) -> Trace | None:
+        with self._lock:
+            return next((trace for trace in self._recent if trace.trace_id == trace_id), None)
+
+    def record(self, trace: Trace, processing_seconds: float | None = None) -> Path | None:
+        """Remember ``trace``; write it out when processing took longer than ``slow_seconds``."""
+        trace.finish()
+        with self._lock:
+            self._recent.append(trace)
+        elapsed = trace.duration if processing_seconds is None else processing_seconds
+        if not self.slow_seconds or elapsed is None or elapsed < self.slow_seconds:
+            return None
+        try:
+            path = self.export(trace)
+        except OSError:
+            logger.exception("Could not write slow dictation trace %s", trace.trace_id)
+            return None
+        logger.info("Slow dictation (%.3fs) trace written to %s", elapsed, path)
+        return path
+
+    def export(self, trace: Trace) -> Path:
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(trace.wall_start))
+        path = trace.write(self.directory / f"dictation-{stamp}-{trace.trace_id}.json")
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("dictation-*.json"), key=lambda item: item.stat().st_mtime)
+        for stale in files[: max(0, len(files) - self.max_files)]:
+            try:
+                stale.unlink()
+            except OSError:
+                logger.debug("Could not remove old trace %s", stale, exc_info=True)
+
+
+def default_trace_dir(local_appdata: str | os.PathLike[str] | None = None) -> Path:
+    from .logging_config import log_file_path
+
+    return log_file_path(local_appdata).parent / "traces"
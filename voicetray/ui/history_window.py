@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import logging
 import os
+import queue
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any
@@ -12,6 +16,8 @@ from PySide6 import QtCore, QtWidgets
 from voicetray.dictation.glossary import learn_word
 from voicetray.history import DictationHistoryStore, HistoryRow
 
+logger = logging.getLogger(__name__)
+
 
 def add_word_to_dictionary_action(
     selected_text: str,
@@ -26,7 +32,195 @@ def add_word_to_dictionary_action(
     return term
 
 
+# ``(offset, limit)`` -> rows; called on the history worker thread.
+HistoryPageFetcher = Callable[[int, int], list[HistoryRow]]
+TaskExecutor = Callable[[Callable[[], None]], None]
+
+
+def history_item_text(row: HistoryRow) -> str:
+    preview = " ".join(row.cleaned_text.split())
+    if len(preview) > 80:
+        preview = preview[:77] + "..."
+    app = row.app_name or "Unknown"
+    return f"{preview}  [{app}]"
+
+
+def _run_inline(task: Callable[[], None]) -> None:
+    task()
+
+
+class HistoryListModel(QtCore.QAbstractListModel):
+    """List model that pulls history a page at a time as the view scrolls.
+
+    Pages are fetched through ``executor`` and arrive on the UI thread via
+    ``page_loaded``. Only the ``max_pages`` most recently painted pages stay in
+    memory; an evicted row shows a placeholder until its page is fetched again.
+    """
+
+    RowRole = QtCore.Qt.UserRole + 1
+    LOADING_TEXT = "Loading..."
+    page_loaded = QtCore.Signal(int, int, object)
+
+    def __init__(
+        self,
+        fetch_page: HistoryPageFetcher | None = None,
+        *,
+        page_size: int = 200,
+        max_pages: int = 3,
+        executor: TaskExecutor | None = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.page_size = max(1, int(page_size))
+        self.max_pages = max(2, int(max_pages))
+        # Row whose page is never evicted, e.g. the selection shown in the detail pane.
+        self.keep_row: int | None = None
+        self._executor = executor or _run_inline
+        self._fetch_page = fetch_page
+        self._pages: OrderedDict[int, list[HistoryRow]] = OrderedDict()
+        self._pending: set[int] = set()
+        self._row_count = 0
+        self._generation = 0
+        self._exhausted = fetch_page is None
+        self.page_loaded.connect(self._on_page_loaded)
+
+    def reset(self, fetch_page: HistoryPageFetcher | None, first_page: list[HistoryRow] | None = None) -> None:
+        """Swap in a new query; ``first_page`` skips the initial fetch when already loaded."""
+        self.beginResetModel()
+        self._generation += 1
+        self._fetch_page = fetch_page
+        self._pages.clear()
+        self._pending.clear()
+        if first_page:
+            self._pages[0] = list(first_page)
+        self._row_count = len(first_page or [])
+        self._exhausted = fetch_page is None or (first_page is not None and len(first_page) < self.page_size)
+        self.endResetModel()
+        if first_page is None and self.canFetchMore():
+            self.fetchMore()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._row_count:
+            return None
+        row = self._row(index.row(), fetch=True)
+        if row is None:
+            return self.LOADING_TEXT if role == QtCore.Qt.DisplayRole else None
+        if role == QtCore.Qt.DisplayRole:
+            return history_item_text(row)
+        if role == self.RowRole:
+            return row
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QtCore.QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        self._request(self._row_count // self.page_size)
+
+    def row_at(self, index: int) -> HistoryRow | None:
+        if 0 <= index < self._row_count:
+            return self._row(index, fetch=False)
+        return None
+
+    def loaded_rows(self) -> int:
+        return sum(len(rows) for rows in self._pages.values())
+
+    def _row(self, index: int, *, fetch: bool) -> HistoryRow | None:
+        page, offset = divmod(index, self.page_size)
+        rows = self._pages.get(page)
+        if rows is None and fetch:
+            self._request(page)
+            rows = self._pages.get(page)
+        if rows is None or offset >= len(rows):
+            return None
+        self._pages.move_to_end(page)
+        return rows[offset]
+
+    def _request(self, page: int) -> None:
+        if page in self._pending or self._fetch_page is None:
+            return
+        self._pending.add(page)
+        generation, fetch_page, size = self._generation, self._fetch_page, self.page_size
+
+        def task() -> None:
+            if generation != self._generation:
+                return
+            try:
+                rows = fetch_page(page * size, size)
+            except Exception:
+                logger.exception("History page fetch failed")
+                rows = None
+            self.page_loaded.emit(generation, page, rows)
+
+        self._executor(task)
+
+    def _on_page_loaded(self, generation: int, page: int, rows: list[HistoryRow] | None) -> None:
+        if generation != self._generation:
+            return
+        self._pending.discard(page)
+        start = page * self.page_size
+        if start >= self._row_count:
+            if rows is None or len(rows) < self.page_size:
+                self._exhausted = True
+            if not rows:
+                return
+            self.beginInsertRows(QtCore.QModelIndex(), start, start + len(rows) - 1)
+            self._pages[page] = rows
+            self._row_count = start + len(rows)
+            self.endInsertRows()
+        elif rows:
+            self._pages[page] = rows
+            self.dataChanged.emit(self.index(start), self.index(start + len(rows) - 1))
+        self._evict()
+
+    def _evict(self) -> None:
+        keep = self.keep_row // self.page_size if self.keep_row is not None else None
+        while len(self._pages) > self.max_pages:
+            victim = next((page for page in self._pages if page != keep), None)
+            if victim is None:
+                return
+            del self._pages[victim]
+
+
+class _SearchSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, object)
+
+
+class _SearchWorker:
+    """Single background thread for history queries and page fetches.
+
+    One long-lived thread keeps the store at one extra pooled connection no
+    matter how many keystrokes trigger a search. Tasks run in order; each one
+    returns early when a newer search has made it stale.
+    """
+
+    def __init__(self):
+        self._tasks: queue.Queue[Callable[[], None]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, task: Callable[[], None]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="voicetray-history-search", daemon=True)
+                self._thread.start()
+        self._tasks.put(task)
+
+    def _run(self) -> None:
+        while True:
+            self._tasks.get()()
+
+
 class HistoryWindow(QtWidgets.QDialog):
+    SEARCH_DEBOUNCE_MS = 250
+
     def __init__(
         self,
         *,
@@ -37,6 +231,7 @@ class HistoryWindow(QtWidgets.QDialog):
         reinsert_callback: Callable[[str, HistoryRow], None] | Callable[[str], None] | None = None,
         glossary_path: str | os.PathLike[str] = "glossary.json",
         limit: int = 200,
+        search_executor: Callable[[Callable[[], None]], None] | None = None,
     ):
         super().__init__()
         self.qt = qt_modules
@@ -45,14 +240,21 @@ class HistoryWindow(QtWidgets.QDialog):
         self.reinsert_callback = reinsert_callback
         self.glossary_path = Path(glossary_path)
         self.limit = int(limit)
-        self.rows: list[HistoryRow] = []
-        self.filtered_rows: list[HistoryRow] = []
+        self.search_executor = search_executor or _SearchWorker()
+        self._search_generation = 0
+        self._search_signals = _SearchSignals(self)
 
         self.setWindowTitle("VoiceTray History")
         self.setMinimumSize(860, 560)
         self.search_edit = QtWidgets.QLineEdit(self)
         self.search_edit.setPlaceholderText("Search history")
-        self.list_widget = QtWidgets.QListWidget(self)
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.model = HistoryListModel(page_size=self.limit, executor=self.search_executor, parent=self)
+        self.list_view = QtWidgets.QListView(self)
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
         self.detail_editor = QtWidgets.QPlainTextEdit(self)
         self.detail_editor.setReadOnly(True)
         self.raw_toggle = QtWidgets.QCheckBox("Show raw transcript", self)
@@ -74,7 +276,7 @@ class HistoryWindow(QtWidgets.QDialog):
         left = QtWidgets.QWidget()
         left_layout = QtWidgets.QVBoxLayout(left)
         left_layout.setContentsMargins(0, 0, 0, 0)
-        left_layout.addWidget(self.list_widget)
+        left_layout.addWidget(self.list_view)
 
         right = QtWidgets.QWidget()
         right_layout = QtWidgets.QVBoxLayout(right)
@@ -96,41 +298,89 @@ class HistoryWindow(QtWidgets.QDialog):
         root.addWidget(body, 1)
 
     def _connect_signals(self) -> None:
-        self.search_edit.textChanged.connect(lambda _text: self.apply_filter())
-        self.list_widget.currentRowChanged.connect(lambda _row: self.update_detail())
+        self.search_edit.textChanged.connect(lambda _text: self.search_timer.start())
+        self.search_timer.timeout.connect(self.apply_filter)
+        self._search_signals.finished.connect(self._apply_search_results)
+        self.list_view.selectionModel().currentRowChanged.connect(lambda current, _previous: self._select(current))
+        self.model.dataChanged.connect(lambda top, bottom, *_roles: self._page_refilled(top, bottom))
         self.raw_toggle.toggled.connect(lambda _checked: self.update_detail())
         self.copy_button.clicked.connect(self.copy_current_text)
         self.reinsert_button.clicked.connect(self.reinsert_current_text)
         self.add_dictionary_button.clicked.connect(self.add_selection_to_dictionary)
 
     def refresh(self) -> None:
-        self.rows = self.store.list_recent(limit=self.limit)
         self.apply_filter()
 
     def apply_filter(self) -> None:
+        """Run the current search off the UI thread; stale results are dropped."""
+        self.search_timer.stop()
         query = self.search_edit.text().strip().lower()
-        if query:
-            self.filtered_rows = [row for row in self.rows if self._row_matches(row, query)]
-        else:
-            self.filtered_rows = list(self.rows)
+        fetch_page = self._page_fetcher(query)
+        self._search_generation += 1
+        generation = self._search_generation
+        page_size = self.model.page_size
+
+        def task() -> None:
+            if generation != self._search_generation:
+                return
+            try:
+                rows = fetch_page(0, page_size)
+            except Exception:
+                logger.exception("History search failed")
+                rows = []
+            self._search_signals.finished.emit(generation, (fetch_page, rows))
 
-        self.list_widget.blockSignals(True)
-        self.list_widget.clear()
-        for row in self.filtered_rows:
-            self.list_widget.addItem(self._item_text(row))
-        self.list_widget.blockSignals(False)
+        self.search_executor(task)
 
-        if self.filtered_rows:
-            self.list_widget.setCurrentRow(0)
+    def _apply_search_results(self, generation: int, payload) -> None:
+        if generation != self._search_generation:
+            return
+        fetch_page, rows = payload
+        self.model.reset(fetch_page, rows)
+        if self.model.rowCount():
+            self.list_view.setCurrentIndex(self.model.index(0))
         else:
             self.detail_editor.clear()
             self.metadata_label.setText("")
 
+    def _page_fetcher(self, query: str) -> HistoryPageFetcher:
+        store = self.store
+        if query and hasattr(store, "search"):
+            # Searches the whole database, not just the rows loaded for browsing.
+            return lambda offset, limit: [
+                result.row for result in store.search(query, limit=limit, offset=offset)
+            ]
+        if not query and hasattr(store, "query"):
+            # Keyset paging: the id each page starts below, recorded as pages load in order.
+            anchors: dict[int, int] = {}
+
+            def fetch_browse(offset: int, limit: int) -> list[HistoryRow]:
+                rows = store.query(before_id=anchors[offset] if offset else None, limit=limit)
+                if rows:
+                    anchors[offset + len(rows)] = rows[-1].id
+                return rows
+
+            return fetch_browse
+
+        def fetch_recent(offset: int, limit: int) -> list[HistoryRow]:
+            if offset:
+                return []
+            rows = store.list_recent(limit=limit)
+            return [row for row in rows if self._row_matches(row, query)] if query else rows
+
+        return fetch_recent
+
+    def _select(self, current) -> None:
+        self.model.keep_row = current.row() if current.isValid() else None
+        self.update_detail()
+
+    def _page_refilled(self, top, bottom) -> None:
+        # The selection may have been a placeholder while its page was evicted.
+        if top.row() <= self.list_view.currentIndex().row() <= bottom.row():
+            self.update_detail()
+
     def current_row(self) -> HistoryRow | None:
-        index = self.list_widget.currentRow()
-        if 0 <= index < len(self.filtered_rows):
-            return self.filtered_rows[index]
-        return None
+        return self.model.row_at(self.list_view.currentIndex().row())
 
     def current_text(self) -> str:
         row = self.current_row()
@@ -208,13 +458,6 @@ class HistoryWindow(QtWidgets.QDialog):
         ).lower()
         return query in haystack
 
-    def _item_text(self, row: HistoryRow) -> str:
-        preview = " ".join(row.cleaned_text.split())
-        if len(preview) > 80:
-            preview = preview[:77] + "..."
-        app = row.app_name or "Unknown"
-        return f"{preview}  [{app}]"
-
     def _duration_text(self, row: HistoryRow) -> str:
         if row.duration_seconds is None:
             return ""
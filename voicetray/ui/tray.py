@@ -119,6 +119,10 @@ class VoiceTrayTray:
         log_action.triggered.connect(
             lambda _checked=False: self._defer(self.open_log_folder)
         )
+        diagnostics_action = self.menu.addAction("Save Diagnostics Bundle")
+        diagnostics_action.triggered.connect(
+            lambda _checked=False: self._defer(self.save_diagnostics_bundle)
+        )
         self.menu.addSeparator()
 
         quit_action = self.menu.addAction("Quit")
@@ -166,6 +170,18 @@ class VoiceTrayTray:
         if not opened:
             logger.warning("Could not open log folder: %s", self.log_dir)
 
+    def save_diagnostics_bundle(self) -> None:
+        from voicetray.diagnostics import write_diagnostics_bundle
+
+        try:
+            bundle = write_diagnostics_bundle(log_dir=self.log_dir)
+        except OSError:
+            logger.exception("Could not write diagnostics bundle")
+            self.show_notification("Could not save the diagnostics bundle.")
+            return
+        self.show_notification(f"Diagnostics saved to {bundle.name} in the log folder.")
+        self.open_log_folder()
+
     def _refresh_tooltip(self) -> None:
         self.tray_icon.setToolTip(
             f"VoiceTray - {self.state.value} - model {self.model_label}"